@@ -1,18 +1,90 @@
-from typing import Any, Dict
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse
+import json
+import time
+import asyncio
+from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Depends
+from fastapi.responses import HTMLResponse, StreamingResponse, PlainTextResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.datastructures import MutableHeaders
 from pathlib import Path
 
 from src.resume_rater.data_ingestion import ResumeHandler  
 from src.resume_rater.data_analisis import ResumeAnalyzer  
+from src.resume_rater.batch_scoring import BatchScorer
+from src.resume_rater.pdf_extraction import get_pdf_extractor
+from src.resume_rater.job_queue import ScoringQueue
+from src.resume_rater.job_catalog import JobCatalog, CatalogMatcher
+from utils.llm_registry import LLMRegistry
+from utils.metrics import metrics, REQUEST_SECONDS, DEADLINES_EXCEEDED, start_request_timings, server_timing_header
+from utils.deadline import Deadline, budget_seconds, start_deadline, run_with_deadline
+from exception.custom_exception import InvalidUploadException, QueueFullException, DeadlineExceededException, ClientDisconnectedException
 
 from logger.custom_logger import CustomLogger
 log = CustomLogger().get_logger(__name__)
 
-app = FastAPI(title="Resume Rater", version="0.1")
+
+def warm_up(registry: LLMRegistry):
+    ## Default LLM client and chains, then the PDF worker processes; blocking, run off the event loop
+    started = time.perf_counter()
+    registry.warm_up()
+    if registry.config.get("extraction", {}).get("enabled", False):
+        get_pdf_extractor().warm_up()
+    log.info("Warm-up complete", seconds=round(time.perf_counter() - started, 3))
+
+
+async def run_warm_up(app: FastAPI):
+    startup = app.state.registry.config.get("startup", {})
+    try:
+        await asyncio.to_thread(warm_up, app.state.registry)
+    except Exception as e:
+        if startup.get("fail_on_error", False):
+            raise
+        ## whatever was not built is built by the first request that needs it
+        log.error("Warm-up failed", error=str(e))
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ## Build llm clients, parsers and chains once per process
+    app.state.ready = False
+    app.state.registry = LLMRegistry()
+    warm_up_mode = app.state.registry.config.get("startup", {}).get("warm_up", "blocking")
+    app.state.warm_up_task = None
+    if warm_up_mode == "blocking":
+        await run_warm_up(app)
+    elif warm_up_mode == "background":
+        app.state.warm_up_task = asyncio.create_task(run_warm_up(app))
+    else:
+        app.state.ready = True
+    if app.state.registry.blob_store is not None:
+        app.state.registry.blob_store.start_collector()
+    queue_config = app.state.registry.config.get("queue", {})
+    app.state.scoring_queue = ScoringQueue(
+        db_path=queue_config.get("db_path", "data/cache/scoring_jobs.sqlite"),
+        workers=queue_config.get("workers", 4),
+        max_queued=queue_config.get("max_queued", 100),
+        retention_seconds=queue_config.get("retention_seconds", 24 * 3600),
+        reclaim_interval_seconds=queue_config.get("reclaim_interval_seconds", 60),
+    )
+    await app.state.scoring_queue.start(app.state.registry)
+    catalog_config = app.state.registry.config.get("catalog", {})
+    app.state.job_catalog = JobCatalog(catalog_config.get("db_path", "data/cache/job_catalog.sqlite"))
+    log.info("Application startup complete", warm_up=warm_up_mode)
+    yield
+    if app.state.warm_up_task is not None and not app.state.warm_up_task.done():
+        app.state.warm_up_task.cancel()
+    await app.state.scoring_queue.stop()
+    app.state.job_catalog.close()
+    get_pdf_extractor().shutdown()
+    await app.state.registry.aclose()
+    log.info("Application shutdown")
+
+
+app = FastAPI(title="Resume Rater", version="0.1", lifespan=lifespan)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
@@ -27,6 +99,90 @@ app.add_middleware(
 )
 
 
+class RequestTimingMiddleware:
+    ###
+    # Per-stage spans recorded during the request end up in the Server-Timing header.
+    # Plain ASGI rather than @app.middleware("http"): that wrapper hides the client's
+    # http.disconnect from Request.is_disconnected(), which deadline handling relies on.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = start_request_timings()
+        start = time.perf_counter()
+
+        async def send_with_timings(message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                route = scope.get("route")
+                REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=getattr(route, "path", "unmatched"), status=message["status"])
+                MutableHeaders(scope=message).append("Server-Timing", server_timing_header(timings, total=elapsed))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timings)
+
+
+app.add_middleware(RequestTimingMiddleware)
+
+
+def get_registry(request: Request) -> LLMRegistry:
+    registry = request.app.state.registry
+    registry.reload_if_changed()
+    return registry
+
+
+def get_analyzer(registry: LLMRegistry = Depends(get_registry)) -> ResumeAnalyzer:
+    return ResumeAnalyzer(registry=registry)
+
+
+def get_handler(registry: LLMRegistry = Depends(get_registry)) -> ResumeHandler:
+    ingestion = registry.config.get("ingestion", {})
+    extraction_enabled = registry.config.get("extraction", {}).get("enabled", False)
+    return ResumeHandler(
+        max_upload_bytes=ingestion.get("max_upload_bytes"),
+        archive=ingestion.get("archive", False),
+        extractor=get_pdf_extractor() if extraction_enabled else None,
+        blob_store=registry.blob_store,
+    )
+
+
+async def ingest_resume(resume: UploadFile, handler: ResumeHandler, registry: LLMRegistry) -> str:
+    if registry.config.get("ingestion", {}).get("in_memory", True):
+        return await handler.aingest(resume)
+    saved_path = await handler.asave_pdf(resume)
+    log.info(f"Resume saved at: {saved_path}")
+    return await handler.aread_pdf(saved_path)
+
+
+def resolve_mode(analyzer: ResumeAnalyzer, mode: Optional[str]) -> str:
+    try:
+        return analyzer.scoring_mode(mode)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+async def within_deadline(request: Request, deadline: Optional[Deadline], coro):
+    ## Run a request's pipeline under its deadline; it is cancelled when the deadline passes or the client leaves
+    poll_seconds = request.app.state.registry.config.get("deadlines", {}).get("disconnect_poll_seconds", 0.5)
+    try:
+        return await run_with_deadline(coro, deadline, request.is_disconnected, poll_seconds)
+    except DeadlineExceededException as e:
+        DEADLINES_EXCEEDED.inc(stage=e.stage)
+        log.warning("Request ran out of time", path=request.url.path, stage=e.stage, budget_seconds=deadline.seconds)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message, headers={"X-Deadline-Stage": e.stage})
+    except ClientDisconnectedException as e:
+        log.info("Client disconnected, request cancelled", path=request.url.path)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message)
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @app.get("/", response_class=HTMLResponse)
 async def serve_ui(request: Request):
     log.info("Serving UI homepage.")
@@ -39,22 +195,46 @@ def health() -> Dict[str, str]:
     log.info("Health check passed.")
     return {"status": "ok", "service": "Resume-Scorer"}
 
+
+@app.get("/ready")
+def ready(request: Request):
+    ## Readiness for load balancers: 503 until the startup warm-up has finished
+    if not request.app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+@app.get("/cache/stats")
+def cache_stats(registry: LLMRegistry = Depends(get_registry)) -> Dict[str, Any]:
+    if registry.result_cache is None:
+        return {"enabled": False}
+    stats = {"enabled": True, **registry.result_cache.stats()}
+    if registry.profile_cache is not None:
+        stats["profiles"] = registry.profile_cache.stats()
+    if registry.blob_store is not None:
+        stats["uploads"] = registry.blob_store.stats()
+    return stats
+
+@app.get("/metrics")
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/rater")
-async def rate_resume(resume: UploadFile = File(...), job_description: str = Form(...)) -> Any:
+async def rate_resume(request: Request, resume: UploadFile = File(...), job_description: str = Form(...), use_cache: bool = Form(True), use_profile: Optional[bool] = Form(None), deadline_seconds: Optional[float] = Form(None), mode: Optional[str] = Form(None), analyzer: ResumeAnalyzer = Depends(get_analyzer), handler: ResumeHandler = Depends(get_handler)) -> Any:
+    ## deadline_seconds overrides deadlines.request_seconds for this call
+    ## mode: llm | lite (local keyword scoring, no LLM call) | lite-then-llm (LLM only above lite_scoring.llm_threshold)
+    mode = resolve_mode(analyzer, mode)
+    deadline = start_deadline(budget_seconds(analyzer.registry.config, deadline_seconds))
     try:
         log.info(f"Starting resume analysis - File: {resume.filename}, Job description length: {len(job_description)}")
-        
-        handler = ResumeHandler()
-        saved_path = handler.save_pdf(resume)
-        log.info(f"Resume saved at: {saved_path}")
 
-        cv_content = handler.read_pdf(saved_path)
-        log.info(f"Extracted text length: {len(cv_content)} chars")
-        
-        
-        log.info("Starting LLM analysis...")
-        analyzer = ResumeAnalyzer()  
-        analysis_result = analyzer.analyze_resume(cv_content, job_description)
+        async def pipeline():
+            cv_content = await ingest_resume(resume, handler, analyzer.registry)
+            log.info(f"Extracted text length: {len(cv_content)} chars")
+
+            log.info("Starting LLM analysis...")
+            return await analyzer.aanalyze_resume(cv_content, job_description, use_cache=use_cache, use_profile=use_profile, mode=mode)
+
+        analysis_result = await within_deadline(request, deadline, pipeline())
 
         log.info(f"Analysis completed. Result keys: {list(analysis_result.keys()) if isinstance(analysis_result, dict) else 'Not a dict'}")
         log.info(f"Overall score: {analysis_result.get('overall_score', 'Not found')}")
@@ -65,11 +245,228 @@ async def rate_resume(resume: UploadFile = File(...), job_description: str = For
         elif hasattr(analysis_result, '__dict__'):
             analysis_result = analysis_result.__dict__
 
-        return {"session_id": handler.session_id, "analysis_result": analysis_result}
+        return {"session_id": handler.session_id, "analysis_result": analysis_result, "extraction_stats": handler.extraction_stats, "compaction": analyzer.compaction_report, "resume_profile": analyzer.resume_profile, "scoring": analyzer.scoring_report}
+    except InvalidUploadException as e:
+        log.error("Resume upload rejected", error=e.error_message, status_code=e.status_code)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message)
     except HTTPException:
-        raise HTTPException(status_code=500, detail=f"Resume scoring failed")
+        raise
     except Exception as e:
         log.exception("Resume scoring failed")
         raise HTTPException(status_code=500, detail=f"Resume scoring failed: {e}")
 
+
+@app.post("/rater/stream")
+async def rate_resume_stream(request: Request, resume: UploadFile = File(...), job_description: str = Form(...), use_cache: bool = Form(True), deadline_seconds: Optional[float] = Form(None), analyzer: ResumeAnalyzer = Depends(get_analyzer), handler: ResumeHandler = Depends(get_handler)):
+    ## Server-Sent Events: status updates, one section per completed ResumeRater field, then the validated result.
+    ## Once streaming has started, running out of time ends the stream with an error event naming the stage.
+    log.info(f"Starting streaming analysis - File: {resume.filename}, Job description length: {len(job_description)}")
+    deadline = start_deadline(budget_seconds(analyzer.registry.config, deadline_seconds))
+    try:
+        cv_content = await within_deadline(request, deadline, ingest_resume(resume, handler, analyzer.registry))
+    except HTTPException:
+        raise
+    except InvalidUploadException as e:
+        log.error("Resume upload rejected", error=e.error_message, status_code=e.status_code)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message)
+    except Exception as e:
+        log.exception("Resume ingestion failed")
+        raise HTTPException(status_code=500, detail=f"Resume scoring failed: {getattr(e, 'error_message', e)}")
+
+    async def events():
+        yield sse_event("start", {"session_id": handler.session_id})
+        stream = analyzer.astream_resume(cv_content, job_description, use_cache=use_cache)
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(stream.__anext__(), deadline.remaining() if deadline else None)
+                except StopAsyncIteration:
+                    break
+                yield sse_event(event, data)
+        except asyncio.TimeoutError:
+            error = deadline.exceeded()
+            DEADLINES_EXCEEDED.inc(stage=error.stage)
+            log.warning("Streaming request ran out of time", stage=error.stage, budget_seconds=deadline.seconds)
+            yield sse_event("error", {"detail": error.error_message, "stage": error.stage, "status_code": error.status_code})
+        except Exception as e:
+            log.exception("Streaming resume scoring failed")
+            yield sse_event("error", {"detail": f"Resume scoring failed: {getattr(e, 'error_message', e)}"})
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/rater/jobs", status_code=202)
+async def submit_rating_job(request: Request, resume: UploadFile = File(...), job_description: str = Form(...), use_cache: bool = Form(True), analyzer: ResumeAnalyzer = Depends(get_analyzer), handler: ResumeHandler = Depends(get_handler)):
+    ## Queued mode: ingest now, score on a background worker, poll GET /rater/jobs/{job_id}
+    queue: ScoringQueue = request.app.state.scoring_queue
+    try:
+        ## refuse before paying for PDF extraction
+        queue.check_capacity()
+        cv_content = await ingest_resume(resume, handler, analyzer.registry)
+        job_id = await queue.submit(cv_content, job_description, use_cache=use_cache,
+                                    session_id=handler.session_id, filename=resume.filename)
+    except QueueFullException as e:
+        log.warning("Scoring queue full, rejecting job", retry_after=e.retry_after)
+        raise HTTPException(status_code=429, detail=e.error_message, headers={"Retry-After": str(e.retry_after)})
+    except InvalidUploadException as e:
+        log.error("Resume upload rejected", error=e.error_message, status_code=e.status_code)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message)
+    except Exception as e:
+        log.exception("Queueing resume scoring failed")
+        raise HTTPException(status_code=500, detail=f"Resume scoring failed: {getattr(e, 'error_message', e)}")
+
+    log.info("Scoring job queued", job_id=job_id, file=resume.filename)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/rater/jobs/{job_id}", "session_id": handler.session_id}
+
+
+@app.get("/rater/jobs/{job_id}")
+async def get_rating_job(job_id: str, request: Request):
+    job = await request.app.state.scoring_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job["status"] in ("queued", "running"):
+        ## hint for polling clients
+        return JSONResponse(job, headers={"Retry-After": "2"})
+    return job
+
+
+@app.post("/rater/batch")
+async def rate_resume_batch(
+    resumes: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    max_concurrency: Optional[int] = Form(None),
+    use_cache: bool = Form(True),
+    use_profile: Optional[bool] = Form(None),
+    shortlist: Optional[int] = Form(None),
+    mode: Optional[str] = Form(None),
+    analyzer: ResumeAnalyzer = Depends(get_analyzer),
+    handler: ResumeHandler = Depends(get_handler),
+):
+    ## shortlist=k: only the k resumes most similar to the job (local vector index) are LLM-scored
+    ## mode: llm | lite | lite-then-llm, applied to every resume (see POST /rater)
+    mode = resolve_mode(analyzer, mode)
+    batch_config = analyzer.registry.config.get("batch", {})
+    max_files = batch_config.get("max_files", 500)
+    if len(resumes) > max_files:
+        raise HTTPException(status_code=413, detail=f"Too many resumes: {len(resumes)} > {max_files}")
+
+    ## Never exceed the configured cap, callers may only lower it
+    limit = batch_config.get("max_concurrency", 8)
+    if max_concurrency:
+        limit = min(limit, max_concurrency)
+
+    log.info(f"Starting batch analysis - Files: {len(resumes)}, Concurrency: {limit}")
+    if use_profile is None:
+        use_profile = analyzer.registry.config.get("profiles", {}).get("enabled", False)
+    if shortlist and analyzer.registry.resume_index is None:
+        raise HTTPException(status_code=400, detail="shortlist needs vector_index.enabled in config.yaml")
+    scorer = BatchScorer(analyzer, handler, max_concurrency=limit, use_cache=use_cache, use_profile=use_profile,
+                         shortlist=shortlist, index=analyzer.registry.resume_index, mode=mode)
+
+    try:
+        resolved_job = await scorer.resolve_job(job_description)
+    except Exception as e:
+        log.exception("Batch job description resolution failed")
+        raise HTTPException(status_code=500, detail=f"Job description could not be resolved: {getattr(e, 'error_message', e)}")
+
+    ## Uploads are persisted before streaming starts, the request's files are closed once the handler returns
+    uploads = []
+    for index, resume in enumerate(resumes):
+        try:
+            uploads.append((resume.filename, await handler.asave_upload(resume, prefix=f"{index:04d}_"), None))
+        except Exception as e:
+            uploads.append((resume.filename, None, getattr(e, "error_message", str(e))))
+
+    async def ndjson():
+        async for item in scorer.score(uploads, resolved_job):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"X-Session-Id": handler.session_id},
+    )
+
+@app.post("/jobs", status_code=201)
+async def add_catalog_job(request: Request, job_description: str = Form(...), deadline_seconds: Optional[float] = Form(None), analyzer: ResumeAnalyzer = Depends(get_analyzer)):
+    ## Parse a posting (URL or text) once and keep it in the catalog; known postings are returned as-is
+    matcher = CatalogMatcher(analyzer, request.app.state.job_catalog)
+    deadline = start_deadline(budget_seconds(analyzer.registry.config, deadline_seconds))
+    try:
+        job, created = await within_deadline(request, deadline, matcher.aingest(job_description))
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.exception("Adding job to catalog failed")
+        raise HTTPException(status_code=500, detail=f"Job description could not be added: {getattr(e, 'error_message', e)}")
+    return JSONResponse({**job, "created": created}, status_code=201 if created else 200)
+
+
+@app.get("/jobs")
+async def list_catalog_jobs(request: Request, q: Optional[str] = None, company: Optional[str] = None,
+                            location: Optional[str] = None, limit: int = 50):
+    catalog: JobCatalog = request.app.state.job_catalog
+    jobs = await asyncio.to_thread(catalog.search, q, company, location, None, min(limit, 500))
+    return {"total": await asyncio.to_thread(catalog.count), "jobs": jobs}
+
+
+@app.post("/match")
+async def match_resume(
+    request: Request,
+    resume: UploadFile = File(...),
+    q: Optional[str] = Form(None),
+    company: Optional[str] = Form(None),
+    location: Optional[str] = Form(None),
+    job_ids: Optional[str] = Form(None),
+    limit: Optional[int] = Form(None),
+    max_concurrency: Optional[int] = Form(None),
+    use_cache: bool = Form(True),
+    use_profile: Optional[bool] = Form(None),
+    deadline_seconds: Optional[float] = Form(None),
+    analyzer: ResumeAnalyzer = Depends(get_analyzer),
+    handler: ResumeHandler = Depends(get_handler),
+):
+    ## Score one resume against every catalog posting matching the filters (job_ids: comma-separated), ranked
+    catalog_config = analyzer.registry.config.get("catalog", {})
+    max_jobs = catalog_config.get("max_match_jobs", 200)
+    concurrency = catalog_config.get("match_concurrency", 8)
+    if max_concurrency:
+        concurrency = min(concurrency, max_concurrency)
+    if use_profile is None:
+        use_profile = analyzer.registry.config.get("profiles", {}).get("enabled", False)
+    try:
+        ids = [int(job_id) for job_id in job_ids.split(",") if job_id.strip()] if job_ids else None
+    except ValueError:
+        raise HTTPException(status_code=422, detail="job_ids must be comma-separated integers")
+
+    catalog: JobCatalog = request.app.state.job_catalog
+    jobs = await asyncio.to_thread(catalog.search, q, company, location, ids, min(limit or max_jobs, max_jobs))
+    if not jobs:
+        raise HTTPException(status_code=404, detail="No catalog postings match the filters")
+    deadline = start_deadline(budget_seconds(analyzer.registry.config, deadline_seconds))
+
+    async def pipeline():
+        cv_content = await ingest_resume(resume, handler, analyzer.registry)
+        return await CatalogMatcher(analyzer, catalog, max_concurrency=concurrency).amatch(
+            cv_content, jobs, use_cache=use_cache, use_profile=use_profile
+        )
+
+    try:
+        result = await within_deadline(request, deadline, pipeline())
+    except HTTPException:
+        raise
+    except InvalidUploadException as e:
+        log.error("Resume upload rejected", error=e.error_message, status_code=e.status_code)
+        raise HTTPException(status_code=e.status_code, detail=e.error_message)
+    except Exception as e:
+        log.exception("Catalog match failed")
+        raise HTTPException(status_code=500, detail=f"Resume matching failed: {getattr(e, 'error_message', e)}")
+    return {"session_id": handler.session_id, **result, "resume_profile": analyzer.resume_profile}
+
 #uvicorn api.main:app --host 0.0.0.0 --port 8080
\ No newline at end of file
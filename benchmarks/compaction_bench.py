@@ -0,0 +1,87 @@
+###
+# Measures how much the compaction pipelines in config.yaml shrink LLM input.
+# Samples: synthetic multi-page resumes with running headers/footers, a job page wrapped in
+# typical site chrome, tempJob.txt, plus any PDFs / HTML files passed on the command line.
+# Run from the repo root: python -m benchmarks.compaction_bench [extra.pdf extra.html ...]
+import sys
+import time
+import fitz
+from utils.config_loader import load_config
+from src.resume_rater.compaction import build_compactor, estimate_tokens, html_to_text
+from src.resume_rater.data_ingestion import ResumeHandler
+
+SITE_CHROME = """<html><head><script>{script}</script><style>{style}</style></head><body>
+<nav>Home Jobs Teams Locations Students Benefits Sign in</nav>
+<div id="cookie-consent">We use cookies to improve your experience. Accept all. Manage preferences.</div>
+<main>{posting}</main>
+<div class="related-jobs">{related}</div>
+<footer>About us Careers Press Privacy Terms Accessibility Copyright 2025</footer>
+</body></html>"""
+
+
+def make_resume_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        body = [
+            "Jane Candidate  |  jane@example.com  |  +1 555 0100",
+            "Senior Data Engineer",
+            "",
+        ]
+        body += [f"-   Built   streaming    pipelines   with Kafka,  Spark  and  Python ({page_num}.{i})" for i in range(30)]
+        body += ["", "Confidential - do not distribute", f"Page {page_num + 1} of {pages}"]
+        page.insert_text((40, 50), "\n".join(body), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_job_page(job_text: str) -> str:
+    posting = "".join(f"<p>{line}</p>" for line in job_text.splitlines() if line.strip())
+    related = " ".join(f"<a href='/jobs/{i}'>Software Engineer {i} - Remote</a>" for i in range(40))
+    return SITE_CHROME.format(script="window.dataLayer=[];" * 200, style=".btn{color:red}" * 200,
+                              posting=posting, related=related)
+
+
+def report(label: str, compactor, text: str):
+    start = time.perf_counter()
+    _, stats = compactor.compact(text)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<28} {stats['tokens_before']:>7} -> {stats['tokens_after']:>6} tokens "
+          f"({stats['reduction']:.0%} saved, {elapsed:.1f} ms)")
+    return stats
+
+
+def main():
+    config = load_config()
+    handler = ResumeHandler(data_dir="data/benchmarks", session_id="compaction")
+    with open("tempJob.txt", "r", encoding="utf-8") as file:
+        job_text = file.read()
+
+    resumes = {f"resume_{pages}_pages": handler.read_pdf_bytes(make_resume_pdf(pages)) for pages in (1, 3, 6)}
+    postings = {"job_page_html": make_job_page(job_text)}
+    texts = {"tempJob.txt": job_text}
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            data = f.read()
+        if path.lower().endswith(".pdf"):
+            resumes[path] = handler.read_pdf_bytes(data)
+        else:
+            postings[path] = data.decode("utf-8", errors="replace")
+
+    totals = [0, 0]
+    for kind, samples in (("resume", resumes), ("job_html", postings), ("job_text", texts)):
+        compactor = build_compactor(config, kind)
+        print(f"[{kind}] steps={compactor.steps} budget={compactor.token_budget}")
+        for label, text in samples.items():
+            stats = report(label, compactor, text)
+            if kind == "job_html":
+                ## what JobLoader sent before compaction: the whole page's visible text
+                print(f"{'  whole-page text baseline':<28} {estimate_tokens(html_to_text(text)):>7} tokens")
+            totals[0] += stats["tokens_before"]
+            totals[1] += stats["tokens_after"]
+    print(f"TOTAL {totals[0]} -> {totals[1]} tokens ({1 - totals[1] / totals[0]:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
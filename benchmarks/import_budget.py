@@ -0,0 +1,69 @@
+###
+# Cold start budget of the API process:
+# 1. Imports api.main in fresh interpreters (python -X importtime) and keeps the fastest run
+# 2. Lists the slowest top-level imports
+# 3. Fails (exit 1) above --budget-ms, or when a module that should only load on first use was imported:
+#    provider SDKs (only the configured one, inside load_llm), PyMuPDF (only in extraction workers),
+#    bs4 (job pages) and faiss (only with the vector index enabled). requests is not on the list:
+#    langchain_core and langsmith import it themselves.
+# Meant for CI next to the smoke tests; the budget is for this machine class, raise it for slower runners.
+# Run from the repo root: python -m benchmarks.import_budget [--budget-ms 2500] [--runs 3]
+import os
+import sys
+import argparse
+import subprocess
+
+LAZY_MODULES = ("fitz", "pymupdf", "bs4", "faiss", "langchain_google_genai", "langchain_groq", "aiohttp")
+
+
+def measure(module: str) -> dict:
+    ## (self, cumulative) microseconds and nesting depth per module, from one fresh interpreter
+    env = dict(os.environ, LLM_PROVIDER=os.environ.get("LLM_PROVIDER", "fake"))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.rstrip()
+        ## nesting depth is the indentation of the name
+        modules[name.strip()] = (int(self_us), int(cumulative_us), len(name) - len(name.lstrip()))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API import time budget")
+    parser.add_argument("--module", default="api.main")
+    parser.add_argument("--budget-ms", type=float, default=2500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda modules: modules[args.module][1])
+    total_ms = best[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+
+    ## direct imports of the measured module, i.e. one level deeper than it in the tree
+    depth = best[args.module][2]
+    top_level = sorted(((name, cumulative) for name, (_, cumulative, indent) in best.items() if indent == depth + 2),
+                       key=lambda item: item[1], reverse=True)
+    for name, cumulative in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = sorted(name for name in best if name.split(".")[0] in LAZY_MODULES)
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup but meant to load on first use: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
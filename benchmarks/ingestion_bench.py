@@ -0,0 +1,78 @@
+###
+# Compares the two PDF ingestion paths of ResumeHandler:
+# 1. disk:   save_pdf() writes the upload, read_pdf() reopens it from disk
+# 2. memory: read_upload() + read_pdf_bytes() parse straight from the upload buffer
+# Reports mean / p95 latency and peak traced memory per path.
+# Run from the repo root: python -m benchmarks.ingestion_bench --pages 5 --iterations 50
+import io
+import time
+import argparse
+import tempfile
+import tracemalloc
+import statistics
+import fitz
+from src.resume_rater.data_ingestion import ResumeHandler
+
+
+class FakeUpload:
+    ## Mimics fastapi.UploadFile: a filename plus a readable, seekable file object
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.file = io.BytesIO(data)
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        lines = [f"Page {page_num + 1} - Experience line {i}: built services in Python and SQL" for i in range(40)]
+        page.insert_text((50, 60), "\n".join(lines), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def run_disk(handler: ResumeHandler, data: bytes) -> str:
+    path = handler.save_pdf(FakeUpload("resume.pdf", data))
+    return handler.read_pdf(path)
+
+
+def run_memory(handler: ResumeHandler, data: bytes) -> str:
+    _, buffer = handler.read_upload(FakeUpload("resume.pdf", data))
+    return handler.read_pdf_bytes(buffer)
+
+
+def measure(fn, handler, data, iterations):
+    latencies = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(handler, data)
+        latencies.append((time.perf_counter() - start) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark disk vs in-memory PDF ingestion")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    data = make_pdf(args.pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = ResumeHandler(data_dir=tmp, session_id="bench")
+        assert run_disk(handler, data) == run_memory(handler, data)
+        print(f"PDF size: {len(data) / 1024:.1f} KiB, pages: {args.pages}, iterations: {args.iterations}")
+        for name, fn in (("disk", run_disk), ("memory", run_memory)):
+            print(f"{name:>6}: {measure(fn, handler, data, args.iterations)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+###
+# Compares the lite scorer (mode=lite) with LLM scoring on synthetic resumes:
+# 1. Speed: lite latency per resume (p50 / p95), rank() throughput over the whole set, and LLM latency on a sample
+# 2. Quality: precision@k of both against synthetic labels (share of the top k written for the job's role)
+# 3. Agreement: Spearman correlation of lite and LLM scores, and how much of the LLM's top k
+#    the lite top 2k keeps (what lite-then-llm triage would keep)
+# Agreement only means something with a real provider; the offline fake model scores by prompt hash.
+# Run from the repo root: python -m benchmarks.lite_scoring_bench [--resumes 2000] [--llm-sample 40]
+import os
+import time
+import random
+import asyncio
+import argparse
+import numpy as np
+os.environ.setdefault("LLM_PROVIDER", "fake")
+from utils.llm_registry import LLMRegistry
+from src.resume_rater.data_analisis import ResumeAnalyzer
+
+ROLES = {
+    "data_engineer": ("Data Engineer", "Python, SQL, Spark, Kafka, Airflow, dbt, Snowflake", "Computer Science"),
+    "frontend": ("Frontend Engineer", "JavaScript, TypeScript, React, CSS, HTML, Figma, Jest", "Computer Science"),
+    "ml_engineer": ("Machine Learning Engineer", "Python, PyTorch, TensorFlow, MLflow, scikit-learn, Kubernetes", "Statistics"),
+    "devops": ("DevOps Engineer", "Kubernetes, Terraform, AWS, Docker, CI/CD, Prometheus, Linux", "Information Technology"),
+    "backend_java": ("Backend Engineer", "Java, Spring Boot, Microservices, PostgreSQL, Kafka, REST APIs", "Software Engineering"),
+    "product_manager": ("Product Manager", "Roadmap, Stakeholders, Jira, Agile, A/B testing, SQL", "Business Administration"),
+}
+DEGREES = ["BSc", "MSc", "PhD", "Diploma"]
+FILLER = ["Collaborated with cross-functional teams", "Improved processes", "Communicated with stakeholders",
+          "Mentored junior colleagues", "Delivered projects on time"]
+
+
+def make_resume(role: str, rng: random.Random) -> str:
+    ## mostly the role's skills, one or two of a neighbouring role, a few dated positions and a degree
+    title, skills, field = ROLES[role]
+    own = skills.split(", ")
+    other = ROLES[rng.choice([r for r in ROLES if r != role])][1].split(", ")
+    picked = rng.sample(own, rng.randint(2, len(own))) + rng.sample(other, 2)
+    year = 2025
+    lines = [f"Candidate {rng.randrange(10**6)}", f"{title}", "Experience"]
+    for _ in range(rng.randint(1, 3)):
+        start = year - rng.randint(1, 5)
+        lines.append(f"{title}, Company {rng.randrange(100)}  {start} - {year if year < 2025 else 'present'}")
+        lines.append(f"- Built systems with {', '.join(rng.sample(picked, min(3, len(picked))))}")
+        lines.append(f"- {rng.choice(FILLER)}")
+        year = start
+    lines += ["Skills: " + ", ".join(picked), "Education", f"{rng.choice(DEGREES)} {field}, University {rng.randrange(50)}"]
+    return "\n".join(lines)
+
+
+def make_job(role: str) -> str:
+    title, skills, field = ROLES[role]
+    return (f"{title}\nWe are hiring a {title}.\nRequirements:\n- 3+ years of experience\n- {skills}\n"
+            f"- Bachelor's degree in {field} or similar\nNice to have: mentoring experience")
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def spearman(a, b) -> float:
+    ranks_a = np.argsort(np.argsort(a)).astype(float)
+    ranks_b = np.argsort(np.argsort(b)).astype(float)
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def precision_at(scores, labels, role, k) -> float:
+    top = np.argsort(scores)[::-1][:k]
+    return sum(labels[i] == role for i in top) / k
+
+
+def bench_lite(analyzer: ResumeAnalyzer, resumes, labels, role, k):
+    scorer = analyzer.registry.get_lite_scorer()
+    job = make_job(role)
+    latencies = []
+    for text in resumes[:500]:
+        start = time.perf_counter()
+        scorer.score(text, job)
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    results = scorer.rank(resumes, job)
+    ranked = time.perf_counter() - start
+    scores = [result["overall_score"] for result in results]
+    print(f"lite  {len(resumes)} resumes  score p50 {percentile(latencies, 0.5) * 1000:6.2f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:6.2f} ms  rank() {len(resumes) / ranked:8.0f} resumes/s  "
+          f"precision@{k} {precision_at(scores, labels, role, k):.2f}")
+
+
+async def bench_llm(analyzer: ResumeAnalyzer, resumes, labels, role, k):
+    ## LLM and lite scores of the same sample
+    job = make_job(role)
+    semaphore = asyncio.Semaphore(8)
+    latencies = []
+
+    async def score(text):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await analyzer.ascore_resume(text, job, use_cache=False)
+            latencies.append(time.perf_counter() - start)
+            return result["overall_score"]
+    llm_scores = await asyncio.gather(*(score(text) for text in resumes))
+    lite_scores = [result["overall_score"] for result in analyzer.registry.get_lite_scorer().rank(resumes, job)]
+    llm_top = set(np.argsort(llm_scores)[::-1][:k])
+    lite_shortlist = set(np.argsort(lite_scores)[::-1][:2 * k])
+    print(f"llm   {len(resumes)} resumes  score p50 {percentile(latencies, 0.5) * 1000:6.0f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:6.0f} ms  ({analyzer.registry.default_provider})  "
+          f"precision@{k} {precision_at(llm_scores, labels, role, k):.2f} vs lite {precision_at(lite_scores, labels, role, k):.2f}")
+    print(f"agreement  spearman {spearman(lite_scores, llm_scores):.2f}  "
+          f"LLM top-{k} kept by the lite top-{2 * k}: {len(llm_top & lite_shortlist) / k:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lite scorer vs LLM scoring benchmark")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--llm-sample", type=int, default=40, help="resumes also scored by the LLM, 0 to skip")
+    args = parser.parse_args()
+    rng = random.Random(7)
+    labels = rng.choices(list(ROLES), k=args.resumes)
+    resumes = [make_resume(label, rng) for label in labels]
+    role = rng.choice(list(ROLES))
+
+    registry = LLMRegistry()
+    registry.result_cache = None
+    analyzer = ResumeAnalyzer(registry=registry)
+    bench_lite(analyzer, resumes, labels, role, args.k)
+    if args.llm_sample:
+        sample = args.llm_sample
+        asyncio.run(bench_llm(analyzer, resumes[:sample], labels[:sample], role, min(args.k, sample // 4)))
+    asyncio.run(registry.aclose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+###
+# Offline load test for POST /rater, no API keys or network needed:
+# 1. LLM calls go to the fake provider (config.yaml `llm.fake`) with a configurable latency
+# 2. Synthetic resumes of varying page counts are generated with PyMuPDF
+# 3. Job postings are served from a local HTTP stub, so URL jobs exercise the fetch + extract path
+# 4. Requests run in-process through httpx.ASGITransport at fixed concurrency levels
+# Reports req/s, p50/p95/p99 latency, per-stage latency (from Server-Timing) and peak RSS per level,
+# saves everything as JSON and optionally compares against a previous run.
+# Run from the repo root:
+#   python -m benchmarks.load_bench --concurrency 1 8 32 --requests 64 --latency-ms 300
+#   python -m benchmarks.load_bench --baseline benchmarks/results/<earlier>.json --max-regression 0.15
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import resource
+import shutil
+import tempfile
+import threading
+import statistics
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import yaml
+import httpx
+from benchmarks.ingestion_bench import make_pdf
+from benchmarks.compaction_bench import make_job_page
+
+RESULTS_DIR = "benchmarks/results"
+
+
+class JobPageStub(BaseHTTPRequestHandler):
+    ## Serves /jobs/<n> as a full job page with site chrome around tempJob.txt
+    page = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_job_stub() -> ThreadingHTTPServer:
+    with open("tempJob.txt", "r", encoding="utf-8") as file:
+        JobPageStub.page = make_job_page(file.read()).encode("utf-8")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JobPageStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+## (section, key, file name) of every file or directory the service writes state to
+STATE_PATHS = (
+    ("cache", "db_path", "results.sqlite"),
+    ("job_loader", "store_path", "jobs.sqlite"),
+    ("storage", "root", "uploads"),
+    ("storage", "index_path", "uploads/index.sqlite"),
+    ("storage", "legacy_session_dir", "resume_analysis"),
+    ("vector_index", "index_path", "resume_index.faiss"),
+    ("queue", "db_path", "scoring_jobs.sqlite"),
+    ("catalog", "db_path", "job_catalog.sqlite"),
+    ("rate_limiting", "state_dir", "ratelimits"),
+)
+
+
+def isolate_state(config: dict, workdir: str):
+    ## Points every stateful path of a loaded config at workdir, so runs never touch data/
+    for section, key, name in STATE_PATHS:
+        config.setdefault(section, {})[key] = os.path.join(workdir, name)
+
+
+def write_bench_config(workdir: str, args) -> str:
+    ## Copy of config.yaml with the fake provider tuned and all state isolated in a temp dir.
+    ## The upload store is off: it keeps extracted text per content hash, so repeated synthetic
+    ## resumes would skip PDF parsing after the first request and hide its latency.
+    with open("config/config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["llm"]["fake"].update({"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms})
+    isolate_state(config, workdir)
+    config["cache"]["enabled"] = args.cache
+    config["storage"]["enabled"] = False
+    config.setdefault("ingestion", {})["archive"] = False
+    config.setdefault("registry", {})["reload_on_change"] = False
+    path = os.path.join(workdir, "config.yaml")
+    with open(path, "w") as file:
+        yaml.safe_dump(config, file)
+    return path
+
+
+def peak_rss_mb() -> float:
+    ## ru_maxrss is KiB on Linux; children covers the PDF extraction workers
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round((own + children) / 1024, 1)
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 2)
+
+
+def parse_server_timing(header: str) -> dict:
+    stages = {}
+    for part in filter(None, (item.strip() for item in header.split(","))):
+        name, _, duration = part.partition(";dur=")
+        if duration:
+            stages[name] = float(duration)
+    return stages
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, total: int, resumes, jobs) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, stage_samples, errors = [], {}, 0
+
+    async def one(index: int):
+        nonlocal errors
+        pages, pdf = resumes[index % len(resumes)]
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/rater",
+                files={"resume": (f"resume_{pages}p.pdf", pdf, "application/pdf")},
+                data={"job_description": jobs[index % len(jobs)], "use_cache": "true"},
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors += 1
+            return
+        for stage, duration in parse_server_timing(response.headers.get("server-timing", "")).items():
+            stage_samples.setdefault(stage, []).append(duration)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "req_per_s": round(total / elapsed, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "stages": {
+            stage: {"p50_ms": percentile(values, 0.50), "p95_ms": percentile(values, 0.95)}
+            for stage, values in sorted(stage_samples.items())
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(results: dict, baseline_path: str, max_regression: float) -> bool:
+    with open(baseline_path, "r") as file:
+        baseline = {level["concurrency"]: level for level in json.load(file)["levels"]}
+    ok = True
+    print(f"\nvs baseline {baseline_path}")
+    for level in results["levels"]:
+        base = baseline.get(level["concurrency"])
+        if base is None:
+            continue
+        throughput = level["req_per_s"] / base["req_per_s"] - 1
+        p95 = level["p95_ms"] / base["p95_ms"] - 1
+        regressed = throughput < -max_regression or p95 > max_regression
+        ok = ok and not regressed
+        print(f"  c={level['concurrency']:<4} req/s {throughput:+.1%}  p95 {p95:+.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+async def main_async(args) -> dict:
+    ## the API module builds loggers on import; keep the console to benchmark output only
+    from api.main import app
+    from utils.llm_registry import LLMRegistry
+    from src.resume_rater.pdf_extraction import get_pdf_extractor
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    stub = start_job_stub()
+    workdir = tempfile.mkdtemp(prefix="resume_rater_bench_")
+    ## ASGITransport does not run the lifespan hook, so build the registry here
+    app.state.registry = LLMRegistry(write_bench_config(workdir, args))
+    app.state.registry.warm_up()
+
+    resumes = [(pages, make_pdf(pages)) for pages in args.pages]
+    job_urls = [f"http://127.0.0.1:{stub.server_address[1]}/jobs/{i}" for i in range(args.job_urls)]
+    with open("tempJob.txt", "r", encoding="utf-8") as file:
+        jobs = job_urls + [file.read()]
+
+    levels = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            for concurrency in args.concurrency:
+                level = await run_level(client, concurrency, args.requests, resumes, jobs)
+                levels.append(level)
+                print(f"c={concurrency:<4} {level['req_per_s']:>8} req/s  p50 {level['p50_ms']:>8} ms  "
+                      f"p95 {level['p95_ms']:>8} ms  p99 {level['p99_ms']:>8} ms  errors {level['errors']}  "
+                      f"rss {level['peak_rss_mb']} MB")
+    finally:
+        get_pdf_extractor().shutdown()
+        await app.state.registry.aclose()
+        stub.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "pages": args.pages,
+            "job_urls": args.job_urls, "cache": args.cache, "requests": args.requests,
+        },
+        "levels": levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline /rater load test")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--latency-ms", type=int, default=300, help="fake LLM latency")
+    parser.add_argument("--jitter-ms", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 8], help="synthetic resume page counts")
+    parser.add_argument("--job-urls", type=int, default=4, help="distinct job pages served by the stub")
+    parser.add_argument("--cache", action="store_true", help="enable the result cache")
+    parser.add_argument("--output", default=None, help=f"result file, default {RESULTS_DIR}/load_<timestamp>.json")
+    parser.add_argument("--baseline", default=None, help="earlier result file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.15)
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    results = asyncio.run(main_async(args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+###
+# Checks that logging stays flat over the life of a process:
+# 1. Simulates 10k requests, each building its loggers the way ResumeAnalyzer / ResumeHandler do
+# 2. Reports root handler count and open log files before and after (should not change)
+# 3. Reports per-request logging overhead for the first and last 1k requests
+# Run from the repo root: python -m benchmarks.logging_bench 2>/dev/null (console copies go to stderr)
+import os
+import time
+import logging
+from logger.custom_logger import CustomLogger, shutdown_logging
+
+REQUESTS = 10000
+WINDOW = 1000
+
+
+def open_log_files() -> int:
+    fd_dir = f"/proc/{os.getpid()}/fd"
+    if not os.path.isdir(fd_dir):
+        return -1
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            count += os.readlink(os.path.join(fd_dir, fd)).endswith(".log")
+        except OSError:
+            pass
+    return count
+
+
+def one_request(request_id: int):
+    log = CustomLogger().get_logger(__file__)
+    log.info("Resume Analyzer initialized successfully")
+    log.info("Inputs compacted", request_id=request_id, resume={"tokens_before": 1200, "tokens_after": 900})
+    log.debug("Raw LLM response", response="x" * 20000)
+
+
+def main():
+    CustomLogger().get_logger(__file__)
+    before = (len(logging.getLogger().handlers), open_log_files())
+
+    timings = []
+    for request_id in range(REQUESTS):
+        start = time.perf_counter()
+        one_request(request_id)
+        timings.append(time.perf_counter() - start)
+
+    after = (len(logging.getLogger().handlers), open_log_files())
+    shutdown_logging()
+    first = sum(timings[:WINDOW]) / WINDOW * 1e6
+    last = sum(timings[-WINDOW:]) / WINDOW * 1e6
+    print(f"root handlers: {before[0]} -> {after[0]}, open log files: {before[1]} -> {after[1]}")
+    print(f"per-request logging overhead: first {WINDOW} {first:.1f} us, last {WINDOW} {last:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+###
+# Compares scoring raw resume text against scoring the cached ResumeProfile:
+# 1. Every resume is scored against every job, once from raw text and once from its profile
+# 2. Reports both overall scores and their difference per pair
+# 3. Reports provider-reported input/output tokens for each path; the profile path includes
+#    the one extraction call per resume, which later jobs reuse from the profile cache
+# Samples: three short synthetic resumes, a 4-page generated PDF resume, and three jobs
+# (one from tempJob.txt), plus PDFs given on the command line. Uses LLM_PROVIDER (the offline fake
+# model if unset); score differences only mean something against a real provider.
+# The result cache is bypassed so every score is a real call.
+# Run from the repo root: python -m benchmarks.profile_bench [resume.pdf ...]
+import os
+import sys
+import asyncio
+import tempfile
+os.environ.setdefault("LLM_PROVIDER", "fake")
+from utils.llm_registry import LLMRegistry
+from utils.metrics import LLM_TOKENS
+from src.resume_rater.data_analisis import ResumeAnalyzer
+from src.resume_rater.data_ingestion import ResumeHandler
+from benchmarks.compaction_bench import make_resume_pdf
+
+RESUMES = {
+    "data_engineer": """Jane Candidate - Senior Data Engineer - jane@example.com
+Summary: 8 years building data platforms. Passionate about reliable pipelines and mentoring.
+Experience
+Senior Data Engineer, Streamly (2020 - present)
+- Built Kafka and Spark Structured Streaming pipelines processing 2B events per day
+- Cut warehouse cost 35% by moving batch jobs from Redshift to Snowflake with dbt
+- Mentored 4 engineers, led the on-call rotation
+Data Engineer, RetailCo (2016 - 2020)
+- Owned Airflow DAGs for 120 daily ETL jobs in Python and SQL
+- Designed the customer 360 data model in PostgreSQL
+Education: BSc Computer Science, University of Leeds, 2016
+Certifications: AWS Certified Data Analytics - Specialty
+Skills: Python, SQL, Kafka, Spark, Airflow, dbt, Snowflake, AWS, Terraform, Docker
+""",
+    "frontend_developer": """Sam Developer - Frontend Engineer
+Experience
+Frontend Engineer, PixelWorks (2021 - present)
+- Rebuilt the checkout in React and TypeScript, conversion +6%
+- Introduced Playwright end-to-end tests, flaky releases down 80%
+Web Developer, Agency One (2019 - 2021)
+- Delivered 30+ marketing sites with Next.js and Tailwind
+Education: BA Graphic Design, Falmouth University, 2019
+Skills: JavaScript, TypeScript, React, Next.js, CSS, Tailwind, Figma, Playwright
+""",
+    "ml_engineer": """Alex Researcher - Machine Learning Engineer
+Experience
+ML Engineer, VisionAI (2019 - present)
+- Trained and deployed PyTorch detection models serving 50 requests/s on Kubernetes
+- Built a feature store on Feast and Redis
+Research Assistant, University of Toronto (2016 - 2019)
+- Published 3 papers on semi-supervised learning
+Education: MSc Machine Learning, University of Toronto, 2019
+Skills: Python, PyTorch, TensorFlow, Kubernetes, Docker, SQL, MLflow, Feast
+""",
+}
+
+JOBS = {
+    "backend_python": """Senior Backend Engineer (Python). You will design APIs with FastAPI, own PostgreSQL schemas and
+run services on AWS. Requirements: 5+ years Python, SQL, AWS, Docker, experience with event streaming (Kafka) a plus.""",
+    "react_frontend": """Frontend Engineer. Build our customer dashboard in React and TypeScript, own the design system
+and end-to-end tests. Requirements: 3+ years React, TypeScript, CSS, testing with Playwright or Cypress.""",
+}
+
+
+def total_tokens(registry: LLMRegistry, kind: str) -> float:
+    return sum(LLM_TOKENS.value(provider=provider, type=kind) for provider in registry.config["llm"])
+
+
+async def run(registry: LLMRegistry, resumes: dict, jobs: dict):
+    analyzer = ResumeAnalyzer(registry=registry)
+    rows = []
+    usage = {}
+    for path in ("raw", "profile"):
+        input_before, output_before = total_tokens(registry, "input"), total_tokens(registry, "output")
+        for resume_name, resume_text in resumes.items():
+            for job_name, job_text in jobs.items():
+                profile = None
+                if path == "profile":
+                    ## cached after the first job, as in production
+                    profile = await analyzer.aextract_profile(resume_text)
+                result = await analyzer.ascore_resume(resume_text, job_text, use_cache=False, profile=profile)
+                rows.append((path, resume_name, job_name, result["overall_score"]))
+        usage[path] = (total_tokens(registry, "input") - input_before, total_tokens(registry, "output") - output_before)
+    return rows, usage
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        registry = LLMRegistry()
+        ## fresh profile cache so the extraction calls are counted
+        registry.config["cache"]["db_path"] = os.path.join(cache_dir, "bench.sqlite")
+        registry.result_cache = registry._build_result_cache()
+        registry.profile_cache = registry._build_profile_cache()
+
+        resumes = dict(RESUMES)
+        handler = ResumeHandler(data_dir=cache_dir, session_id="profile_bench")
+        resumes["generated_4_pages"] = handler.read_pdf_bytes(make_resume_pdf(4))
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                resumes[os.path.basename(path)] = handler.read_pdf_bytes(f.read())
+        jobs = dict(JOBS)
+        with open("tempJob.txt", "r", encoding="utf-8") as file:
+            jobs["tempJob.txt"] = file.read()
+
+        rows, usage = asyncio.run(run(registry, resumes, jobs))
+        asyncio.run(registry.aclose())
+
+    scores = {}
+    for path, resume_name, job_name, score in rows:
+        scores.setdefault((resume_name, job_name), {})[path] = score
+    print(f"provider: {registry.default_provider}")
+    print(f"{'resume':<22} {'job':<16} {'raw':>5} {'profile':>8} {'diff':>6}")
+    diffs = []
+    for (resume_name, job_name), pair in scores.items():
+        diff = pair["profile"] - pair["raw"]
+        diffs.append(abs(diff))
+        print(f"{resume_name[:22]:<22} {job_name[:16]:<16} {pair['raw']:>5} {pair['profile']:>8} {diff:>+6}")
+    print(f"mean |diff| {sum(diffs) / len(diffs):.1f} points, max {max(diffs)}")
+    print()
+    print(f"{'path':<8} {'input tokens':>13} {'output tokens':>14}")
+    for path, (input_tokens, output_tokens) in usage.items():
+        print(f"{path:<8} {input_tokens:>13.0f} {output_tokens:>14.0f}")
+    raw_input, profile_input = usage["raw"][0], usage["profile"][0]
+    if raw_input:
+        print(f"profile path uses {profile_input / raw_input:.0%} of the raw path's input tokens "
+              f"({len(resumes)} resumes x {len(jobs)} jobs)")
+
+
+if __name__ == "__main__":
+    main()
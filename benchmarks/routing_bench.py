@@ -0,0 +1,113 @@
+###
+# Exercises LLMRouter against two fake providers with injected delays and errors:
+# 1. steady:   both healthy, "primary" faster, it should take nearly all calls
+# 2. slowdown: "primary" gets slow, hedged calls to "secondary" should cap the tail latency
+# 3. outage:   "primary" fails every call, failover keeps calls succeeding and its circuit opens
+# 4. recovery: "primary" is healthy again, it is re-admitted after the cool-down
+# Reports p50/p95/p99, winners, hedges, failovers and errors per phase.
+# Run from the repo root: python -m benchmarks.routing_bench --calls 40 --concurrency 8
+import os
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+import yaml
+from utils.llm_registry import LLMRegistry
+from utils.llm_router import ROUTED_CALLS, HEDGED_CALLS, FAILOVERS
+
+PHASES = [
+    ("steady", {"latency_seconds": 0.2, "error_rate": 0.0}),
+    ("slowdown", {"latency_seconds": 2.5, "error_rate": 0.0}),
+    ("outage", {"latency_seconds": 0.2, "error_rate": 1.0}),
+    ("recovery", {"latency_seconds": 0.2, "error_rate": 0.0}),
+]
+
+
+def write_config(workdir: str, cooldown: float) -> str:
+    with open("config/config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    fake = {"provider": "fake", "model_name": "fake-json", "temperature": 0, "jitter_ms": 50}
+    config["llm"]["primary"] = {**fake, "latency_ms": 200}
+    config["llm"]["secondary"] = {**fake, "latency_ms": 450}
+    config["routing"] = {
+        **config.get("routing", {}),
+        "enabled": True, "providers": ["primary", "secondary"], "min_samples": 5,
+        "hedge_min_ms": 300, "cooldown_seconds": cooldown, "explore_rate": 0.05,
+    }
+    config["cache"] = {"enabled": False}
+    config["job_loader"] = {**config.get("job_loader", {}), "store_path": os.path.join(workdir, "jobs.sqlite")}
+    path = os.path.join(workdir, "config.yaml")
+    with open(path, "w") as file:
+        yaml.safe_dump(config, file)
+    return path
+
+
+def counts(counter, providers, **labels) -> dict:
+    return {provider: counter.value(provider=provider, **labels) for provider in providers}
+
+
+async def run_phase(registry: LLMRegistry, calls: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+    inputs = {
+        "format_instructions": registry.get_format_instructions("resume_analysis"),
+        "job_description": "Backend engineer, Python",
+        "resume_text": "Python developer",
+    }
+
+    async def one(index: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await registry.ainvoke("resume_analysis", {**inputs, "resume_text": f"Python developer {index}"})
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(ordered), 1),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 1),
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1], 1),
+        "errors": errors,
+    }
+
+
+async def main_async(args):
+    registry = LLMRegistry(write_config(tempfile.mkdtemp(prefix="resume_rater_routing_"), args.cooldown))
+    providers = registry.router.providers
+    primary = registry.get_llm("primary")
+
+    for name, settings in PHASES:
+        for key, value in settings.items():
+            setattr(primary, key, value)
+        if name == "recovery":
+            await asyncio.sleep(args.cooldown)
+        wins, hedges, failovers = (counts(ROUTED_CALLS, providers, outcome="win"),
+                                   counts(HEDGED_CALLS, providers), counts(FAILOVERS, providers))
+        result = await run_phase(registry, args.calls, args.concurrency)
+        delta = lambda before, counter, **labels: {p: int(v - before[p]) for p, v in counts(counter, providers, **labels).items()}
+        print(f"{name:<9} p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms  p99 {result['p99_ms']:>7} ms  "
+              f"errors {result['errors']}  wins {delta(wins, ROUTED_CALLS, outcome='win')}  "
+              f"hedges {delta(hedges, HEDGED_CALLS)}  failovers {delta(failovers, FAILOVERS)}")
+        print(f"          health {registry.router.stats()}")
+    await registry.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged routing / failover demo on fake providers")
+    parser.add_argument("--calls", type=int, default=40, help="calls per phase")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cooldown", type=float, default=3.0, help="circuit breaker cool-down seconds")
+    args = parser.parse_args()
+    os.environ["LLM_PROVIDER"] = "primary"
+    logging.getLogger().setLevel(logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
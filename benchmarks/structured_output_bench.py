@@ -0,0 +1,82 @@
+###
+# Reports what structured output mode saves and how much the local JSON repair recovers:
+# 1. Prompt tokens per call, full prompt (format instructions + example) vs compact JSON-mode prompt
+# 2. Repair success rate on typical LLM breakage of a valid ResumeRater / JobDescription answer
+# Uses the fake provider, no API key or network needed.
+# Run from the repo root: python -m benchmarks.structured_output_bench
+import os
+import json
+os.environ.setdefault("LLM_PROVIDER", "fake")
+from pydantic import ValidationError
+from utils.fake_llm import FakeJSONChatModel
+from utils.json_repair import load_json
+from utils.llm_registry import LLMRegistry, OUTPUT_SCHEMAS
+
+## name -> function turning a valid JSON answer into a broken one
+BREAKAGES = {
+    "code_fence": lambda text: f"```json\n{text}\n```",
+    "leading_chatter": lambda text: f"Here is the analysis you asked for:\n{text}",
+    "trailing_chatter": lambda text: f"{text}\nLet me know if you need anything else.",
+    "trailing_comma": lambda text: text[:-1] + ",}",
+    "smart_quotes": lambda text: text.replace('"', "“", 2),
+    "truncated_10pct": lambda text: text[:int(len(text) * 0.9)],
+    "truncated_50pct": lambda text: text[:len(text) // 2],
+    "no_json": lambda text: "I cannot evaluate this resume.",
+}
+
+
+def prompt_tokens(registry: LLMRegistry, name: str, inputs: dict):
+    structured = registry.config.setdefault("structured_output", {})
+    counts = {}
+    for enabled, label in ((False, "full"), (True, "compact")):
+        structured["enabled"] = enabled
+        counts[label] = registry.count_prompt_tokens(name, registry.default_provider, inputs)
+    return counts
+
+
+def repair_outcome(name: str, text: str) -> str:
+    data, outcome = load_json(text)
+    if data is None:
+        return outcome
+    try:
+        OUTPUT_SCHEMAS[name].model_validate(data)
+    except ValidationError:
+        ## parsed, but a truncated answer lost required fields: needs the re-ask
+        return "invalid"
+    return outcome
+
+
+def main():
+    registry = LLMRegistry()
+    with open("tempJob.txt", "r", encoding="utf-8") as file:
+        job_text = file.read()
+    resume_text = "Senior Data Engineer. Built streaming pipelines with Kafka, Spark and Python. " * 40
+    samples = {
+        "resume_analysis": {"job_description": job_text, "resume_text": resume_text},
+        "job_description": {"job_text": job_text},
+    }
+
+    print(f"{'prompt':<18} {'full':>7} {'compact':>8} {'saved':>7}")
+    for name, inputs in samples.items():
+        inputs["format_instructions"] = registry.get_format_instructions(name)
+        counts = prompt_tokens(registry, name, inputs)
+        print(f"{name:<18} {counts['full']:>7} {counts['compact']:>8} {1 - counts['compact'] / counts['full']:>7.0%}")
+
+    print()
+    print(f"{'breakage':<18} " + " ".join(f"{name:>16}" for name in samples))
+    recovered = total = 0
+    for breakage, corrupt in BREAKAGES.items():
+        outcomes = []
+        for name in samples:
+            ## the fake model answers ResumeRater JSON when the prompt mentions overall_score
+            valid = json.dumps(FakeJSONChatModel._payload("overall_score" if name == "resume_analysis" else ""))
+            outcome = repair_outcome(name, corrupt(valid))
+            outcomes.append(outcome)
+            total += 1
+            recovered += outcome in ("valid", "repaired")
+        print(f"{breakage:<18} " + " ".join(f"{outcome:>16}" for outcome in outcomes))
+    print(f"Recovered locally without an LLM call: {recovered}/{total} ({recovered / total:.0%})")
+
+
+if __name__ == "__main__":
+    main()
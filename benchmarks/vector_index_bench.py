@@ -0,0 +1,109 @@
+###
+# Benchmarks the faiss pre-screen used by /rater/batch?shortlist=k:
+# 1. Index build time (embedding + add) for growing numbers of synthetic resumes
+# 2. Query latency (p50 / p95) for the top-k resumes of a job
+# 3. Quality: precision@k against synthetic labels (share of the top k written for the job's role),
+#    and recall of the LLM's own top-k (full LLM ranking of a small sample) within a 2k shortlist.
+#    The recall only means something with a real provider; the offline fake model scores by prompt hash.
+# Run from the repo root: python -m benchmarks.vector_index_bench [--sizes 1000 5000] [--llm-sample 40]
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+os.environ.setdefault("LLM_PROVIDER", "fake")
+from utils.vector_index import VectorIndex
+from utils.llm_registry import LLMRegistry
+from src.resume_rater.data_analisis import ResumeAnalyzer
+
+ROLES = {
+    "data_engineer": "python sql spark kafka airflow dbt snowflake etl pipelines warehouse streaming",
+    "frontend": "javascript typescript react next.js css html tailwind figma accessibility playwright",
+    "ml_engineer": "python pytorch tensorflow mlflow feature store model training inference kubernetes",
+    "devops": "kubernetes terraform aws docker ci/cd prometheus grafana helm linux on-call",
+    "backend_java": "java spring boot microservices postgresql kafka rest apis maven jvm",
+    "product_manager": "roadmap stakeholders discovery user research okrs prioritization analytics launches",
+}
+FILLER = "collaborated with colleagues delivered projects on time communicated clearly improved processes".split()
+
+
+def make_resume(role: str, rng: random.Random) -> str:
+    ## mostly the role's vocabulary, some from a neighbouring role, plus generic filler
+    own = ROLES[role].split()
+    other = ROLES[rng.choice([r for r in ROLES if r != role])].split()
+    words = rng.sample(own, 7) + rng.sample(other, 2) + rng.sample(FILLER, 6)
+    rng.shuffle(words)
+    lines = [f"Worked on {' '.join(words[i:i + 5])}" for i in range(0, len(words), 5)]
+    return "\n".join([f"Candidate {rng.randrange(10**6)}", *lines])
+
+
+def make_job(role: str) -> str:
+    return f"We are hiring. Requirements: {ROLES[role]}. Nice to have: good communication."
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def bench_index(workdir: str, size: int, k: int, rng: random.Random):
+    index = VectorIndex(os.path.join(workdir, f"bench_{size}.faiss"))
+    docs = [(role, make_resume(role, rng)) for role in rng.choices(list(ROLES), k=size)]
+    start = time.perf_counter()
+    ids = index.add([(f"resume-{i}", text, role) for i, (role, text) in enumerate(docs)])
+    build = time.perf_counter() - start
+    role_by_id = {doc_id: role for doc_id, (role, _) in zip(ids, docs)}
+
+    latencies, precisions = [], []
+    for _ in range(100):
+        role = rng.choice(list(ROLES))
+        start = time.perf_counter()
+        hits = index.search(make_job(role), k)
+        latencies.append(time.perf_counter() - start)
+        precisions.append(sum(role_by_id[doc_id] == role for doc_id, _ in hits) / len(hits))
+    index.close()
+    print(f"{size:>6} resumes  build {build * 1000:8.1f} ms  query p50 {percentile(latencies, 0.5) * 1000:6.2f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:6.2f} ms  precision@{k} {sum(precisions) / len(precisions):.2f}")
+
+
+async def bench_llm_recall(workdir: str, sample: int, k: int, rng: random.Random):
+    ## Full LLM ranking of `sample` resumes vs the vector shortlist of 2k
+    registry = LLMRegistry()
+    registry.result_cache = None
+    analyzer = ResumeAnalyzer(registry=registry)
+    index = VectorIndex(os.path.join(workdir, "llm_sample.faiss"))
+    role = rng.choice(list(ROLES))
+    job = make_job(role)
+    docs = [make_resume(r, rng) for r in rng.choices(list(ROLES), k=sample)]
+    ids = index.add([(f"sample-{i}", text, None) for i, text in enumerate(docs)])
+    shortlist = {doc_id for doc_id, _ in index.search(job, 2 * k)}
+
+    semaphore = asyncio.Semaphore(8)
+    async def score(text):
+        async with semaphore:
+            return (await analyzer.ascore_resume(text, job, use_cache=False))["overall_score"]
+    scores = await asyncio.gather(*(score(text) for text in docs))
+    llm_top = {doc_id for doc_id, _ in sorted(zip(ids, scores), key=lambda pair: pair[1], reverse=True)[:k]}
+    index.close()
+    await registry.aclose()
+    print(f"LLM top-{k} kept by a shortlist of {2 * k} out of {sample} ({registry.default_provider}): "
+          f"{len(llm_top & shortlist) / k:.0%}, LLM calls saved {1 - 2 * k / sample:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="faiss pre-screen benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--llm-sample", type=int, default=40, help="resumes fully LLM-ranked for the recall check, 0 to skip")
+    args = parser.parse_args()
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            bench_index(workdir, size, args.k, rng)
+        if args.llm_sample:
+            asyncio.run(bench_llm_recall(workdir, args.llm_sample, min(args.k, args.llm_sample // 4), rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,27 @@ import sys
 import traceback
 
 class ResumeAnalysisException(Exception):
-    def __init__(self, error_message, error_details):
-        _, _, exc_tb = error_details.exc_info()
-        self.filename = exc_tb.tb_frame.f_code.co_filename
-        self.lineno = exc_tb.tb_lineno
+    def __init__(self, error_message, error_details=sys):
+        ## error_details is usually `sys`; an exception instance is accepted too
+        if isinstance(error_details, BaseException):
+            exc_info = (type(error_details), error_details, error_details.__traceback__)
+        else:
+            exc_info = error_details.exc_info()
+        exc_tb = exc_info[2]
+        if exc_tb is not None:
+            self.filename = exc_tb.tb_frame.f_code.co_filename
+            self.lineno = exc_tb.tb_lineno
+            self.traceback_str = ''.join(traceback.format_exception(*exc_info))
+        else:
+            ## Raised directly, not while handling another exception
+            caller = sys._getframe(1)
+            while caller.f_back is not None and caller.f_code.co_filename == __file__:
+                caller = caller.f_back
+            self.filename = caller.f_code.co_filename
+            self.lineno = caller.f_lineno
+            self.traceback_str = ""
         self.error_message = str(error_message)
-        self.traceback_str = ''.join(traceback.format_exception(*error_details.exc_info()))
+        super().__init__(self.error_message)
 
      ## To return the error message in a readable format
     def __str__(self):
@@ -16,6 +31,36 @@ class ResumeAnalysisException(Exception):
         Message: {self.error_message}
         Traceback: {self.traceback_str}
         """
+
+
+class InvalidUploadException(ResumeAnalysisException):
+    ## Rejected client input, status_code is what the API should answer with
+    def __init__(self, error_message, status_code=400, error_details=sys):
+        super().__init__(error_message, error_details)
+        self.status_code = status_code
+
+
+class QueueFullException(ResumeAnalysisException):
+    ## Scoring queue at capacity; retry_after is a hint in seconds for the Retry-After header
+    def __init__(self, error_message, retry_after=1, error_details=sys):
+        super().__init__(error_message, error_details)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededException(ResumeAnalysisException):
+    ## The request's time budget ran out; stage names where, reported to the client as 504
+    def __init__(self, error_message, stage="request", error_details=sys):
+        super().__init__(error_message, error_details)
+        self.stage = stage
+        self.status_code = 504
+
+
+class ClientDisconnectedException(ResumeAnalysisException):
+    ## The client went away, work for it was cancelled; nobody is left to read a response
+    def __init__(self, error_message, error_details=sys):
+        super().__init__(error_message, error_details)
+        self.status_code = 499
+
 if __name__ == "__main__":
     try:
         a =int("test")
@@ -1,42 +1,162 @@
 import os
+import queue
+import random
+import atexit
 import logging
+import threading
+import logging.handlers
 from datetime import datetime
 import structlog
+import yaml
 
-class CustomLogger:
-    def __init__(self, log_dir="logs"):
-        self.logs_dir = os.path.join(os.getcwd(), log_dir)
-        os.makedirs(self.logs_dir, exist_ok=True)
+## Used when config.yaml has no `logging` block (or cannot be read)
+DEFAULT_LOGGING_CONFIG = {
+    "level": "INFO",
+    "rotation": "size",
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "when": "midnight",
+    "max_field_chars": 2000,
+    "sample_rates": {},
+}
 
-        log_file = f"{datetime.now().strftime('%m_%d_%H_%M_%S')}.log"
-        self.log_file_path = os.path.join(self.logs_dir, log_file)
-      
-    def get_logger(self, name = __file__):
-        logger_name = os.path.basename(name)
-        file_handler = logging.FileHandler(self.log_file_path)
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter("%(message)s"))
+_configure_lock = threading.Lock()
+_listener = None
+_console_handler = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    ## The stdlib QueueHandler formats records before queueing them; we hand over the raw
+    ## structlog event dict instead so JSON rendering happens on the listener thread.
+    def prepare(self, record):
+        return record
+
+
+def _load_logging_config(config_path="config/config.yaml") -> dict:
+    config = dict(DEFAULT_LOGGING_CONFIG)
+    try:
+        with open(config_path, "r") as file:
+            config.update((yaml.safe_load(file) or {}).get("logging", {}) or {})
+    except OSError:
+        pass
+    return config
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter("%(message)s"))
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(message)s",
-            handlers=[console_handler, file_handler]
+def _make_sampler(sample_rates: dict):
+    ## Keep only a fraction of chatty events, e.g. {"Result cache hit": 0.1}
+    def sample_events(logger, method_name, event_dict):
+        rate = sample_rates.get(event_dict.get("event"))
+        if rate is not None and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+    return sample_events
+
+
+def _make_truncator(max_chars: int):
+    def truncate_fields(logger, method_name, event_dict):
+        for key, value in event_dict.items():
+            if key == "exception":
+                continue
+            if not isinstance(value, (str, int, float, bool, type(None))):
+                value = str(value)
+            if isinstance(value, str) and len(value) > max_chars:
+                event_dict[key] = f"{value[:max_chars]}... [truncated {len(value) - max_chars} chars]"
+        return event_dict
+    return truncate_fields
+
+
+def _file_handler(path: str, config: dict) -> logging.Handler:
+    if config["rotation"] == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=config["when"], backupCount=config["backup_count"], encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=config["max_bytes"], backupCount=config["backup_count"], encoding="utf-8"
+    )
+
+
+def configure_logging(logs_dir: str):
+    ###
+    # Configures logging once per process:
+    # 1. Loggers only build an event dict and put it on an in-memory queue
+    # 2. A QueueListener thread renders JSON and writes to a rotating file and the console
+    # 3. Level filtering and sampling happen before queueing, truncation on the listener
+    # Later calls are no-ops, so handler count stays constant for the life of the process.
+    global _listener, _console_handler
+    with _configure_lock:
+        if _listener is not None:
+            return
+        config = _load_logging_config()
+        level = logging.getLevelName(str(config["level"]).upper())
+        os.makedirs(logs_dir, exist_ok=True)
+        log_file_path = os.path.join(logs_dir, f"{datetime.now().strftime('%m_%d_%H_%M_%S')}.log")
+
+        formatter = structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                _make_truncator(config["max_field_chars"]),
+                structlog.processors.EventRenamer(to="event"),
+                structlog.processors.JSONRenderer(),
+            ],
+            foreign_pre_chain=[
+                structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
+                structlog.processors.add_log_level,
+            ],
         )
+        file_handler = _file_handler(log_file_path, config)
+        console_handler = logging.StreamHandler()
+        for handler in (file_handler, console_handler):
+            handler.setLevel(level)
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_DeferredQueueHandler(log_queue))
+
         structlog.configure(
             processors=[
+                structlog.stdlib.filter_by_level,
+                _make_sampler(config["sample_rates"]),
                 structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
                 structlog.processors.add_log_level,
-                structlog.processors.EventRenamer(to="event"),
-                structlog.processors.JSONRenderer()
+                ## tracebacks must be captured on the calling thread
+                structlog.processors.format_exc_info,
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
             ],
             logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
             cache_logger_on_first_use=True,
         )
 
+        _console_handler = console_handler
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def set_console_level(level: str):
+    ## Quieter console for interactive tools (e.g. the CLI progress line); the log file keeps the configured level
+    if _console_handler is not None:
+        _console_handler.setLevel(logging.getLevelName(level.upper()))
+
+
+def shutdown_logging():
+    ## Flush whatever is still queued; safe to call more than once
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+class CustomLogger:
+    def __init__(self, log_dir="logs"):
+        self.logs_dir = os.path.join(os.getcwd(), log_dir)
+
+    def get_logger(self, name = __file__):
+        configure_logging(self.logs_dir)
+        logger_name = os.path.basename(name)
         return structlog.get_logger(logger_name)
 
 if __name__ == "__main__":
@@ -18,4 +18,25 @@ class JobDescription(BaseModel):
     location: str
     description: List[str]
     requirements: List[str]
+
+class RoleEntry(BaseModel):
+    title: str
+    company: str
+    start_date: str
+    end_date: str
+    highlights: List[str]
+
+class EducationEntry(BaseModel):
+    degree: str
+    institution: str
+    year: str
+
+# Compact, reusable summary of one resume; scored instead of the raw text
+class ResumeProfile(BaseModel):
+    headline: str
+    years_experience: Union[int, float]
+    skills: List[str]
+    roles: List[RoleEntry]
+    education: List[EducationEntry]
+    certifications: List[str]
    
\ No newline at end of file
@@ -74,8 +74,93 @@ Return as JSON according to the following schema:
 {format_instructions}
 """)
 
+resume_profile_extractor = ChatPromptTemplate.from_template("""
+Extract a compact candidate profile from the resume below. Keep facts only, no opinions.
+- skills: distinct skills, tools and technologies, each named once
+- roles: every position with start_date / end_date as written (use "present" for current roles)
+  and at most 3 short highlights with concrete results
+- years_experience: total years of professional experience
+Return as JSON according to the following schema:
+{format_instructions}
+
+Resume Text:
+{resume_text}
+""")
+
+
+# Compact variants for providers running in native JSON mode: the schema is enforced by the
+# provider (or checked by the local repair/validate step), so the format block and example are dropped.
+# The word JSON must stay in the prompt, Groq's json_object mode requires it.
+resume_analyser_prompt_compact = ChatPromptTemplate.from_template("""
+You are an expert career coach and hiring analyst. Evaluate how well the resume matches the job description.
+Be strict but fair, missing critical requirements should lower the score significantly.
+
+Respond with one JSON object with these keys:
+- overall_score: number from 0 to 100, where 100 means a perfect match
+- score_description: one sentence summary
+- skills_match, experience_match, education_match, job_compliance: objects mapping 3 category names to 0-100 scores
+- additional_points: list of strengths
+- improvements: list of changes that would make the resume match the job better
+
+Job Description:
+{job_description}
+
+Resume Text:
+{resume_text}
+""")
+
+
+job_description_scrapper_compact = ChatPromptTemplate.from_template("""
+Extract the job details from the following text as one JSON object with keys
+title, company, location (strings), description and requirements (lists of strings):
+{job_text}
+""")
+
+
+resume_profile_extractor_compact = ChatPromptTemplate.from_template("""
+Extract a compact candidate profile from the resume below as one JSON object. Keep facts only, no opinions.
+Keys: headline (string), years_experience (number), skills (distinct skills and tools, each named once),
+roles (list of title, company, start_date, end_date ("present" if current), highlights: at most 3 short results),
+education (list of degree, institution, year), certifications (list of strings).
+
+Resume Text:
+{resume_text}
+""")
+
+
+# Follow-up when an answer fails validation: only the bad answer and the error, never the original inputs
+json_reask_prompt = ChatPromptTemplate.from_template("""
+Your previous JSON answer failed validation.
+
+Error:
+{error}
+
+Previous answer:
+{output}
+
+Return only the corrected JSON object.
+""")
+
 # Central dictionary to register prompts
 PROMPT_REGISTRY = {
     "resume_analysis": resume_analyser_prompt,
     "job_description":job_description_scrapper,
+    "resume_profile": resume_profile_extractor,
+}
+
+# Same prompts for providers in native JSON mode
+COMPACT_PROMPT_REGISTRY = {
+    "resume_analysis": resume_analyser_prompt_compact,
+    "job_description": job_description_scrapper_compact,
+    "resume_profile": resume_profile_extractor_compact,
+}
+
+# Bump a version whenever its prompt text changes, cached results keyed on the old version are then ignored
+PROMPT_VERSIONS = {
+    "resume_analysis": "1",
+    "job_description": "1",
+    "resume_analysis_compact": "1",
+    "job_description_compact": "1",
+    "resume_profile": "1",
+    "resume_profile_compact": "1",
 }
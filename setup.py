@@ -5,5 +5,9 @@ setup(
     version="0.1.0",
     author="Jincaho Li",
     packages=find_packages(),
-    
+    entry_points={
+        "console_scripts": [
+            "resume-rater=src.resume_rater.cli:main",
+        ],
+    },
 )
\ No newline at end of file
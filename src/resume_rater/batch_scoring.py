@@ -0,0 +1,173 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+from src.resume_rater.data_ingestion import ResumeHandler
+from src.resume_rater.data_analisis import ResumeAnalyzer
+from utils.result_cache import ResultCache
+from utils.metrics import span, DEADLINES_EXCEEDED
+from utils.deadline import budget_seconds, start_deadline, run_with_deadline
+from exception.custom_exception import DeadlineExceededException
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+
+class BatchScorer:
+    ###
+    # Scores many resumes against one job description:
+    # 1. The job description (or URL) is resolved and parsed once, before streaming starts
+    # 2. Resumes are read and scored concurrently, capped by a semaphore
+    # 3. Results are yielded in completion order, then a summary ranked by overall_score
+    # 4. With a shortlist size and a VectorIndex, resumes are first ranked by local text similarity
+    #    to the job and only the top `shortlist` go to the LLM; the rest are reported as screened out
+    # 5. mode lite / lite-then-llm scores with the local lite scorer first; items then carry a `scoring` report
+    # A failing resume, or one that runs past deadlines.item_seconds, produces an error item instead of aborting the batch.
+
+    def __init__(self, analyzer: ResumeAnalyzer, handler: ResumeHandler, max_concurrency: int=8, use_cache: bool=True,
+                 use_profile: bool=False, shortlist: int=None, index=None, mode: str="llm"):
+        self.analyzer = analyzer
+        self.handler = handler
+        self.max_concurrency = max(1, max_concurrency)
+        self.use_cache = use_cache
+        self.use_profile = use_profile
+        self.shortlist = shortlist if index is not None else None
+        self.index = index
+        self.mode = mode
+
+    @staticmethod
+    def _error_message(e: Exception) -> str:
+        return getattr(e, "error_message", None) or str(e)
+
+    async def _score_one(self, semaphore: asyncio.Semaphore, index: int, filename: str,
+                         saved_path: Optional[str], job_description: str, resume_text: str=None,
+                         similarity: float=None) -> dict:
+        item = {"index": index, "filename": filename}
+        if similarity is not None:
+            item["similarity"] = round(similarity, 4)
+        async with semaphore:
+            ## the item's budget starts once it holds a slot, not while it queues behind the others
+            deadline = start_deadline(budget_seconds(self.analyzer.registry.config, key="item_seconds"))
+            try:
+                result, report = await run_with_deadline(self._score_text(saved_path, job_description, resume_text), deadline)
+                item.update(status="ok", analysis_result=result)
+                if self.mode != "llm":
+                    item["scoring"] = report
+            except asyncio.CancelledError:
+                raise
+            except DeadlineExceededException as e:
+                DEADLINES_EXCEEDED.inc(stage=e.stage)
+                log.warning("Batch item ran out of time", filename=filename, stage=e.stage)
+                item.update(status="error", error=e.error_message, stage=e.stage)
+            except Exception as e:
+                log.error("Batch item failed", filename=filename, error=self._error_message(e))
+                item.update(status="error", error=self._error_message(e))
+        return item
+
+    async def _score_text(self, saved_path: Optional[str], job_description: str, resume_text: str=None) -> Tuple[dict, dict]:
+        if resume_text is None:
+            resume_text = await self.handler.aread_pdf(saved_path)
+        return await self.analyzer.ascore_with_mode(resume_text, job_description, self.mode,
+                                                    use_cache=self.use_cache, use_profile=self.use_profile)
+
+    @staticmethod
+    def summarize(items: List[dict]) -> dict:
+        scored = [i for i in items if i.get("status") == "ok"]
+        ## lite-then-llm: resumes that went on to the LLM passed the lite triage and rank ahead of those that did not
+        scored.sort(key=lambda i: (i.get("scoring", {}).get("scored_by") != "lite", i["analysis_result"].get("overall_score") or 0), reverse=True)
+        ranking = [
+            {
+                "rank": rank,
+                "index": i["index"],
+                "filename": i["filename"],
+                "overall_score": i["analysis_result"].get("overall_score"),
+                **({"scored_by": i["scoring"]["scored_by"]} if "scoring" in i else {}),
+            }
+            for rank, i in enumerate(scored, start=1)
+        ]
+        return {
+            "total": len(items),
+            "succeeded": len(scored),
+            "failed": sum(i.get("status") == "error" for i in items),
+            "screened_out": sum(i.get("status") == "screened_out" for i in items),
+            "ranking": ranking,
+        }
+
+    async def _read(self, semaphore: asyncio.Semaphore, saved_path: str) -> str:
+        async with semaphore:
+            return await self.handler.aread_pdf(saved_path)
+
+    async def _screen(self, semaphore: asyncio.Semaphore, candidates: List[Tuple[int, str, str]], job_description: str):
+        ## Returns (kept, screened): kept are (index, filename, saved_path, text, similarity) for the
+        ## top `shortlist` resumes by similarity to the job; screened are finished result items
+        texts = await asyncio.gather(*(self._read(semaphore, path) for _, _, path in candidates), return_exceptions=True)
+        screened, readable = [], []
+        for (index, filename, path), text in zip(candidates, texts):
+            if isinstance(text, Exception):
+                screened.append({"index": index, "filename": filename, "status": "error", "error": self._error_message(text)})
+            else:
+                readable.append((index, filename, path, text))
+        if not readable:
+            return [], screened
+
+        with span("shortlist"):
+            doc_ids = await asyncio.to_thread(
+                self.index.add, [(ResultCache.make_key(text), text, filename) for _, filename, _, text in readable]
+            )
+            hits = await asyncio.to_thread(self.index.search, job_description, len(set(doc_ids)), doc_ids)
+        asyncio.get_running_loop().run_in_executor(None, self.index.maybe_save)
+        similarity = dict(hits)
+        top = {doc_id for doc_id, _ in hits[:self.shortlist]}
+        kept = []
+        for (index, filename, path, text), doc_id in zip(readable, doc_ids):
+            if doc_id in top:
+                kept.append((index, filename, path, text, similarity.get(doc_id, 0.0)))
+            else:
+                screened.append({"index": index, "filename": filename, "status": "screened_out",
+                                 "similarity": round(similarity.get(doc_id, 0.0), 4)})
+        log.info("Batch shortlisted", resumes=len(readable), shortlisted=len(kept))
+        return kept, screened
+
+    async def resolve_job(self, job_description: str) -> str:
+        ## Done up front so a bad job URL fails the request before any result is streamed
+        if self.mode == "lite":
+            return await self.analyzer.aresolve_job_locally(job_description)
+        return await self.analyzer.aresolve_job_description(job_description)
+
+    async def score(self, uploads: List[Tuple[str, Optional[str], Optional[str]]], job_description: str) -> AsyncIterator[dict]:
+        ## uploads: (filename, saved_path, save_error) tuples; items with a save_error are reported, not scored
+        ## job_description must already be resolved with resolve_job
+        log.info("Batch scoring started", resumes=len(uploads), max_concurrency=self.max_concurrency)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        items = []
+        candidates = []
+        for index, (filename, saved_path, save_error) in enumerate(uploads):
+            if save_error is not None:
+                item = {"index": index, "filename": filename, "status": "error", "error": save_error}
+                items.append(item)
+                yield item
+                continue
+            candidates.append((index, filename, saved_path))
+
+        if self.shortlist and len(candidates) > self.shortlist:
+            kept, screened = await self._screen(semaphore, candidates, job_description)
+            for item in screened:
+                items.append(item)
+                yield item
+            tasks = [asyncio.create_task(self._score_one(semaphore, index, filename, path, job_description, text, similarity))
+                     for index, filename, path, text, similarity in kept]
+        else:
+            tasks = [asyncio.create_task(self._score_one(semaphore, index, filename, path, job_description))
+                     for index, filename, path in candidates]
+
+        try:
+            for finished in asyncio.as_completed(tasks):
+                item = await finished
+                items.append(item)
+                yield item
+        finally:
+            ## client went away or the consumer stopped early: do not keep paying for LLM calls
+            for task in tasks:
+                task.cancel()
+
+        summary = self.summarize(items)
+        log.info("Batch scoring complete", total=summary["total"], failed=summary["failed"])
+        yield {"summary": summary}
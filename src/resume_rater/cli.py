@@ -0,0 +1,372 @@
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+## Spawned extraction workers re-import the __main__ module: pandas and the LLM stack are imported
+## lazily so workers only pay for pdf_worker
+from src.resume_rater import pdf_worker
+from src.resume_rater.pdf_extraction import WorkerLane
+from utils.result_cache import ResultCache
+from logger.custom_logger import CustomLogger, set_console_level
+log = CustomLogger().get_logger(__name__)
+
+## Time a document's worker gets past extraction.deadline_seconds before it is killed
+KILL_GRACE_SECONDS = 2.0
+## ResumeRater fields written as JSON / joined text columns in the output table
+DICT_FIELDS = ("skills_match", "experience_match", "education_match", "job_compliance")
+LIST_FIELDS = ("additional_points", "improvements")
+COLUMNS = ["file", "path", "status", "error", "seconds", "scored_by", "overall_score", "score_description", *DICT_FIELDS, *LIST_FIELDS]
+
+
+def find_pdfs(inputs: List[str]) -> List[str]:
+    ## Directories are searched recursively; anything else is a path or glob pattern
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True))
+            paths.update(glob.glob(os.path.join(item, "**", "*.PDF"), recursive=True))
+        else:
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(os.path.abspath(p) for p in paths)
+
+
+def file_key(path: str) -> str:
+    ## A file edited after it was scored gets scored again
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def to_row(record: dict) -> dict:
+    result = record.get("result") or {}
+    row = {
+        "file": os.path.basename(record["path"]),
+        "path": record["path"],
+        "status": record["status"],
+        "error": record.get("error"),
+        "seconds": record.get("seconds"),
+        "scored_by": record.get("scored_by"),
+        "overall_score": result.get("overall_score"),
+        "score_description": result.get("score_description"),
+    }
+    for field in DICT_FIELDS:
+        row[field] = json.dumps(result[field]) if field in result else None
+    for field in LIST_FIELDS:
+        row[field] = "; ".join(result[field]) if field in result else None
+    return row
+
+
+class Checkpoint:
+    ###
+    # Append-only JSONL record of finished files for one job description:
+    # the first line names the job, every other line is one scored (or failed) file.
+    # A rerun with the same job skips every file already recorded. A run killed mid-write leaves a
+    # partial last line; it is cut off on load, so that file is scored again.
+
+    def __init__(self, path: str, job_key: str):
+        self.path = path
+        self.records: Dict[str, dict] = {}
+        if os.path.exists(path):
+            lines = self._load(path)
+            if lines and lines[0].get("job_key") != job_key:
+                raise SystemExit(f"{path} was written for a different job description; pass --restart or another --checkpoint")
+            self.records = {record["key"]: record for record in lines[1:] if "key" in record}
+        self._file = open(path, "a", encoding="utf-8")
+        if os.path.getsize(path) == 0:
+            self._write({"job_key": job_key, "created_at": time.time()})
+
+    @staticmethod
+    def _load(path: str) -> List[dict]:
+        with open(path, "rb") as file:
+            data = file.read()
+        records = []
+        ## bytes up to the end of the last complete record
+        keep = 0
+        lines = data.splitlines(keepends=True)
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line) if line.strip() else None
+            except ValueError:
+                if number == len(lines):
+                    log.warning("Dropping a partial last checkpoint line", path=path, line=number)
+                    break
+                log.warning("Skipping an unreadable checkpoint line", path=path, line=number)
+                keep += len(line)
+                continue
+            if record is not None:
+                records.append(record)
+            keep += len(line)
+        if keep < len(data):
+            with open(path, "r+b") as file:
+                file.truncate(keep)
+        elif data and not data.endswith(b"\n"):
+            ## a complete record whose newline never made it: the next record must start on its own line
+            with open(path, "ab") as file:
+                file.write(b"\n")
+        return records
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def add(self, record: dict):
+        self.records[record["key"]] = record
+        self._write(record)
+
+    def close(self):
+        self._file.close()
+
+
+class OutputWriter:
+    ## CSV grows every flush_every rows; Parquet cannot be appended to and is written whole on close
+    def __init__(self, path: str, flush_every: int=25):
+        import pandas as pd
+        self._pd = pd
+        self.path = path
+        self.is_parquet = path.lower().endswith(".parquet")
+        self.flush_every = flush_every
+        self.rows: List[dict] = []
+        self._unflushed: List[dict] = []
+
+    def start(self, records: List[dict]):
+        ## Resumed runs rewrite the output from the checkpoint, so it never holds duplicates
+        self.rows = [to_row(record) for record in records]
+        if not self.is_parquet:
+            self._pd.DataFrame(self.rows, columns=COLUMNS).to_csv(self.path, index=False)
+
+    def add(self, record: dict):
+        row = to_row(record)
+        self.rows.append(row)
+        self._unflushed.append(row)
+        if len(self._unflushed) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.is_parquet and self._unflushed:
+            self._pd.DataFrame(self._unflushed, columns=COLUMNS).to_csv(self.path, mode="a", header=False, index=False)
+        self._unflushed = []
+
+    def close(self):
+        self.flush()
+        if self.is_parquet:
+            self._pd.DataFrame(self.rows, columns=COLUMNS).to_parquet(self.path, index=False)
+
+
+class Progress:
+    def __init__(self, total: int, already_done: int):
+        self.total = total
+        self.done = already_done
+        self.failed = 0
+        self._session_done = 0
+        self._started = time.monotonic()
+
+    def add(self, ok: bool):
+        self.done += 1
+        self._session_done += 1
+        self.failed += not ok
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self._started
+        rate = self._session_done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        eta = time.strftime("%H:%M:%S", time.gmtime(remaining / rate)) if rate > 0 else "--:--:--"
+        percent = self.done / self.total if self.total else 1.0
+        return (f"[{self.done}/{self.total}] {percent:6.1%} | {rate:5.2f} files/s | "
+                f"ETA {eta} | failed {self.failed}")
+
+    async def report(self, interval: float=1.0):
+        while True:
+            sys.stderr.write("\r" + self.line())
+            sys.stderr.flush()
+            await asyncio.sleep(interval)
+
+
+class BulkScorer:
+    ###
+    # Offline scoring of a directory of resumes against one job description:
+    # 1. PDFs are extracted on `workers` worker processes, one document per worker; a document still
+    #    running past extraction.deadline_seconds (stuck inside a page) gets its worker killed and respawned
+    # 2. `concurrency` workers pull files from a queue, so extraction and LLM calls overlap
+    #    and no more than `concurrency` scorings are in flight
+    # 3. Every finished file is appended to the checkpoint before it counts as done
+    # 4. Results stream into the CSV (or Parquet at the end) output
+    # With mode lite no LLM is called at all; lite-then-llm sends only resumes above lite_scoring.llm_threshold.
+
+    def __init__(self, analyzer, job_description: str, extraction_config: dict, workers: int,
+                 concurrency: int, use_cache: bool=True, use_profile: bool=False, mode: str="llm"):
+        self.analyzer = analyzer
+        self.job_description = job_description
+        self.extraction_config = extraction_config
+        self.workers = workers
+        self.concurrency = concurrency
+        self.use_cache = use_cache
+        self.use_profile = use_profile
+        self.mode = mode
+
+    async def _extract(self, lanes: asyncio.Queue, path: str) -> str:
+        ## extract_file only checks its deadline between pages; the kill covers a page that never returns
+        deadline_seconds = self.extraction_config.get("deadline_seconds", 10)
+        lane = await lanes.get()
+        try:
+            future = lane.submit(
+                pdf_worker.extract_file, path,
+                self.extraction_config.get("max_pages", 30),
+                self.extraction_config.get("max_chars", 100000),
+                deadline_seconds,
+            )
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), deadline_seconds + KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                lane.reset()
+                raise TimeoutError(f"PDF extraction exceeded {deadline_seconds}s, worker restarted")
+            except BrokenProcessPool:
+                lane.reset()
+                raise
+        finally:
+            lanes.put_nowait(lane)
+
+    async def _score_file(self, lanes: asyncio.Queue, path: str) -> dict:
+        started = time.perf_counter()
+        record = {"key": file_key(path), "path": path}
+        try:
+            text = await self._extract(lanes, path)
+            result, report = await self.analyzer.ascore_with_mode(text, self.job_description, self.mode,
+                                                                  use_cache=self.use_cache, use_profile=self.use_profile)
+            record.update(status="ok", result=result, scored_by=report["scored_by"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            record.update(status="error", error=getattr(e, "error_message", None) or str(e))
+            log.error("Bulk scoring failed", path=path, error=record["error"])
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    async def run(self, paths: List[str], checkpoint: Checkpoint, writer: OutputWriter, progress: Progress):
+        queue: asyncio.Queue = asyncio.Queue()
+        for path in paths:
+            queue.put_nowait(path)
+
+        async def worker():
+            while not queue.empty():
+                record = await self._score_file(lanes, queue.get_nowait())
+                checkpoint.add(record)
+                writer.add(record)
+                progress.add(record["status"] == "ok")
+
+        reporter = asyncio.create_task(progress.report())
+        ## spawned worker processes, started up front so the first documents do not pay for it
+        workers = [WorkerLane(index, initializer=pdf_worker.ignore_interrupts) for index in range(self.workers)]
+        lanes: asyncio.Queue = asyncio.Queue()
+        try:
+            await asyncio.gather(*(asyncio.wrap_future(lane.submit(pdf_worker.warm_up)) for lane in workers))
+            for lane in workers:
+                lanes.put_nowait(lane)
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            reporter.cancel()
+            sys.stderr.write("\r" + progress.line() + "\n")
+            for lane in workers:
+                lane.shutdown()
+
+
+async def resolve_job(analyzer, job: str, mode: str="llm") -> str:
+    ## URL -> parsed JobDescription JSON (page text in lite mode), existing file -> its text, anything else is the text itself
+    if analyzer.jobdescriptor.url_extractor(job) is not None and not os.path.isfile(job):
+        if mode == "lite":
+            return await analyzer.aresolve_job_locally(job)
+        return await analyzer.aresolve_job_description(job)
+    if os.path.isfile(job):
+        with open(job, "r", encoding="utf-8") as file:
+            return file.read()
+    return job
+
+
+async def score_command(args) -> int:
+    from utils.llm_registry import LLMRegistry
+    from src.resume_rater.data_analisis import ResumeAnalyzer
+
+    paths = find_pdfs(args.inputs)
+    if not paths:
+        print("No PDF files found", file=sys.stderr)
+        return 1
+    registry = LLMRegistry(args.config)
+    analyzer = ResumeAnalyzer(registry=registry)
+    try:
+        mode = analyzer.scoring_mode(args.mode)
+        job_description = await resolve_job(analyzer, args.job, mode)
+        checkpoint_path = args.checkpoint or f"{args.output}.checkpoint.jsonl"
+        if args.restart and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        ## a lite run's checkpoint must not be resumed as an LLM run; llm keeps the key older checkpoints have
+        job_key = ResultCache.make_key(job_description) if mode == "llm" else ResultCache.make_key(job_description, mode)
+        checkpoint = Checkpoint(checkpoint_path, job_key)
+        if args.retry_failed:
+            checkpoint.records = {key: record for key, record in checkpoint.records.items() if record["status"] == "ok"}
+
+        current = {file_key(path): path for path in paths}
+        done = [record for key, record in checkpoint.records.items() if key in current]
+        todo = [path for key, path in current.items() if key not in checkpoint.records]
+        print(f"{len(paths)} PDFs, {len(done)} already scored, {len(todo)} to go", file=sys.stderr)
+
+        writer = OutputWriter(args.output)
+        writer.start(done)
+        progress = Progress(len(paths), len(done))
+        scorer = BulkScorer(
+            analyzer, job_description, registry.config.get("extraction", {}),
+            workers=args.workers or registry.config.get("extraction", {}).get("max_workers") or os.cpu_count() or 2,
+            concurrency=args.concurrency or registry.config.get("batch", {}).get("max_concurrency", 8),
+            use_cache=not args.no_cache, use_profile=args.use_profile, mode=mode,
+        )
+        try:
+            await scorer.run(todo, checkpoint, writer, progress)
+        finally:
+            ## interrupted runs still leave a consistent output and checkpoint behind
+            writer.close()
+            checkpoint.close()
+        print(f"Wrote {len(writer.rows)} rows to {args.output}", file=sys.stderr)
+        return 0 if progress.failed == 0 else 2
+    finally:
+        await registry.aclose()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="resume-rater", description="Resume Rater command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    score = commands.add_parser("score", help="score a directory or glob of resume PDFs against one job description")
+    score.add_argument("inputs", nargs="+", help="PDF files, directories (searched recursively) or glob patterns")
+    score.add_argument("--job", required=True, help="job description file, URL or literal text")
+    score.add_argument("--output", "-o", default="scores.csv", help="results file, .csv or .parquet (default: scores.csv)")
+    score.add_argument("--checkpoint", help="progress file (default: <output>.checkpoint.jsonl)")
+    score.add_argument("--restart", action="store_true", help="ignore and overwrite an existing checkpoint")
+    score.add_argument("--retry-failed", action="store_true", help="score files that failed in an earlier run again")
+    score.add_argument("--concurrency", type=int, help="scorings in flight (default: batch.max_concurrency)")
+    score.add_argument("--workers", type=int, help="PDF extraction processes (default: extraction.max_workers)")
+    score.add_argument("--use-profile", action="store_true", help="score cached resume profiles instead of raw text")
+    score.add_argument("--no-cache", action="store_true", help="bypass the result cache")
+    score.add_argument("--mode", choices=["llm", "lite", "lite-then-llm"],
+                       help="llm, local keyword scoring only, or LLM only for resumes the lite pass rates well "
+                            "(default: lite_scoring.default_mode)")
+    score.add_argument("--config", default="config/config.yaml")
+    score.add_argument("--verbose", action="store_true", help="keep INFO logs on the console")
+    return parser
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.verbose:
+        set_console_level("WARNING")
+    if args.command == "score":
+        try:
+            return asyncio.run(score_command(args))
+        except KeyboardInterrupt:
+            print("\nInterrupted; rerun the same command to resume from the checkpoint", file=sys.stderr)
+            return 130
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+## Rough chars-per-token ratio for English prose on Gemini / Llama style tokenizers
+CHARS_PER_TOKEN = 4
+
+PAGE_MARKER = re.compile(r"^\n?--- Page (\d+) ---\n", re.MULTILINE)
+PAGE_NUMBER_LINE = re.compile(r"^\s*(?:page\s*)?(\d+)\s*(?:(?:of|/)\s*\d+)?\s*$", re.IGNORECASE)
+## Elements that never carry posting content
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg", "button"]
+BOILERPLATE_HINTS = re.compile(r"cookie|consent|banner|gdpr|newsletter|related|share|breadcrumb|menu|sidebar|footer|nav", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def html_main_content(text: str) -> str:
+    ## Keep the main content block of an HTML page, dropping scripts, navigation and banners.
+    ## bs4 is imported on the first job page, not when the API starts.
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(text, "html.parser")
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    page_chars = len(soup.get_text(" ", strip=True))
+    for tag in soup.find_all(attrs={"id": BOILERPLATE_HINTS}) + soup.find_all(attrs={"class": BOILERPLATE_HINTS}):
+        if tag.decomposed or tag.name in ("html", "body", "main", "article"):
+            continue
+        # a wrapper that merely has "share" in its class can hold the whole posting, keep those
+        if len(tag.get_text(" ", strip=True)) < page_chars * 0.3:
+            tag.decompose()
+
+    main = soup.find("main") or soup.find("article") or soup.find(attrs={"role": "main"})
+    if main is None:
+        ## Fall back to the block holding the most text
+        candidates = soup.find_all(["section", "div"]) or [soup]
+        main = max(candidates, key=lambda tag: len(tag.get_text(" ", strip=True)))
+    return main.get_text("\n", strip=True)
+
+
+def html_to_text(text: str) -> str:
+    ## Whole-page text, the behaviour of JobLoader before compaction existed
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+
+
+def is_page_number(line: str, page_num: str) -> bool:
+    match = PAGE_NUMBER_LINE.match(line)
+    return match is not None and match.group(1) == page_num
+
+
+def dedupe_page_boilerplate(text: str, edge_lines: int=3) -> str:
+    ## Drop header/footer lines repeated on most pages, and bare page numbers, from read_pdf output
+    parts = PAGE_MARKER.split(text)
+    if len(parts) < 5:
+        return text
+    # split() gives [prefix, num1, body1, num2, body2, ...]
+    pages = [(parts[i], parts[i + 1].split("\n")) for i in range(1, len(parts) - 1, 2)]
+
+    edge_counts = Counter()
+    for _, lines in pages:
+        stripped = [line.strip() for line in lines if line.strip()]
+        edges = set(stripped[:edge_lines] + stripped[-edge_lines:])
+        edge_counts.update(edges)
+    threshold = max(2, len(pages) // 2 + 1)
+    repeated = {line for line, count in edge_counts.items() if count >= threshold}
+
+    result = [parts[0]] if parts[0].strip() else []
+    for page_num, lines in pages:
+        ## repeated lines and page numbers only among the first / last edge_lines lines (page numbers only
+        ## the page's own): a skill or heading that also sits at the edges, bare years and GPAs in the body survive
+        filled = [index for index, line in enumerate(lines) if line.strip()]
+        edge_indices = set(filled[:edge_lines] + filled[-edge_lines:])
+        kept = [
+            line for index, line in enumerate(lines)
+            if not (index in edge_indices and (line.strip() in repeated or is_page_number(line, page_num)))
+        ]
+        result.append(f"\n--- Page {page_num} ---\n" + "\n".join(kept))
+    return "\n".join(result)
+
+
+def collapse_whitespace(text: str) -> str:
+    text = re.sub(r"[ \t\u00a0]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars]
+
+
+## Central dictionary of compaction steps, referenced by name from config.yaml
+STEP_REGISTRY: Dict[str, Callable[..., str]] = {
+    "html_to_text": html_to_text,
+    "html_main_content": html_main_content,
+    "dedupe_page_boilerplate": dedupe_page_boilerplate,
+    "collapse_whitespace": collapse_whitespace,
+    "truncate": truncate_to_budget,
+}
+
+
+class InputCompactor:
+    ###
+    # Runs a named sequence of STEP_REGISTRY steps over LLM input text and reports the
+    # estimated token count before and after, so every request shows what it saved.
+
+    def __init__(self, steps: List[str], token_budget: int=None):
+        unknown = [step for step in steps if step not in STEP_REGISTRY]
+        if unknown:
+            raise ValueError(f"Unknown compaction steps: {unknown}")
+        self.steps = steps
+        self.token_budget = token_budget
+
+    def compact(self, text: str) -> Tuple[str, dict]:
+        tokens_before = estimate_tokens(text)
+        for step in self.steps:
+            if step == "truncate":
+                if self.token_budget:
+                    text = truncate_to_budget(text, self.token_budget)
+            else:
+                text = STEP_REGISTRY[step](text)
+        tokens_after = estimate_tokens(text)
+        return text, {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "reduction": round(1 - tokens_after / tokens_before, 4) if tokens_before else 0.0,
+        }
+
+
+def build_compactor(config: dict, kind: str) -> InputCompactor:
+    ## kind is a pipeline name under `compaction.pipelines`: resume, job_html or job_text
+    compaction = config.get("compaction", {})
+    if not compaction.get("enabled", False):
+        steps = ["html_to_text"] if kind == "job_html" else []
+        return InputCompactor(steps)
+    pipeline = compaction.get("pipelines", {}).get(kind, [])
+    return InputCompactor(pipeline, compaction.get("token_budgets", {}).get(kind))
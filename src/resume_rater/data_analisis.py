@@ -1,33 +1,41 @@
-import os
 import sys
-from utils.model_loader import ModelLoader
+import asyncio
+from typing import Any, AsyncIterator, Tuple
+from utils.llm_registry import LLMRegistry
+from utils.result_cache import ResultCache
+from utils.metrics import span, metrics
 from logger.custom_logger import CustomLogger
 from exception.custom_exception import ResumeAnalysisException
 
 from model.models import *
-from langchain_core.output_parsers import JsonOutputParser
 
 
-from prompt.prompt_library import PROMPT_REGISTRY
 from utils import job_loader
 
+## llm: LLM only; lite: local keyword scoring only; lite-then-llm: the LLM only sees resumes the lite pass rates well
+SCORING_MODES = ("llm", "lite", "lite-then-llm")
+SCORINGS = metrics.counter("resume_rater_scorings_total", "Resume scorings by requested mode and by what produced the result", ("mode", "scored_by"))
+
 
 class ResumeAnalyzer:
     
-    def __init__(self):
+    def __init__(self, registry: LLMRegistry=None):
         self.log = CustomLogger().get_logger(__name__)
         try:
-            # load llm
-            self.loader=ModelLoader()
-            self.llm=self.loader.load_llm()
+            # shared llm clients, parsers and chains; standalone use builds its own
+            self.registry = registry or LLMRegistry()
+            self.llm = self.registry.get_llm()
             # load job description
-            self.jobdescriptor=job_loader.JobLoader()
+            self.jobdescriptor=job_loader.JobLoader(registry=self.registry)
             # structure the output into resumeRater
-            self.parser = JsonOutputParser(pydantic_object=ResumeRater)
+            self.parser = self.registry.get_parser("resume_analysis")
 
             
             # avoid hard coding, making prompt reusable
-            self.prompt = PROMPT_REGISTRY["resume_analysis"]
+            self.chain = self.registry.get_chain("resume_analysis")
+            self.compaction_report = None
+            self.resume_profile = None
+            self.scoring_report = None
             
             self.log.info("Resume Analyzer initialized successfully")
             
@@ -36,9 +44,13 @@ class ResumeAnalyzer:
             self.log.error(f"Error initializing Resume Analyzer: {e}")
             raise ResumeAnalysisException("Error in Resume Analyzer initialization", sys)
     
-    def analyze_resume(self, resume_text:str,job_description:str)-> dict:
+    def analyze_resume(self, resume_text:str,job_description:str, profile: dict=None)-> dict:
         
         try:
+            # A ResumeProfile (see aextract_profile) is scored in place of the raw resume text
+            if profile is not None:
+                resume_text = self.format_profile(profile)
+
             # If given url, then extract job_description from it      
             url=self.jobdescriptor.url_extractor(job_description)
             if url is not None:
@@ -49,21 +61,24 @@ class ResumeAnalyzer:
             else:
                 self.log.info(f"No URL was extracted")
            
-            ## buidling langchain pipeline
-            chain = self.prompt | self.llm | self.parser
+            resume_text, job_description = self.compact_inputs(resume_text, job_description)
+
+            ## langchain pipeline is compiled once by the registry
+            chain = self.chain
             
             self.log.info("Meta-data analysis chain initialized")
             self.log.info(f"Resume text length: {len(resume_text)}")
             self.log.info(f"Job description length: {len(job_description)}")
 
-            response = chain.invoke({
-                "format_instructions": self.parser.get_format_instructions(),
-                "job_description": job_description,
-                "resume_text":resume_text
-            })
+            with span("llm_scoring"):
+                response = chain.invoke({
+                    "format_instructions": self.registry.get_format_instructions("resume_analysis"),
+                    "job_description": job_description,
+                    "resume_text":resume_text
+                })
 
-            self.log.info(f"Raw LLM response type: {type(response)}")
-            self.log.info(f"Raw LLM response: {response}")
+            ## Full responses are large; only rendered (and truncated) when DEBUG is enabled
+            self.log.debug("Raw LLM response", response_type=type(response).__name__, response=response)
             
             # Convert to dict if it's a Pydantic model
             # Making sure that any type of returned message is in dict format
@@ -87,4 +102,244 @@ class ResumeAnalyzer:
             self.log.error(f"Traceback: {traceback.format_exc()}")
             raise ResumeAnalysisException("Metadata extraction failed",sys)
 
-            
\ No newline at end of file
+    def compact_inputs(self, resume_text:str, job_description:str):
+        ## Strip boilerplate and enforce token budgets; the report is kept for the API response
+        resume_text, resume_report = self.registry.get_compactor("resume").compact(resume_text)
+        job_description, job_report = self.registry.get_compactor("job_text").compact(job_description)
+        self.compaction_report = {"resume": resume_report, "job_description": job_report}
+        self.log.info("Inputs compacted", resume=resume_report, job_description=job_report)
+        return resume_text, job_description
+
+    @staticmethod
+    def format_profile(profile: dict) -> str:
+        ## Plain-text rendering of a ResumeProfile for the scoring prompt
+        lines = [f"{profile.get('headline', '')} ({profile.get('years_experience', '?')} years of experience)"]
+        if profile.get("skills"):
+            lines.append("Skills: " + ", ".join(profile["skills"]))
+        if profile.get("roles"):
+            lines.append("Experience:")
+            for role in profile["roles"]:
+                lines.append(f"- {role.get('title')}, {role.get('company')} ({role.get('start_date')} - {role.get('end_date')})")
+                lines.extend(f"  * {highlight}" for highlight in role.get("highlights", []))
+        if profile.get("education"):
+            lines.append("Education:")
+            lines.extend(f"- {e.get('degree')}, {e.get('institution')} ({e.get('year')})" for e in profile["education"])
+        if profile.get("certifications"):
+            lines.append("Certifications: " + ", ".join(profile["certifications"]))
+        return "\n".join(lines)
+
+    async def aextract_profile(self, resume_text:str, use_cache: bool=True)-> dict:
+        ## Resume text -> ResumeProfile dict, once per distinct resume: cached by content hash,
+        ## and concurrent requests for the same resume share one LLM call
+        try:
+            with span("compact"):
+                resume_text, _ = await asyncio.to_thread(self.registry.get_compactor("resume").compact, resume_text)
+            cache_key = None
+            if use_cache and self.registry.profile_cache is not None:
+                cache_key = self.registry.cache_key("resume_profile", resume_text)
+            flight_key = ResultCache.make_key(use_cache, resume_text)
+            return await self.registry.coalesce("profile", flight_key, lambda: self._extract_profile(resume_text, cache_key))
+        except Exception as e:
+            self.log.error(f"Profile extraction failed: {str(e)}", exception_type=str(type(e)))
+            raise ResumeAnalysisException("Profile extraction failed",sys) from e
+
+    async def _extract_profile(self, resume_text:str, cache_key: str)-> dict:
+        cache = self.registry.profile_cache
+        if cache_key is not None:
+            with span("profile_lookup"):
+                cached = await cache.aget(cache_key)
+            if cached is not None:
+                self.log.info("Profile cache hit", cache_key=cache_key)
+                return cached
+
+        with span("profile_extract"):
+            profile = await self.registry.ainvoke("resume_profile", {
+                "format_instructions": self.registry.get_format_instructions("resume_profile"),
+                "resume_text": resume_text,
+            })
+        profile = self.jobdescriptor._to_dict(profile)
+        self.log.info("Resume profile extracted", skills=len(profile.get("skills", [])), roles=len(profile.get("roles", [])))
+        if cache_key is not None:
+            await cache.aput(cache_key, profile)
+        return profile
+
+    async def aresolve_job_description(self, job_description:str)-> str:
+        ## If given url, fetch and extract it once; plain text passes through unchanged
+        url=self.jobdescriptor.url_extractor(job_description)
+        if url is None:
+            return job_description
+        self.log.info(f"Url Extracted: {url}")
+        return await self.jobdescriptor.aresolve_url(url)
+
+    async def _prepare_scoring(self, resume_text:str, job_description:str, use_cache: bool):
+        ## Compact the inputs and work out the cache key; shared by the blocking and streaming paths
+        with span("compact"):
+            resume_text, job_description = await asyncio.to_thread(self.compact_inputs, resume_text, job_description)
+        self.log.info(f"Resume text length: {len(resume_text)}")
+        self.log.info(f"Job description length: {len(job_description)}")
+        cache_key = self.registry.cache_key("resume_analysis", resume_text, job_description) if use_cache else None
+        inputs = {
+            "format_instructions": self.registry.get_format_instructions("resume_analysis"),
+            "job_description": job_description,
+            "resume_text":resume_text
+        }
+        return inputs, cache_key
+
+    async def ascore_resume(self, resume_text:str, job_description:str, use_cache: bool=True, profile: dict=None)-> dict:
+        ## Score against an already resolved job description, used directly by batch ranking.
+        ## With a profile, the compact profile is scored instead of resume_text.
+        try:
+            if profile is not None:
+                resume_text = self.format_profile(profile)
+            inputs, cache_key = await self._prepare_scoring(resume_text, job_description, use_cache)
+            ## identical concurrent submissions (double clicks, duplicate batch entries) share one LLM call
+            flight_key = ResultCache.make_key(use_cache, inputs["resume_text"], inputs["job_description"])
+            return await self.registry.coalesce("scoring", flight_key, lambda: self._score(inputs, cache_key))
+        except Exception as e:
+            self.log.error(f"Metadata analysis failed: {str(e)}", exception_type=str(type(e)))
+            raise ResumeAnalysisException("Metadata extraction failed",sys) from e
+
+    async def _score(self, inputs: dict, cache_key: str)-> dict:
+        ## Cache lookup, LLM call and cache write; runs once per single-flight key
+        cache = self.registry.result_cache
+        if cache_key is not None:
+            with span("cache_lookup"):
+                cached = await cache.aget(cache_key)
+            if cached is not None:
+                self.log.info("Result cache hit", cache_key=cache_key)
+                return cached
+
+        with span("llm_scoring"):
+            response = await self.registry.ainvoke("resume_analysis", inputs)
+        response_dict = self.jobdescriptor._to_dict(response)
+
+        self.log.info("Metadata extraction successful", keys=list(response_dict.keys()) if isinstance(response_dict, dict) else 'Not a dict')
+        if cache_key is not None:
+            await cache.aput(cache_key, response_dict)
+        return response_dict
+
+    async def astream_resume(self, resume_text:str, job_description:str, use_cache: bool=True) -> AsyncIterator[Tuple[str, Any]]:
+        ## Yields (event, data) pairs: "status" while resolving, one "section" per completed
+        ## ResumeRater field as the LLM generates it, then the validated "result".
+        try:
+            if self.jobdescriptor.url_extractor(job_description) is not None:
+                yield "status", {"stage": "resolving_job_description"}
+            job_description = await self.aresolve_job_description(job_description)
+            yield "status", {"stage": "scoring"}
+
+            inputs, cache_key = await self._prepare_scoring(resume_text, job_description, use_cache)
+            cache = self.registry.result_cache
+            if cache_key is not None:
+                with span("cache_lookup"):
+                    cached = await cache.aget(cache_key)
+                if cached is not None:
+                    self.log.info("Result cache hit", cache_key=cache_key)
+                    for key, value in cached.items():
+                        yield "section", {"key": key, "value": value}
+                    yield "result", cached
+                    return
+
+            ## JsonOutputParser streams growing partial dicts; a key is complete once a later key has started
+            emitted = set()
+            partial = {}
+            provider_key = self.registry.pick_provider()
+            chain = self.registry.get_chain("resume_analysis", provider_key)
+            with span("llm_scoring"):
+                async with self.registry.llm_slot(provider_key, inputs, "resume_analysis"):
+                    async for partial in chain.astream(inputs):
+                        if not isinstance(partial, dict):
+                            continue
+                        for key in list(partial.keys())[:-1]:
+                            if key not in emitted:
+                                emitted.add(key)
+                                yield "section", {"key": key, "value": partial[key]}
+            for key, value in partial.items():
+                if key not in emitted:
+                    yield "section", {"key": key, "value": value}
+
+            response_dict = ResumeRater.model_validate(partial).model_dump()
+            self.log.info("Streaming analysis successful", keys=list(response_dict.keys()))
+            if cache_key is not None:
+                await cache.aput(cache_key, response_dict)
+            yield "result", response_dict
+
+        except Exception as e:
+            self.log.error(f"Streaming analysis failed: {str(e)}", exception_type=str(type(e)))
+            raise ResumeAnalysisException("Metadata extraction failed",sys) from e
+
+    async def _aresolve_job(self, job_description:str)-> str:
+        with span("resolve_job"):
+            return await self.aresolve_job_description(job_description)
+
+    def scoring_mode(self, mode: str=None) -> str:
+        ## The request's mode, or lite_scoring.default_mode
+        mode = mode or self.registry.config.get("lite_scoring", {}).get("default_mode", "llm")
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode {mode!r}, expected one of {', '.join(SCORING_MODES)}")
+        return mode
+
+    async def aresolve_job_locally(self, job_description:str)-> str:
+        ## Job description for lite scoring: a posting already parsed in the job store, else the page's
+        ## main text. Unlike aresolve_job_description, never calls the LLM.
+        url=self.jobdescriptor.url_extractor(job_description)
+        if url is None:
+            return job_description
+        with span("resolve_job"):
+            parsed = await asyncio.to_thread(self.jobdescriptor.fetcher.store.get_parsed, url)
+            if parsed is not None:
+                return parsed
+            return await self.jobdescriptor.aload_job_url(url)
+
+    def score_lite(self, resume_text:str, job_description:str)-> dict:
+        ## ResumeRater dict from the local keyword scorer; job_description is text or JobDescription JSON
+        with span("lite_scoring"):
+            return self.registry.get_lite_scorer().score(resume_text, job_description)
+
+    async def ascore_with_mode(self, resume_text:str, job_description:str, mode: str="llm", use_cache: bool=True,
+                               use_profile: bool=False) -> Tuple[dict, dict]:
+        ## (result, report) for an already resolved job description. The report says which scorer answered:
+        ## {"mode", "scored_by"} plus "lite_score" whenever the lite pass ran.
+        report = {"mode": mode, "scored_by": "llm"}
+        if mode != "llm":
+            lite_result = self.score_lite(resume_text, job_description)
+            report["lite_score"] = lite_result["overall_score"]
+            threshold = self.registry.config.get("lite_scoring", {}).get("llm_threshold", 50)
+            if mode == "lite" or lite_result["overall_score"] < threshold:
+                report["scored_by"] = "lite"
+                SCORINGS.inc(mode=mode, scored_by="lite")
+                return lite_result, report
+        profile = None
+        if use_profile:
+            profile = self.resume_profile = await self.aextract_profile(resume_text, use_cache=use_cache)
+        result = await self.ascore_resume(resume_text, job_description, use_cache=use_cache, profile=profile)
+        SCORINGS.inc(mode=mode, scored_by="llm")
+        return result, report
+
+    async def aanalyze_resume(self, resume_text:str, job_description:str, use_cache: bool=True, use_profile: bool=None,
+                              mode: str=None)-> dict:
+        ## Async twin of analyze_resume: job fetch, extraction and scoring all await instead of blocking the loop.
+        ## use_profile (default: profiles.enabled) scores a cached ResumeProfile instead of the raw text.
+        ## mode (default: lite_scoring.default_mode) picks the scorer, see SCORING_MODES; scoring_report records it.
+        mode = self.scoring_mode(mode)
+        if use_profile is None:
+            use_profile = self.registry.config.get("profiles", {}).get("enabled", False)
+        if mode != "llm":
+            ## lite-then-llm resolves with the LLM: resumes that pass the lite score need the parsed posting
+            if mode == "lite":
+                job_description = await self.aresolve_job_locally(job_description)
+            else:
+                job_description = await self._aresolve_job(job_description)
+            result, self.scoring_report = await self.ascore_with_mode(
+                resume_text, job_description, mode, use_cache=use_cache, use_profile=use_profile
+            )
+            return result
+        self.scoring_report = {"mode": mode, "scored_by": "llm"}
+        SCORINGS.inc(mode=mode, scored_by="llm")
+        if not use_profile:
+            job_description = await self._aresolve_job(job_description)
+            return await self.ascore_resume(resume_text, job_description, use_cache=use_cache)
+        ## profile extraction and job resolution do not depend on each other
+        job_description, self.resume_profile = await asyncio.gather(
+            self._aresolve_job(job_description), self.aextract_profile(resume_text, use_cache=use_cache)
+        )
+        return await self.ascore_resume(None, job_description, use_cache=use_cache, profile=self.resume_profile)
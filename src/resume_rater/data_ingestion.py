@@ -1,14 +1,39 @@
 import os
-import fitz
 import sys
 import uuid
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from utils.config_loader import load_config
+from utils.metrics import span
+from utils.deadline import remaining_seconds
 from logger.custom_logger import CustomLogger
-from exception.custom_exception import ResumeAnalysisException
+from exception.custom_exception import ResumeAnalysisException, InvalidUploadException
+
+## PyMuPDF (fitz) is imported on first in-process parse: with the process-pool extractor
+## the API process never needs it
+PDF_MAGIC = b"%PDF-"
+DEFAULT_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+## Bounded pool shared by every handler so PDF work never runs on the event loop
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+## Strong references to fire-and-forget archive writes so they are not garbage collected mid-flight
+_background_tasks = set()
+
+
+def get_pdf_executor() -> ThreadPoolExecutor:
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            workers = load_config().get("ingestion", {}).get("pdf_workers", 4)
+            _pdf_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+        return _pdf_executor
 
 class ResumeHandler:
 
-    def __init__(self, data_dir=None, session_id=None):
+    def __init__(self, data_dir=None, session_id=None, max_upload_bytes=None, archive=False, extractor=None, blob_store=None):
         try:
             self.log=CustomLogger().get_logger(__name__)
             self.data_dir = data_dir or os.getenv(
@@ -17,16 +42,24 @@ class ResumeHandler:
             )
             self.session_id = session_id or f"session_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
-            ## Create base session dir
+            ## Session dir is created on first write, in-memory ingestion without archiving never touches disk
             self.session_path = os.path.join(self.data_dir, self.session_id)
-            os.makedirs(self.session_path, exist_ok=True)
+            self.max_upload_bytes = max_upload_bytes or DEFAULT_MAX_UPLOAD_BYTES
+            self.archive = archive
+            ## Optional PdfExtractor: process pool with page, time and output limits
+            self.extractor = extractor
+            self.extraction_stats = None
+            ## Optional BlobStore: uploads are kept once per content hash instead of per session,
+            ## with their extracted text, and the session dir is never created
+            self.blob_store = blob_store
 
             self.log.info("ResumeHandler Initialized", session_id=self.session_id, session_path=self.session_path)
         except Exception as e:
             self.log.error(f"error initialized ResumeHandler: {e}")
             raise ResumeAnalysisException(f"Error initializing ResumeHandler", sys)
     
-    def save_pdf(self,uploaded_file):
+    ## prefix keeps same-named uploads apart when several share one session (batch scoring)
+    def save_pdf(self,uploaded_file, prefix: str=""):
         try:
             filename = None
             if hasattr(uploaded_file, "filename") and uploaded_file.filename:
@@ -41,7 +74,7 @@ class ResumeHandler:
             if not filename.lower().endswith(".pdf"):
                 raise ResumeAnalysisException("Invalid file type. Only PDFs are allowed.",sys)
 
-            save_path = os.path.join(self.session_path, filename)
+            save_path = os.path.join(self.session_path, f"{prefix}{filename}")
             
             ## Get bytes from file for different frames: eg. fastapi/flask/python/streamlit
             file_bytes = None
@@ -57,6 +90,9 @@ class ResumeHandler:
             else:
                 raise ResumeAnalysisException("Unsupported upload file type: cannot read bytes.", sys)
 
+            if self.blob_store is not None:
+                return self.blob_store.path(self.store_upload(filename, bytes(file_bytes)))
+            os.makedirs(self.session_path, exist_ok=True)
             with open(save_path, "wb") as f:
                 f.write(file_bytes)
 
@@ -68,16 +104,169 @@ class ResumeHandler:
             self.log.error(f"Error saving Resume: {e}")
             raise ResumeAnalysisException("Error saving Resume", e) from e
 
-    def read_pdf(self, pdf_path:str)->str:
+    def read_pdf(self, pdf_path:str, deadline_seconds: float=None)->str:
+        digest = self.blob_store.digest_of(pdf_path) if self.blob_store is not None else None
+        if digest is not None:
+            return self.read_blob(digest, deadline_seconds=deadline_seconds)
+        if self.extractor is not None:
+            with open(pdf_path, "rb") as f:
+                return self.read_pdf_bytes(f.read(), deadline_seconds)
         try:
-            text_chunks = []
+            import fitz
             with fitz.open(pdf_path) as doc:
-                for page_num, page in enumerate(doc, start=1):
-                    text_chunks.append(f"\n--- Page {page_num} ---\n{page.get_text()}")
-            text = "\n".join(text_chunks)
+                text, pages = self._extract_text(doc)
+
+            self.log.info("Resume read successfully", pdf_path=pdf_path, session_id=self.session_id, pages=pages)
+            return text
+        except Exception as e:
+            self.log.error(f"Error reading PDF resume: {e}")
+            raise ResumeAnalysisException("Error reading PDF resume", e) from e
+
+    @staticmethod
+    def _extract_text(doc):
+        text_chunks = []
+        for page_num, page in enumerate(doc, start=1):
+            text_chunks.append(f"\n--- Page {page_num} ---\n{page.get_text()}")
+        return "\n".join(text_chunks), len(text_chunks)
+
+    @staticmethod
+    def _get_filename(uploaded_file) -> str:
+        filename = None
+        if hasattr(uploaded_file, "filename") and uploaded_file.filename:
+            filename = os.path.basename(uploaded_file.filename)
+        elif hasattr(uploaded_file, "name") and uploaded_file.name:
+            filename = os.path.basename(uploaded_file.name)
+        if not filename:
+            raise InvalidUploadException("Could not determine filename from uploaded file.", 400)
+        if not filename.lower().endswith(".pdf"):
+            raise InvalidUploadException("Invalid file type. Only PDFs are allowed.", 415)
+        return filename
+
+    def _check_upload(self, size: int, header: bytes):
+        if size > self.max_upload_bytes:
+            raise InvalidUploadException(f"Upload exceeds the {self.max_upload_bytes} byte limit.", 413)
+        if not bytes(header).startswith(PDF_MAGIC):
+            raise InvalidUploadException("Uploaded file is not a PDF document.", 415)
+
+    def read_upload(self, uploaded_file):
+        ## Read the upload once from its buffer, never more than max_upload_bytes + 1, checking type as we go
+        filename = self._get_filename(uploaded_file)
+        limit = self.max_upload_bytes + 1
 
-            self.log.info("Resume read successfully", pdf_path=pdf_path, session_id=self.session_id, pages=len(text_chunks))
+        # for fastApi the spooled file, for Python / Flask the object itself
+        source = uploaded_file.file if hasattr(uploaded_file, "file") and hasattr(uploaded_file.file, "read") else uploaded_file
+        if hasattr(source, "read"):
+            header = source.read(len(PDF_MAGIC))
+            self._check_upload(len(header), header)
+            if hasattr(source, "seekable") and source.seekable():
+                source.seek(0)
+                data = source.read(limit)
+            else:
+                data = header + source.read(limit - len(header))
+            self._check_upload(len(data), header)
+        # for streamLit, getbuffer is a memoryview, slicing it does not copy
+        elif hasattr(uploaded_file, "getbuffer"):
+            buffer = uploaded_file.getbuffer()
+            self._check_upload(len(buffer), buffer[:len(PDF_MAGIC)])
+            data = bytes(buffer)
+        else:
+            raise InvalidUploadException("Unsupported upload file type: cannot read bytes.", 400)
+        return filename, data
+
+    def read_pdf_bytes(self, data: bytes, deadline_seconds: float=None) -> str:
+        ## Parse straight from memory, no disk round-trip.
+        ## deadline_seconds (the request's remaining budget) only bounds the process-pool extractor.
+        try:
+            if self.extractor is not None:
+                text, self.extraction_stats = self.extractor.extract(data, deadline_seconds)
+                pages = self.extraction_stats["pages"]
+            else:
+                import fitz
+                with fitz.open(stream=data, filetype="pdf") as doc:
+                    text, pages = self._extract_text(doc)
+            self.log.info("Resume read from memory", session_id=self.session_id, pages=pages, size=len(data))
             return text
+        except InvalidUploadException:
+            raise
         except Exception as e:
             self.log.error(f"Error reading PDF resume: {e}")
-            raise ResumeAnalysisException("Error reading PDF resume", e) from e
\ No newline at end of file
+            raise InvalidUploadException("Uploaded PDF could not be parsed", 422, e) from e
+
+    def store_upload(self, filename: str, data: bytes) -> str:
+        ## Returns the content digest; identical uploads share one blob
+        digest = self.blob_store.put(data)
+        self.blob_store.link(self.session_id, digest, filename)
+        self.log.info("Resume stored", digest=digest, file=filename, session_id=self.session_id)
+        return digest
+
+    def read_blob(self, digest: str, data: bytes=None, deadline_seconds: float=None) -> str:
+        ## Text extracted from this content under the same limits is reused; otherwise parse and keep it
+        ## next to the blob. In-process parsing has no limits: its text is the full document.
+        settings = self.extractor.settings_key() if self.extractor is not None else "full"
+        text = self.blob_store.get_text(digest, settings)
+        if text is not None:
+            self.log.info("Resume text served from upload store", digest=digest, session_id=self.session_id)
+            return text
+        if data is None:
+            with open(self.blob_store.path(digest), "rb") as f:
+                data = f.read()
+        text = self.read_pdf_bytes(data, deadline_seconds)
+        self.blob_store.put_text(digest, text, settings)
+        return text
+
+    def archive_pdf(self, filename: str, data: bytes, prefix: str="") -> str:
+        if self.blob_store is not None:
+            return self.blob_store.path(self.store_upload(filename, data))
+        os.makedirs(self.session_path, exist_ok=True)
+        save_path = os.path.join(self.session_path, f"{prefix}{filename}")
+        with open(save_path, "wb") as f:
+            f.write(data)
+        self.log.info("Resume archived", save_path=save_path, session_id=self.session_id)
+        return save_path
+
+    ## Async wrappers for the API, the sync methods stay available for test.py and CLI use
+    ## Spans wrap the awaits: run_in_executor does not carry the request's timing context into the pool,
+    ## so the remaining deadline budget is passed in explicitly
+    async def asave_pdf(self, uploaded_file, prefix: str="") -> str:
+        loop = asyncio.get_running_loop()
+        with span("save_pdf"):
+            return await loop.run_in_executor(get_pdf_executor(), self.save_pdf, uploaded_file, prefix)
+
+    async def aread_pdf(self, pdf_path: str) -> str:
+        loop = asyncio.get_running_loop()
+        with span("read_pdf"):
+            return await loop.run_in_executor(get_pdf_executor(), self.read_pdf, pdf_path, remaining_seconds())
+
+    async def aingest(self, uploaded_file, prefix: str="") -> str:
+        ## In-memory path: read + parse on the pdf pool, archiving (if enabled) happens after we return
+        loop = asyncio.get_running_loop()
+        with span("read_upload"):
+            filename, data = await loop.run_in_executor(get_pdf_executor(), self.read_upload, uploaded_file)
+        if self.blob_store is not None:
+            ## the store replaces archiving: the upload is kept once and its text reused next time
+            with span("store_upload"):
+                digest = await loop.run_in_executor(get_pdf_executor(), self.store_upload, filename, data)
+            with span("read_pdf"):
+                return await loop.run_in_executor(get_pdf_executor(), self.read_blob, digest, data, remaining_seconds())
+        with span("read_pdf"):
+            text = await loop.run_in_executor(get_pdf_executor(), self.read_pdf_bytes, data, remaining_seconds())
+        if self.archive:
+            task = asyncio.ensure_future(
+                loop.run_in_executor(get_pdf_executor(), self.archive_pdf, filename, data, prefix)
+            )
+            _background_tasks.add(task)
+            task.add_done_callback(self._archive_done)
+        return text
+
+    async def asave_upload(self, uploaded_file, prefix: str="") -> str:
+        ## Validated save for callers that need the file on disk (batch scoring)
+        loop = asyncio.get_running_loop()
+        with span("read_upload"):
+            filename, data = await loop.run_in_executor(get_pdf_executor(), self.read_upload, uploaded_file)
+        with span("save_pdf"):
+            return await loop.run_in_executor(get_pdf_executor(), self.archive_pdf, filename, data, prefix)
+
+    def _archive_done(self, task):
+        _background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.log.error("Resume archiving failed", session_id=self.session_id, error=str(task.exception()))
\ No newline at end of file
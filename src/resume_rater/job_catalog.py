@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import List, Optional, Tuple
+from src.resume_rater.data_analisis import ResumeAnalyzer
+from utils.job_store import canonical_url
+from utils.result_cache import ResultCache
+from utils.metrics import metrics, span
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+MATCH_JOBS = metrics.counter("resume_rater_match_jobs_total", "Catalog postings scored by POST /match, by source", ("source",))
+
+
+def _fts_phrase(text: str) -> str:
+    ## User input as quoted FTS5 terms (implicit AND), so operators and quotes in it stay literal
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class JobCatalog:
+    ###
+    # SQLite library of parsed job postings for POST /match:
+    # 1. One row per posting, deduplicated by canonical URL (or by content hash for pasted text)
+    # 2. The parsed JobDescription JSON is stored, so postings are never re-extracted
+    # 3. Indexed company / created_at columns plus an FTS5 table over title, company, location
+    #    and posting text keep filtering fast with thousands of postings
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS catalog_jobs ("
+            "id INTEGER PRIMARY KEY, source_key TEXT NOT NULL UNIQUE, source_url TEXT, "
+            "title TEXT, company TEXT COLLATE NOCASE, location TEXT, parsed_json TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS catalog_jobs_company ON catalog_jobs(company, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS catalog_jobs_created ON catalog_jobs(created_at)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_jobs_fts USING fts5(title, company, location, body)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def source_key(job_description: str, url: str=None) -> str:
+        if url is not None:
+            return canonical_url(url)
+        return ResultCache.make_key(job_description)
+
+    def find(self, source_key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, source_url, title, company, location, parsed_json, created_at "
+                "FROM catalog_jobs WHERE source_key = ?", (source_key,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def add(self, source_key: str, parsed: dict, source_url: str=None) -> Tuple[int, bool]:
+        ## Returns (job_id, created); an already catalogued posting keeps its id
+        body = " ".join(parsed.get("description", []) + parsed.get("requirements", []))
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM catalog_jobs WHERE source_key = ?", (source_key,)).fetchone()
+            if row is not None:
+                return row[0], False
+            cursor = self._conn.execute(
+                "INSERT INTO catalog_jobs (source_key, source_url, title, company, location, parsed_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_key, source_url, parsed.get("title"), parsed.get("company"), parsed.get("location"),
+                 json.dumps(parsed), time.time()),
+            )
+            job_id = cursor.lastrowid
+            self._conn.execute(
+                "INSERT INTO catalog_jobs_fts (rowid, title, company, location, body) VALUES (?, ?, ?, ?, ?)",
+                (job_id, parsed.get("title", ""), parsed.get("company", ""), parsed.get("location", ""), body),
+            )
+            self._conn.commit()
+        return job_id, True
+
+    def delete(self, job_id: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM catalog_jobs WHERE id = ?", (job_id,))
+            self._conn.execute("DELETE FROM catalog_jobs_fts WHERE rowid = ?", (job_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def search(self, query: str=None, company: str=None, location: str=None,
+               job_ids: List[int]=None, limit: int=100) -> List[dict]:
+        ## Newest first. query is full text over all posting fields, location matches words in the location
+        match = []
+        if query:
+            match.append(_fts_phrase(query))
+        if location:
+            match.append(f"location : ({_fts_phrase(location)})")
+        sql = "SELECT j.id, j.source_url, j.title, j.company, j.location, j.parsed_json, j.created_at FROM catalog_jobs j"
+        where, params = [], []
+        if match:
+            sql += " JOIN catalog_jobs_fts f ON f.rowid = j.id"
+            where.append("catalog_jobs_fts MATCH ?")
+            params.append(" AND ".join(match))
+        if company:
+            where.append("j.company = ?")
+            params.append(company)
+        if job_ids:
+            where.append(f"j.id IN ({', '.join('?' * len(job_ids))})")
+            params.extend(job_ids)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY j.created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM catalog_jobs").fetchone()
+        return total
+
+    @staticmethod
+    def _row_to_job(row) -> dict:
+        job_id, source_url, title, company, location, parsed_json, created_at = row
+        return {"job_id": job_id, "source_url": source_url, "title": title, "company": company,
+                "location": location, "job": json.loads(parsed_json), "created_at": created_at}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CatalogMatcher:
+    ###
+    # Catalog ingestion and one-resume-against-many-postings scoring:
+    # 1. aingest parses a URL or pasted text into a JobDescription once and stores it
+    # 2. amatch compacts the resume (or its ResumeProfile) once, serves known pairs from the
+    #    result cache, and scores the rest with one batched, concurrency-capped LLM call set
+    # 3. Results come back ranked by overall_score; failed postings are listed, not fatal
+
+    def __init__(self, analyzer: ResumeAnalyzer, catalog: JobCatalog, max_concurrency: int=8):
+        self.analyzer = analyzer
+        self.registry = analyzer.registry
+        self.catalog = catalog
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def aingest(self, job_description: str) -> Tuple[dict, bool]:
+        url = self.analyzer.jobdescriptor.url_extractor(job_description)
+        source_key = JobCatalog.source_key(job_description, url)
+        existing = await asyncio.to_thread(self.catalog.find, source_key)
+        if existing is not None:
+            return existing, False
+        if url is not None:
+            parsed = await self.analyzer.jobdescriptor.aresolve_url(url)
+        else:
+            job_text, _ = await asyncio.to_thread(self.registry.get_compactor("job_text").compact, job_description)
+            parsed = await self.analyzer.jobdescriptor.aextract_job_details(job_text)
+        parsed = json.loads(parsed)
+        job_id, created = await asyncio.to_thread(self.catalog.add, source_key, parsed, url)
+        log.info("Job added to catalog", job_id=job_id, created=created, title=parsed.get("title"))
+        return {"job_id": job_id, "source_url": url, "title": parsed.get("title"), "company": parsed.get("company"),
+                "location": parsed.get("location"), "job": parsed}, created
+
+    async def amatch(self, resume_text: str, jobs: List[dict], use_cache: bool=True, use_profile: bool=False) -> dict:
+        if use_profile:
+            self.analyzer.resume_profile = await self.analyzer.aextract_profile(resume_text, use_cache=use_cache)
+            resume_text = self.analyzer.format_profile(self.analyzer.resume_profile)
+        with span("compact"):
+            resume_text, _ = await asyncio.to_thread(self.registry.get_compactor("resume").compact, resume_text)
+
+        ## same job text and cache keys as /rater, so results are shared with single-posting scoring
+        format_instructions = self.registry.get_format_instructions("resume_analysis")
+        pending = []
+        for job in jobs:
+            job_text, _ = self.registry.get_compactor("job_text").compact(json.dumps(job["job"]))
+            inputs = {"format_instructions": format_instructions, "job_description": job_text, "resume_text": resume_text}
+            cache_key = self.registry.cache_key("resume_analysis", resume_text, job_text) if use_cache else None
+            pending.append((job, inputs, cache_key))
+
+        cache = self.registry.result_cache
+        results = [None] * len(pending)
+        if cache is not None:
+            with span("cache_lookup"):
+                cached = await asyncio.gather(*(cache.aget(key) if key else asyncio.sleep(0) for _, _, key in pending))
+            results = list(cached)
+        misses = [i for i, result in enumerate(results) if result is None]
+        MATCH_JOBS.inc(len(pending) - len(misses), source="cache")
+        MATCH_JOBS.inc(len(misses), source="llm")
+
+        if misses:
+            with span("llm_scoring"):
+                answers = await self.registry.abatch("resume_analysis", [pending[i][1] for i in misses],
+                                                     max_concurrency=self.max_concurrency)
+            for i, answer in zip(misses, answers):
+                results[i] = answer
+                if not isinstance(answer, Exception) and pending[i][2] is not None:
+                    await cache.aput(pending[i][2], answer)
+
+        ranking, errors = [], []
+        for (job, _, _), result in zip(pending, results):
+            summary = {"job_id": job["job_id"], "title": job["title"], "company": job["company"], "location": job["location"]}
+            if isinstance(result, Exception):
+                log.error("Catalog match failed", job_id=job["job_id"], error=str(result))
+                errors.append({**summary, "error": getattr(result, "error_message", None) or str(result)})
+                continue
+            ranking.append({**summary, "overall_score": result.get("overall_score"), "analysis_result": result})
+        ranking.sort(key=lambda item: item["overall_score"] or 0, reverse=True)
+        for rank, item in enumerate(ranking, start=1):
+            item["rank"] = rank
+        log.info("Catalog match complete", jobs=len(pending), llm_calls=len(misses), failed=len(errors))
+        return {"matched": len(pending), "ranking": ranking, "errors": errors}
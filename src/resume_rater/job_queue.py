@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import uuid
+import math
+import sqlite3
+import asyncio
+import threading
+from typing import Optional
+from src.resume_rater.data_analisis import ResumeAnalyzer
+from utils.llm_registry import LLMRegistry
+from utils.metrics import metrics, DEADLINES_EXCEEDED
+from utils.deadline import budget_seconds, start_deadline, run_with_deadline
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import QueueFullException, DeadlineExceededException
+log = CustomLogger().get_logger(__name__)
+
+QUEUE_JOBS = metrics.counter("resume_rater_queue_jobs_total", "Queued scoring jobs by outcome", ("outcome",))
+QUEUE_WAIT_SECONDS = metrics.histogram("resume_rater_queue_wait_seconds", "Time jobs spend queued before a worker picks them up")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ScoringJobStore:
+    ###
+    # SQLite persistence for queued scoring jobs. Every row is owned by the process that queued
+    # (or reclaimed) it, so several uvicorn workers can share one file: GET /rater/jobs/{id}
+    # works from any of them, and only jobs of dead processes are reclaimed on startup.
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scoring_jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, owner_pid INTEGER NOT NULL, session_id TEXT, "
+            "filename TEXT, resume_text TEXT NOT NULL, job_description TEXT NOT NULL, use_cache INTEGER NOT NULL, "
+            "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS scoring_jobs_status ON scoring_jobs(status, created_at)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def insert(self, job_id: str, session_id: str, filename: str, resume_text: str, job_description: str, use_cache: bool):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO scoring_jobs (id, status, owner_pid, session_id, filename, resume_text, job_description, "
+                "use_cache, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, os.getpid(), session_id, filename, resume_text, job_description, int(use_cache), time.time()),
+            )
+            self._conn.commit()
+
+    def load(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, session_id, filename, resume_text, job_description, use_cache, result, error, "
+                "created_at, started_at, finished_at FROM scoring_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = dict(zip(
+                ("job_id", "status", "session_id", "filename", "resume_text", "job_description", "use_cache",
+                 "result", "error", "created_at", "started_at", "finished_at"), row))
+            if job["status"] == QUEUED:
+                (ahead,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM scoring_jobs WHERE status = ? AND created_at < ?", (QUEUED, job["created_at"])
+                ).fetchone()
+                job["position"] = ahead + 1
+        job["use_cache"] = bool(job["use_cache"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def mark_running(self, job_id: str):
+        with self._lock:
+            self._conn.execute("UPDATE scoring_jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), job_id))
+            self._conn.commit()
+
+    def finish(self, job_id: str, result: dict=None, error: str=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE scoring_jobs SET status = ?, result = ?, error = ?, finished_at = ?, resume_text = '' WHERE id = ?",
+                (FAILED if error else DONE, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def reclaim_orphans(self, include_own: bool=True) -> list:
+        ## Queued or running jobs whose owning process is gone become ours and go back on the queue.
+        ## Each claim is conditional on the owner we saw, so when several workers reclaim at once
+        ## only one of them takes a given job.
+        me = os.getpid()
+        claimed = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, owner_pid FROM scoring_jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+            for job_id, pid in rows:
+                if pid == me and not include_own:
+                    continue
+                if pid != me and _pid_alive(pid):
+                    continue
+                cursor = self._conn.execute(
+                    "UPDATE scoring_jobs SET status = ?, owner_pid = ?, started_at = NULL "
+                    "WHERE id = ? AND owner_pid IS ? AND status IN (?, ?)",
+                    (QUEUED, me, job_id, pid, QUEUED, RUNNING),
+                )
+                if cursor.rowcount == 1:
+                    claimed.append(job_id)
+            self._conn.commit()
+        return claimed
+
+    def purge(self, retention_seconds: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM scoring_jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - retention_seconds),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ScoringQueue:
+    ###
+    # Queued scoring mode behind POST /rater/jobs:
+    # 1. Accepted jobs (already ingested resume text) are written to SQLite, then put on an in-memory queue
+    # 2. A fixed pool of worker tasks scores them with ResumeAnalyzer, so LLM concurrency is capped
+    # 3. Submissions beyond max_queued are refused with a Retry-After estimate from recent job durations
+    # 4. On startup, unfinished jobs from a previous (dead) process are reclaimed and re-queued;
+    #    afterwards every reclaim_interval_seconds, so jobs of a sibling worker process that died
+    #    while this one keeps running are picked up without waiting for a restart
+    # Finished jobs are kept for retention_seconds so clients can poll their result.
+
+    def __init__(self, db_path: str, workers: int=4, max_queued: int=100, retention_seconds: float=24 * 3600,
+                 reclaim_interval_seconds: float=60):
+        self.store = ScoringJobStore(db_path)
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.reclaim_interval_seconds = reclaim_interval_seconds
+        self._queue: asyncio.Queue = None
+        self._tasks = []
+        self._registry = None
+        ## moving average of job run time, seeds the Retry-After hint
+        self._avg_job_seconds = 10.0
+        self._last_purge = 0.0
+
+    async def start(self, registry: LLMRegistry):
+        self._registry = registry
+        self._queue = asyncio.Queue()
+        await asyncio.to_thread(self.store.purge, self.retention_seconds)
+        orphans = await asyncio.to_thread(self.store.reclaim_orphans)
+        for job_id in orphans:
+            self._queue.put_nowait(job_id)
+        if orphans:
+            log.info("Recovered unfinished scoring jobs", jobs=len(orphans))
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        if self.reclaim_interval_seconds:
+            self._tasks.append(asyncio.create_task(self._reclaim_loop()))
+        log.info("Scoring queue started", workers=self.workers, max_queued=self.max_queued)
+
+    async def stop(self):
+        ## Running jobs stay `running` in SQLite and are reclaimed by the next process
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+        log.info("Scoring queue stopped")
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._queue.qsize() * self._avg_job_seconds / self.workers))
+
+    def check_capacity(self):
+        if self._queue.qsize() >= self.max_queued:
+            QUEUE_JOBS.inc(outcome="rejected")
+            raise QueueFullException(f"Scoring queue is full ({self.max_queued} jobs waiting)", self.retry_after())
+
+    async def submit(self, resume_text: str, job_description: str, use_cache: bool=True,
+                     session_id: str=None, filename: str=None) -> str:
+        self.check_capacity()
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.insert, job_id, session_id, filename, resume_text, job_description, use_cache)
+        self._queue.put_nowait(job_id)
+        QUEUE_JOBS.inc(outcome="accepted")
+        if time.time() - self._last_purge > 3600:
+            self._last_purge = time.time()
+            asyncio.get_running_loop().run_in_executor(None, self.store.purge, self.retention_seconds)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = await asyncio.to_thread(self.store.load, job_id)
+        if job is not None:
+            ## inputs are not part of the status response
+            job.pop("resume_text")
+            job.pop("job_description")
+        return job
+
+    async def _reclaim_loop(self):
+        ## own jobs are already on the in-memory queue; only dead processes' jobs are taken here
+        while True:
+            await asyncio.sleep(self.reclaim_interval_seconds)
+            try:
+                orphans = await asyncio.to_thread(self.store.reclaim_orphans, False)
+            except Exception as e:
+                log.error("Reclaiming orphaned scoring jobs failed", error=str(e))
+                continue
+            for job_id in orphans:
+                self._queue.put_nowait(job_id)
+            if orphans:
+                log.info("Recovered scoring jobs of a dead worker process", jobs=len(orphans))
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("Scoring queue worker error", worker=worker_id, job_id=job_id, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await asyncio.to_thread(self.store.load, job_id)
+        if job is None or job["status"] not in (QUEUED, RUNNING):
+            return
+        QUEUE_WAIT_SECONDS.observe(time.time() - job["created_at"])
+        await asyncio.to_thread(self.store.mark_running, job_id)
+        started = time.perf_counter()
+        ## each job gets deadlines.item_seconds from when a worker picks it up
+        deadline = start_deadline(budget_seconds(self._registry.config, key="item_seconds"))
+        try:
+            analyzer = ResumeAnalyzer(registry=self._registry)
+            result = await run_with_deadline(
+                analyzer.aanalyze_resume(job["resume_text"], job["job_description"], use_cache=job["use_cache"]), deadline
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, DeadlineExceededException):
+                DEADLINES_EXCEEDED.inc(stage=e.stage)
+            await asyncio.to_thread(self.store.finish, job_id, None, getattr(e, "error_message", None) or str(e))
+            QUEUE_JOBS.inc(outcome="failed")
+            log.error("Queued scoring job failed", job_id=job_id, error=str(e))
+            return
+        elapsed = time.perf_counter() - started
+        self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+        await asyncio.to_thread(self.store.finish, job_id, result)
+        QUEUE_JOBS.inc(outcome="done")
+        log.info("Queued scoring job finished", job_id=job_id, seconds=round(elapsed, 3))
@@ -0,0 +1,510 @@
+import re
+import sys
+import json
+import datetime
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from model.models import ResumeRater, JobDescription
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import ResumeAnalysisException
+log = CustomLogger().get_logger(__name__)
+
+## canonical name -> lowercase synonyms, grouped by the skills_match categories of the scoring prompt.
+## Certifications feed education_match; they are matched by the same pattern.
+SKILLS: Dict[str, Dict[str, List[str]]] = {
+    "Technical Skills": {
+        "Python": ["python", "python3", "cpython"],
+        "Java": ["java", "jvm", "java 8", "java 11", "java 17"],
+        "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+        "TypeScript": ["typescript"],
+        "Go": ["golang", "go lang"],
+        "Rust": ["rust"],
+        "C++": ["c++", "cpp"],
+        "C#": ["c#", "csharp", "c sharp"],
+        ".NET": [".net", "dotnet", "asp.net", ".net core"],
+        "Scala": ["scala"],
+        "Kotlin": ["kotlin"],
+        "Swift": ["swift"],
+        "Ruby": ["ruby", "ruby on rails", "rails"],
+        "PHP": ["php", "laravel", "symfony"],
+        "R": ["r programming", "rstudio", "tidyverse"],
+        "SQL": ["sql", "t-sql", "pl/sql", "plsql", "sql server", "mssql"],
+        "PostgreSQL": ["postgresql", "postgres", "psql"],
+        "MySQL": ["mysql", "mariadb"],
+        "MongoDB": ["mongodb", "mongo"],
+        "Redis": ["redis"],
+        "Elasticsearch": ["elasticsearch", "elastic search", "opensearch", "elk"],
+        "Cassandra": ["cassandra"],
+        "Snowflake": ["snowflake"],
+        "BigQuery": ["bigquery", "big query"],
+        "Redshift": ["redshift"],
+        "Spark": ["spark", "pyspark", "apache spark", "spark sql"],
+        "Hadoop": ["hadoop", "hdfs", "hive", "mapreduce"],
+        "Kafka": ["kafka", "apache kafka", "kafka streams"],
+        "Airflow": ["airflow", "apache airflow"],
+        "dbt": ["dbt", "data build tool"],
+        "ETL": ["etl", "elt", "data pipelines", "data pipeline"],
+        "Pandas": ["pandas"],
+        "NumPy": ["numpy"],
+        "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+        "TensorFlow": ["tensorflow", "keras"],
+        "PyTorch": ["pytorch", "torch"],
+        "Machine Learning": ["machine learning", "ml", "predictive modeling", "predictive modelling"],
+        "Deep Learning": ["deep learning", "neural networks", "neural network", "cnn", "rnn", "transformers"],
+        "NLP": ["nlp", "natural language processing", "llm", "llms", "large language models"],
+        "Computer Vision": ["computer vision", "opencv", "image recognition"],
+        "MLOps": ["mlops", "mlflow", "kubeflow", "feature store", "model serving", "sagemaker"],
+        "Statistics": ["statistics", "statistical analysis", "a/b testing", "ab testing", "hypothesis testing"],
+        "Data Visualization": ["data visualization", "data visualisation", "tableau", "power bi", "powerbi", "looker"],
+        "Excel": ["excel", "spreadsheets", "vba"],
+        "React": ["react", "react.js", "reactjs", "react native"],
+        "Angular": ["angular", "angularjs"],
+        "Vue": ["vue", "vue.js", "vuejs", "nuxt"],
+        "Next.js": ["next.js", "nextjs"],
+        "Node.js": ["node.js", "nodejs", "node", "express", "express.js"],
+        "HTML/CSS": ["html/css", "html", "html5", "css", "css3", "sass", "scss", "tailwind"],
+        "Django": ["django"],
+        "Flask": ["flask"],
+        "FastAPI": ["fastapi"],
+        "Spring": ["spring boot", "springboot", "spring framework", "spring mvc"],
+        "REST APIs": ["restful", "rest api", "rest apis", "api design", "openapi"],
+        "GraphQL": ["graphql"],
+        "gRPC": ["grpc", "protobuf"],
+        "Microservices": ["microservices", "microservice", "service oriented architecture", "soa"],
+        "AWS": ["aws", "amazon web services", "ec2", "s3", "lambda", "ecs", "eks", "cloudformation"],
+        "Azure": ["azure", "microsoft azure"],
+        "GCP": ["gcp", "google cloud", "google cloud platform"],
+        "Docker": ["docker", "containers", "containerization", "containerisation"],
+        "Kubernetes": ["kubernetes", "k8s", "helm", "openshift"],
+        "Terraform": ["terraform", "infrastructure as code", "iac", "pulumi"],
+        "Ansible": ["ansible", "chef", "puppet"],
+        "CI/CD": ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment",
+                  "jenkins", "github actions", "gitlab ci", "circleci"],
+        "Linux": ["linux", "unix", "bash", "shell scripting"],
+        "Git": ["git", "github", "gitlab", "bitbucket"],
+        "Monitoring": ["observability", "application monitoring", "infrastructure monitoring", "prometheus", "grafana",
+                       "datadog", "new relic", "splunk"],
+        "Testing": ["unit testing", "test automation", "pytest", "junit", "jest", "selenium", "cypress",
+                    "playwright", "tdd", "test driven development"],
+        "Security": ["application security", "owasp", "penetration testing", "iam", "oauth", "sso", "encryption"],
+        "Networking": ["computer networking", "network engineering", "tcp/ip", "dns", "load balancing", "vpn"],
+        "Mobile": ["ios", "android", "mobile development", "flutter"],
+        "Figma": ["figma", "sketch", "adobe xd"],
+        "UX Design": ["ux design", "ux", "ui/ux", "user experience", "wireframing", "prototyping", "usability testing"],
+        "System Design": ["system design", "distributed systems", "scalability", "high availability"],
+        "Data Modeling": ["data modeling", "data modelling", "data warehouse", "data warehousing", "dimensional modeling"],
+        "Streaming": ["stream processing", "event streaming", "data streaming", "flink", "kinesis", "pub/sub", "pubsub"],
+        "Jira": ["jira", "confluence"],
+        "SAP": ["sap", "sap erp", "s/4hana"],
+        "Salesforce": ["salesforce", "crm"],
+    },
+    "Soft Skills": {
+        "Communication": ["communication", "communication skills", "communicator", "presentations", "presenting"],
+        "Teamwork": ["teamwork", "collaboration", "collaborative", "collaborated", "cross-functional", "cross functional"],
+        "Leadership": ["leadership", "led", "team lead", "tech lead", "people management"],
+        "Mentoring": ["mentoring", "mentored", "mentor", "coaching", "coached"],
+        "Problem Solving": ["problem solving", "problem-solving", "troubleshooting", "analytical skills", "analytical thinking"],
+        "Stakeholder Management": ["stakeholder management", "stakeholders", "stakeholder"],
+        "Ownership": ["ownership", "self-starter", "self starter", "proactive", "autonomous", "initiative"],
+        "Adaptability": ["adaptability", "adaptable", "fast-paced", "fast paced", "flexible"],
+        "Attention to Detail": ["attention to detail", "detail-oriented", "detail oriented"],
+        "Time Management": ["time management", "prioritization", "prioritisation", "deadlines"],
+        "Negotiation": ["negotiation", "negotiated", "negotiating"],
+        "Customer Focus": ["customer focus", "customer-facing", "customer facing", "client-facing", "client facing"],
+        "English": ["english", "fluent english", "written and verbal"],
+    },
+    "Industry Knowledge": {
+        "Finance": ["finance", "financial services", "banking", "fintech", "trading", "payments", "capital markets"],
+        "Healthcare": ["healthcare", "health care", "medical", "clinical", "hipaa", "pharma", "pharmaceutical"],
+        "E-commerce": ["e-commerce", "ecommerce", "retail", "marketplace"],
+        "SaaS": ["saas", "b2b", "software as a service"],
+        "Insurance": ["insurance", "insurtech", "actuarial"],
+        "Telecommunications": ["telecommunications", "telecom", "5g"],
+        "Logistics": ["logistics", "supply chain", "warehousing", "fulfillment", "fulfilment"],
+        "Manufacturing": ["manufacturing", "industrial", "iot", "industry 4.0"],
+        "Energy": ["energy", "oil and gas", "renewables", "utilities"],
+        "Gaming": ["gaming", "game development", "unity", "unreal engine"],
+        "Advertising": ["adtech", "advertising", "programmatic", "digital marketing", "seo", "sem"],
+        "Public Sector": ["public sector", "government", "govtech"],
+        "Education": ["edtech", "e-learning", "elearning"],
+        "Cybersecurity": ["cybersecurity", "cyber security", "infosec", "soc 2", "iso 27001"],
+        "Compliance": ["compliance", "regulatory", "gdpr", "sox", "pci dss", "pci-dss", "kyc", "aml"],
+        "Agile": ["agile", "scrum", "kanban", "sprint", "sprints"],
+    },
+    "Certifications": {
+        "AWS Certified": ["aws certified", "aws solutions architect", "aws certified developer", "aws certified solutions architect"],
+        "Azure Certified": ["azure certified", "az-900", "az-104", "az-204", "az-305"],
+        "Google Cloud Certified": ["google cloud certified", "gcp certified", "professional cloud architect"],
+        "CKA / CKAD": ["cka", "ckad", "certified kubernetes administrator", "certified kubernetes application developer"],
+        "PMP": ["pmp", "project management professional", "prince2"],
+        "Scrum Master": ["scrum master", "csm", "certified scrummaster", "certified scrum master", "psm", "professional scrum master"],
+        "CISSP": ["cissp", "cism", "cisa", "security+", "comptia security+", "ceh", "oscp"],
+        "CFA": ["cfa", "chartered financial analyst", "frm", "acca", "cpa"],
+        "ITIL": ["itil"],
+        "Terraform Associate": ["terraform associate", "hashicorp certified"],
+    },
+}
+## Skill names that are everyday words or resume headings ("Education", "Testing") are not matched on their
+## own: such entries only match through their listed synonyms
+COMMON_WORDS = frozenset({
+    "education", "experience", "skills", "summary", "profile", "objective", "projects", "certifications",
+    "languages", "interests", "references", "awards", "publications", "training", "employment", "work",
+    "testing", "security", "monitoring", "streaming", "networking", "mobile", "design", "development",
+    "engineering", "management", "support", "operations", "research", "data", "cloud", "spring",
+})
+## skills_match categories, in the order of the scoring prompt's example
+SKILL_CATEGORIES = ("Technical Skills", "Soft Skills", "Industry Knowledge")
+CERTIFICATIONS = "Certifications"
+
+## (level, pattern); the highest level found is the candidate's, the lowest one a job names is its requirement
+DEGREE_LEVELS = (
+    (4, re.compile(r"\b(?:ph\.?\s?d|doctorate|doctoral|d\.phil)\b")),
+    (3, re.compile(r"\b(?:master'?s?|msc|m\.sc|m\.s\.|mba|m\.eng|meng|m\.tech|mtech|postgraduate)\b")),
+    (2, re.compile(r"\b(?:bachelor'?s?|bsc|b\.sc|b\.s\.|b\.a\.|beng|b\.eng|btech|b\.tech|undergraduate degree|university degree|degree)\b")),
+    (1, re.compile(r"\b(?:associate'?s? degree|diploma|hnd|high school|a-levels)\b")),
+)
+DEGREE_NAMES = {4: "a doctorate", 3: "a master's degree", 2: "a bachelor's degree", 1: "a diploma"}
+FIELDS_OF_STUDY = re.compile(
+    r"\b(computer science|software engineering|computer engineering|information technology|information systems|"
+    r"data science|statistics|mathematics|applied mathematics|physics|electrical engineering|electronics|"
+    r"mechanical engineering|engineering|economics|business administration|finance|accounting|"
+    r"marketing|graphic design|human-computer interaction|psychology|biology|chemistry|operations research)\b"
+)
+EDUCATION_LINE = re.compile(r"\b(?:university|college|school|institute|academy|bachelor|master|degree|bsc|msc|phd|diploma|graduated)\b")
+
+YEARS_REQUIRED = re.compile(r"(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*)?\+?\s*years?")
+YEARS_STATED = re.compile(r"(\d{1,2})\s*\+?\s*years?\s+(?:of\s+)?(?:professional\s+|industry\s+|work\s+|relevant\s+)?experience")
+MONTHS = "jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec"
+DATE_RANGE = re.compile(
+    rf"(?:({MONTHS})[a-z]*\.?\s+)?((?:19|20)\d{{2}})\s*(?:-|–|—|to|until)\s*"
+    rf"(?:(?:({MONTHS})[a-z]*\.?\s+)?((?:19|20)\d{{2}})|(present|current|now|today|ongoing))"
+)
+MONTH_INDEX = {name: index for index, name in enumerate(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+
+LEADERSHIP = re.compile(r"\b(?:led|lead|leading|managed|manager|head of|director|supervised|mentored|mentoring|"
+                        r"principal|staff engineer|team lead|tech lead|hired|built a team|built the team)\b")
+PROJECT_MANAGEMENT = re.compile(r"\b(?:project|projects|roadmap|delivered|delivery|launched|shipped|milestones?|"
+                                r"planning|scrum|agile|kanban|stakeholders?|budget|scope|jira|okrs?)\b")
+## Raw job text: lines with these cues are requirements, nice-to-have lines count for less
+REQUIRED_CUES = re.compile(r"\b(?:require[ds]?|requirements?|must|need|needs|qualifications?|proficien\w*|"
+                           r"experience (?:with|in)|strong|solid|expert\w*|you have|you bring)\b")
+OPTIONAL_CUES = re.compile(r"\b(?:nice to have|nice-to-have|bonus|plus|preferred|desirable|ideally)\b")
+## Job skill weights by where the skill is mentioned
+REQUIRED_WEIGHT = 2.0
+MENTIONED_WEIGHT = 1.0
+OPTIONAL_WEIGHT = 0.5
+## Section weights of overall_score
+SECTION_WEIGHTS = {"skills_match": 0.3, "experience_match": 0.2, "education_match": 0.1, "job_compliance": 0.4}
+
+
+def _trie_pattern(node: dict) -> str:
+    ## Alternation factored by common prefixes ("java(?:script)?") so the regex engine does not try
+    ## every synonym at every position; "" marks the end of a synonym. Spaces match any whitespace.
+    ## Branches start with different characters, so at most one applies; optional tails are greedy,
+    ## which makes the longest synonym win ("javascript" over "java").
+    optional = "" in node
+    branches = [(r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char != ""]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if optional else group
+
+
+def compile_matcher(synonyms: List[str]) -> re.Pattern:
+    trie: dict = {}
+    for synonym in synonyms:
+        node = trie
+        for char in synonym:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    ## whole words only: "java" must not match inside "javascript", nor "go" inside "good"
+    return re.compile(r"(?<![a-z0-9+#.])" + _trie_pattern(trie) + r"(?![a-z0-9+#]|\.[a-z0-9])")
+
+
+class LiteScorer:
+    ###
+    # Local, deterministic resume scoring that fills the ResumeRater schema without an LLM:
+    # 1. Every skill synonym (SKILLS plus an optional JSON dictionary) is compiled once into a single
+    #    prefix-factored regex; one pass over the lowercased text finds every skill mention
+    # 2. Job skills are weighted by where they appear (requirements > description > nice to have)
+    # 3. skills_match and the skill part of job_compliance are matrix products of resume skill presence
+    #    and job weights, so rank() scores many resumes against one job in one go
+    # 4. Years of experience (stated or summed from date ranges), degree level, field of study,
+    #    certifications, leadership and project wording fill experience_match and education_match
+    # It is a triage signal, not a replacement for the LLM: it only knows the words in its dictionary.
+
+    def __init__(self, skills: Dict[str, Dict[str, List[str]]]=None, reference_year: int=None):
+        skills = skills or SKILLS
+        self.names: List[str] = []
+        categories = list(SKILL_CATEGORIES) + [CERTIFICATIONS]
+        category_of: List[int] = []
+        self._lookup: Dict[str, int] = {}
+        for category, entries in skills.items():
+            if category not in categories:
+                categories.append(category)
+            for name, synonyms in entries.items():
+                index = len(self.names)
+                self.names.append(name)
+                category_of.append(categories.index(category))
+                ## two-letter names ("Go", "R") and COMMON_WORDS are too ambiguous to match on their own
+                implicit = [name.lower()] if len(name) > 2 and name.lower() not in COMMON_WORDS else []
+                for synonym in implicit + list(synonyms):
+                    self._lookup.setdefault(" ".join(synonym.lower().split()), index)
+        self.categories = categories
+        self.category_of = np.array(category_of)
+        ## (categories x skills) one-hot membership, for per-category sums in a single product
+        self.membership = (self.category_of[None, :] == np.arange(len(categories))[:, None]).astype("float32")
+        self._pattern = compile_matcher(list(self._lookup))
+        self.reference_year = reference_year
+        log.info("Lite scorer built", skills=len(self.names), synonyms=len(self._lookup))
+
+    def _skill_counts(self, text: str) -> np.ndarray:
+        counts = np.zeros(len(self.names), dtype="float32")
+        indices = [self._lookup.get(" ".join(match.split())) for match in self._pattern.findall(text)]
+        indices = [index for index in indices if index is not None]
+        if indices:
+            np.add.at(counts, indices, 1.0)
+        return counts
+
+    def presence(self, lowered_texts: List[str]) -> np.ndarray:
+        ## (resumes x skills) 0/1 matrix of lowercased texts
+        if not lowered_texts:
+            return np.zeros((0, len(self.names)), dtype="float32")
+        return np.stack([self._skill_counts(text) > 0 for text in lowered_texts]).astype("float32")
+
+    @staticmethod
+    def job_sections(job: Union[str, dict, JobDescription]) -> Tuple[str, List[Tuple[str, float]]]:
+        ## (full text, [(line, weight)]) from a JobDescription, its JSON, or raw posting text
+        if isinstance(job, JobDescription):
+            job = job.model_dump()
+        if isinstance(job, str) and job.lstrip().startswith("{"):
+            try:
+                job = json.loads(job)
+            except ValueError:
+                pass
+        if isinstance(job, dict):
+            lines = [(str(line).lower(), OPTIONAL_WEIGHT if OPTIONAL_CUES.search(str(line).lower()) else REQUIRED_WEIGHT)
+                     for line in job.get("requirements") or []]
+            lines += [(str(line).lower(), MENTIONED_WEIGHT) for line in [job.get("title") or "", *(job.get("description") or [])]]
+        else:
+            lines = []
+            for line in str(job).lower().splitlines():
+                if OPTIONAL_CUES.search(line):
+                    lines.append((line, OPTIONAL_WEIGHT))
+                elif REQUIRED_CUES.search(line):
+                    lines.append((line, REQUIRED_WEIGHT))
+                else:
+                    lines.append((line, MENTIONED_WEIGHT))
+        return "\n".join(line for line, _ in lines), lines
+
+    def job_weights(self, lines: List[Tuple[str, float]]) -> np.ndarray:
+        ## each skill weighs as much as the most demanding line that mentions it
+        weights = np.zeros(len(self.names), dtype="float32")
+        for line, weight in lines:
+            np.maximum(weights, (self._skill_counts(line) > 0) * weight, out=weights)
+        return weights
+
+    def _current_year(self) -> float:
+        today = datetime.date.today()
+        return float(self.reference_year or today.year) + (today.month - 1) / 12
+
+    def years_of_experience(self, text: str) -> float:
+        ## Stated years ("8 years of experience") or the union of dated work periods, whichever is larger.
+        ## Periods on education lines are not work.
+        stated = [int(years) for years in YEARS_STATED.findall(text)]
+        periods = []
+        now = self._current_year()
+        for line in text.splitlines():
+            if EDUCATION_LINE.search(line):
+                continue
+            for start_month, start_year, end_month, end_year, ongoing in DATE_RANGE.findall(line):
+                start = int(start_year) + MONTH_INDEX.get(start_month[:3], 0) / 12
+                end = now if ongoing else int(end_year) + MONTH_INDEX.get(end_month[:3], 11) / 12
+                if start <= end <= now + 1:
+                    periods.append((start, end))
+        total, covered_until = 0.0, None
+        for start, end in sorted(periods):
+            if covered_until is not None:
+                start = max(start, covered_until)
+            if end > start:
+                total += end - start
+                covered_until = end
+        return round(max([total, *stated]), 1)
+
+    @staticmethod
+    def degree_level(text: str, lowest: bool=False) -> int:
+        levels = [level for level, pattern in DEGREE_LEVELS if pattern.search(text)]
+        if not levels:
+            return 0
+        return min(levels) if lowest else max(levels)
+
+    @staticmethod
+    def required_years(job_text: str) -> float:
+        years = [int(match) for match in YEARS_REQUIRED.findall(job_text) if 0 < int(match) <= 20]
+        return float(max(years)) if years else 0.0
+
+    def _skill_scores(self, presence: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ## (resumes x categories) weighted coverage in 0..1, NaN where the job names no skill of the category,
+        ## and (resumes,) coverage of the required skills
+        demanded = self.membership @ weights
+        covered = (presence * weights) @ self.membership.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            coverage = np.where(demanded > 0, covered / demanded, np.nan)
+        required = (weights >= REQUIRED_WEIGHT).astype("float32")
+        if not required.any():
+            required = (weights > 0).astype("float32")
+        required_coverage = (presence @ required) / required.sum() if required.any() else np.full(len(presence), np.nan)
+        return coverage, required_coverage
+
+    def _category_score(self, coverage: float, found: int) -> int:
+        ## Categories the job does not mention are neutral: 60, plus credit for what the resume shows
+        if np.isnan(coverage):
+            return int(min(100, 60 + 8 * found))
+        return int(round(100 * coverage))
+
+    def rank(self, resume_texts: List[str], job: Union[str, dict, JobDescription]) -> List[dict]:
+        ## ResumeRater dicts, in the order of resume_texts
+        job_text, lines = self.job_sections(job)
+        weights = self.job_weights(lines)
+        lowered = [text.lower() for text in resume_texts]
+        presence = self.presence(lowered)
+        coverage, required_coverage = self._skill_scores(presence, weights)
+        found_per_category = presence @ self.membership.T
+        job_context = {
+            "weights": weights,
+            "required_years": self.required_years(job_text),
+            "required_degree": self.degree_level(job_text, lowest=True),
+            "fields": set(FIELDS_OF_STUDY.findall(job_text)),
+            "leadership": bool(LEADERSHIP.search(job_text)),
+        }
+        return [
+            self._result(text, presence[row], coverage[row], required_coverage[row], found_per_category[row], job_context)
+            for row, text in enumerate(lowered)
+        ]
+
+    def score(self, resume_text: str, job: Union[str, dict, JobDescription]) -> dict:
+        try:
+            return self.rank([resume_text], job)[0]
+        except Exception as e:
+            log.error("Lite scoring failed", error=str(e))
+            raise ResumeAnalysisException("Lite scoring failed", sys) from e
+
+    def _names(self, mask: np.ndarray, limit: int=8) -> List[str]:
+        return [self.names[index] for index in np.flatnonzero(mask)[:limit]]
+
+    def _result(self, text: str, presence: np.ndarray, coverage: np.ndarray, required_coverage: float,
+                found: np.ndarray, job: dict) -> dict:
+        weights = job["weights"]
+        categories = {name: index for index, name in enumerate(self.categories)}
+        skills_match = {name: self._category_score(coverage[categories[name]], int(found[categories[name]]))
+                        for name in SKILL_CATEGORIES}
+
+        years = self.years_of_experience(text)
+        required_years = job["required_years"]
+        years_ratio = min(1.0, years / required_years) if required_years else min(1.0, years / 5)
+        technical = coverage[categories["Technical Skills"]]
+        technical = 0.5 if np.isnan(technical) else technical
+        leadership_hits = len(LEADERSHIP.findall(text))
+        experience_match = {
+            "Relevant Experience": int(round(100 * (0.6 * years_ratio + 0.4 * technical))),
+            "Leadership Experience": int(min(100, 20 + 20 * leadership_hits)),
+            "Project Management": int(min(100, 20 + 10 * len(PROJECT_MANAGEMENT.findall(text)))),
+        }
+
+        degree = self.degree_level(text)
+        required_degree = job["required_degree"]
+        if required_degree:
+            degree_score = 100 if degree >= required_degree else int(round(100 * degree / required_degree * 0.7))
+        else:
+            degree_score = 100 if degree else 60
+        fields = set(FIELDS_OF_STUDY.findall(text))
+        if job["fields"]:
+            field_score = 100 if fields & job["fields"] else (50 if fields else 30)
+        else:
+            field_score = 80 if fields else 60
+        certifications = categories[CERTIFICATIONS]
+        cert_mask = self.category_of == certifications
+        wanted_certs = (weights > 0) & cert_mask
+        held_certs = (presence > 0) & cert_mask
+        if wanted_certs.any():
+            cert_score = int(round(100 * (held_certs & wanted_certs).sum() / wanted_certs.sum()))
+        else:
+            cert_score = int(min(100, 50 + 25 * held_certs.sum()))
+        education_match = {"Degree Level": degree_score, "Field of Study": field_score, "Certifications": cert_score}
+
+        required_skills = 0.5 if np.isnan(required_coverage) else float(required_coverage)
+        if required_years:
+            experience_level = int(round(100 * min(1.0, years / required_years)))
+        else:
+            experience_level = 100 if years else 70
+        job_compliance = {
+            "Required Skills": int(round(100 * required_skills)),
+            "Experience Level": experience_level,
+            "Education Requirements": degree_score if required_degree else 100,
+        }
+
+        sections = {"skills_match": skills_match, "experience_match": experience_match,
+                    "education_match": education_match, "job_compliance": job_compliance}
+        overall = sum(SECTION_WEIGHTS[key] * np.mean(list(values.values())) for key, values in sections.items())
+        overall = int(round(overall))
+
+        skill_mask = (self.category_of != certifications)
+        matched = (presence > 0) & (weights > 0) & skill_mask
+        missing = (presence == 0) & (weights >= REQUIRED_WEIGHT) & skill_mask
+        additional_points = []
+        if matched.any():
+            additional_points.append(f"Matches {int(matched.sum())} of {int(((weights > 0) & skill_mask).sum())} "
+                                     f"skills named in the job: {', '.join(self._names(matched))}")
+        if years:
+            additional_points.append(f"About {years:g} years of experience")
+        if degree:
+            additional_points.append(f"Holds {DEGREE_NAMES[degree]}" + (f" in {', '.join(sorted(fields))}" if fields else ""))
+        if held_certs.any():
+            additional_points.append(f"Certifications: {', '.join(self._names(held_certs))}")
+        improvements = []
+        if missing.any():
+            improvements.append(f"Show experience with required skills not found in the resume: {', '.join(self._names(missing))}")
+        if required_years and years < required_years:
+            improvements.append(f"The job asks for {required_years:g}+ years of experience, the resume shows about {years:g}")
+        if required_degree and degree < required_degree:
+            improvements.append(f"The job asks for {DEGREE_NAMES[required_degree]}")
+        if job["leadership"] and not leadership_hits:
+            improvements.append("Describe leadership or mentoring experience")
+
+        if overall >= 80:
+            verdict = "Strong match"
+        elif overall >= 60:
+            verdict = "Good match with some gaps"
+        elif overall >= 40:
+            verdict = "Partial match"
+        else:
+            verdict = "Weak match"
+        result = {
+            "overall_score": overall,
+            "score_description": f"{verdict} (lite keyword scoring, no LLM review)",
+            **sections,
+            "additional_points": additional_points,
+            "improvements": improvements,
+        }
+        return ResumeRater.model_validate(result).model_dump()
+
+
+def load_skills(path: Optional[str]) -> Dict[str, Dict[str, List[str]]]:
+    ## Built-in dictionary, extended by a JSON file of {"category": {"skill": ["synonym", ...]}}
+    skills = {category: dict(entries) for category, entries in SKILLS.items()}
+    if not path:
+        return skills
+    with open(path, "r", encoding="utf-8") as f:
+        extra = json.load(f)
+    for category, entries in extra.items():
+        for name, synonyms in entries.items():
+            skills.setdefault(category, {})[name] = sorted(set(skills.get(category, {}).get(name, [])) | set(synonyms))
+    return skills
+
+
+def build_lite_scorer(config: dict) -> LiteScorer:
+    lite_config = config.get("lite_scoring", {})
+    return LiteScorer(load_skills(lite_config.get("skills_path")), reference_year=lite_config.get("reference_year"))
@@ -0,0 +1,245 @@
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Tuple
+from src.resume_rater import pdf_worker
+from utils.config_loader import load_config
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import InvalidUploadException
+log = CustomLogger().get_logger(__name__)
+
+
+class PdfExtractionError(InvalidUploadException):
+    ## The document broke a page, time or parsing limit; reported to the client as 422
+    def __init__(self, error_message, error_details=sys):
+        super().__init__(error_message, 422, error_details)
+
+
+class ExtractorBusyError(InvalidUploadException):
+    ## No extraction worker became free in time; not the document's fault, reported to the client as 503
+    def __init__(self, error_message, error_details=sys):
+        super().__init__(error_message, 503, error_details)
+
+
+class WorkerLane:
+    ## One worker process behind a single-process executor. A document holds its lanes exclusively,
+    ## so resetting a lane never touches another document's work.
+    def __init__(self, index: int, initializer=None):
+        self.index = index
+        self.initializer = initializer
+        self._executor = None
+
+    def submit(self, fn, *args) -> Future:
+        if self._executor is None:
+            ## spawn: forking a process that runs uvicorn and thread pools is not safe
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=self.initializer)
+        return self._executor.submit(fn, *args)
+
+    def reset(self):
+        ## The worker may still be spinning inside PyMuPDF; kill it rather than wait for it
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _needs_reset(future: Future) -> bool:
+    ## Still running after the document gave up on it, or its worker died
+    if future.cancelled():
+        return False
+    return not future.done() or isinstance(future.exception(), BrokenProcessPool)
+
+
+class PdfExtractor:
+    ###
+    # Bounded PDF text extraction on worker processes:
+    # 1. Rejects documents above max_pages before extracting anything
+    # 2. Splits large documents into page ranges extracted by several workers
+    # 3. Each document holds its workers ("lanes") exclusively until it is done; a document waits up to
+    #    queue_timeout_seconds for a free worker, and only then does its deadline start
+    # 4. Enforces a per-document deadline, cut to the request's remaining budget when given but never
+    #    below min_deadline_seconds, so a tiny or mostly spent client budget cannot force worker resets;
+    #    a worker stuck past it, or one that crashed, is killed and respawned. Only that document's
+    #    lanes are reset, documents on other workers never see it.
+    # 5. Stops at max_chars of output
+    # Output keeps the `--- Page N ---` layout of ResumeHandler.read_pdf, plus per-page timing stats.
+
+    def __init__(self, max_workers: int=2, pages_per_chunk: int=8, max_pages: int=30,
+                 deadline_seconds: float=10, max_chars: int=100000, queue_timeout_seconds: float=30,
+                 min_deadline_seconds: float=2):
+        self.max_workers = max(1, max_workers)
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self.max_pages = max_pages
+        self.deadline_seconds = deadline_seconds
+        self.max_chars = max_chars
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.min_deadline_seconds = min(min_deadline_seconds, deadline_seconds)
+        self._lanes = [WorkerLane(index) for index in range(self.max_workers)]
+        self._idle: "queue.Queue[WorkerLane]" = queue.Queue()
+        for lane in self._lanes:
+            self._idle.put(lane)
+
+    def _acquire(self, timeout: float) -> WorkerLane:
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ExtractorBusyError(f"No PDF extraction worker became free within {timeout:g}s, try again later")
+
+    def _acquire_more(self, lanes: List[WorkerLane], wanted: int):
+        ## Extra lanes for page ranges, only those idle right now: never wait on other documents for them
+        while len(lanes) < wanted:
+            try:
+                lanes.append(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def _release(self, lanes: List[WorkerLane], submitted: List[Tuple[WorkerLane, Future]]):
+        for lane in lanes:
+            futures = [future for owner, future in submitted if owner is lane]
+            for future in futures:
+                future.cancel()
+            if any(_needs_reset(future) for future in futures):
+                lane.reset()
+                log.warning("PDF extraction worker reset after a stuck or crashed document", lane=lane.index)
+            self._idle.put(lane)
+
+    def warm_up(self, timeout_seconds: float=30) -> int:
+        ## Spawn every worker and import PyMuPDF in it now, rather than on the first upload.
+        ## Returns how many workers answered.
+        lanes, submitted = [self._acquire(timeout_seconds)], []
+        self._acquire_more(lanes, self.max_workers)
+        try:
+            submitted = [(lane, lane.submit(pdf_worker.warm_up)) for lane in lanes]
+            done, _ = wait([future for _, future in submitted], timeout=timeout_seconds)
+            workers = sum(future.exception() is None for future in done)
+        finally:
+            self._release(lanes, submitted)
+        log.info("PDF extraction workers warmed up", workers=workers, max_workers=self.max_workers)
+        return workers
+
+    def _wait(self, futures, deadline: float, budget: float, stage: str):
+        ## Failures leave their futures for _release, which resets the lanes that need it
+        done, pending = wait(futures, timeout=max(0.0, deadline - time.time()), return_when=FIRST_EXCEPTION)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                continue
+            if isinstance(error, TimeoutError):
+                raise PdfExtractionError(f"PDF extraction exceeded {budget:g}s while {stage}")
+            if isinstance(error, BrokenProcessPool):
+                raise PdfExtractionError("PDF extraction worker crashed on this document")
+            raise PdfExtractionError(f"PDF could not be parsed: {error}")
+        if pending:
+            raise PdfExtractionError(f"PDF extraction exceeded {budget:g}s while {stage}")
+        return [future.result() for future in futures]
+
+    def extract(self, data: bytes, deadline_seconds: float=None) -> Tuple[str, dict]:
+        started = time.perf_counter()
+        budget = self.deadline_seconds
+        queue_timeout = self.queue_timeout_seconds
+        if deadline_seconds is not None:
+            ## the request's own deadline still answers 504 on time; this only bounds the worker
+            budget = max(self.min_deadline_seconds, min(budget, deadline_seconds))
+            ## nobody waits for the text once the request is over
+            queue_timeout = min(queue_timeout, max(self.min_deadline_seconds, deadline_seconds))
+        lanes = [self._acquire(queue_timeout)]
+        submitted: List[Tuple[WorkerLane, Future]] = []
+        try:
+            ## the budget covers extraction only, not the wait for a free worker
+            deadline = time.time() + budget
+            submitted.append((lanes[0], lanes[0].submit(pdf_worker.page_count, data)))
+            (page_count,) = self._wait([submitted[0][1]], deadline, budget, "opening the document")
+            if page_count > self.max_pages:
+                raise PdfExtractionError(f"PDF has {page_count} pages, the limit is {self.max_pages}")
+
+            ranges = [
+                (start, min(start + self.pages_per_chunk, page_count))
+                for start in range(0, page_count, self.pages_per_chunk)
+            ]
+            self._acquire_more(lanes, len(ranges))
+            chunk_futures = []
+            for number, (start, stop) in enumerate(ranges):
+                lane = lanes[number % len(lanes)]
+                future = lane.submit(pdf_worker.extract_page_range, data, start, stop, deadline, self.max_chars)
+                submitted.append((lane, future))
+                chunk_futures.append(future)
+            chunks = self._wait(chunk_futures, deadline, budget, "extracting pages")
+        finally:
+            self._release(lanes, submitted)
+
+        text_chunks = []
+        page_ms = []
+        total_chars = 0
+        truncated = False
+        for chunk in chunks:
+            for page_num, text, elapsed_ms in chunk:
+                if total_chars >= self.max_chars:
+                    truncated = True
+                    break
+                text = text[:self.max_chars - total_chars]
+                total_chars += len(text)
+                text_chunks.append(f"\n--- Page {page_num} ---\n{text}")
+                page_ms.append(round(elapsed_ms, 3))
+        truncated = truncated or len(text_chunks) < page_count
+
+        stats = {
+            "pages": page_count,
+            "pages_extracted": len(text_chunks),
+            "chunks": len(ranges),
+            "workers": len(lanes),
+            "chars": total_chars,
+            "truncated": truncated,
+            "page_ms": page_ms,
+            "slowest_page_ms": max(page_ms, default=0.0),
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        return "\n".join(text_chunks), stats
+
+    def settings_key(self) -> str:
+        ## The limits that shape the output text; text extracted under other limits is not reusable
+        return f"p{self.max_pages}-c{self.max_chars}"
+
+    def shutdown(self):
+        for lane in self._lanes:
+            lane.shutdown()
+
+
+## One extractor per process, sized from the `extraction` block of config.yaml
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_pdf_extractor() -> PdfExtractor:
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            config = load_config().get("extraction", {})
+            _extractor = PdfExtractor(
+                max_workers=config.get("max_workers", 2),
+                pages_per_chunk=config.get("pages_per_chunk", 8),
+                max_pages=config.get("max_pages", 30),
+                deadline_seconds=config.get("deadline_seconds", 10),
+                max_chars=config.get("max_chars", 100000),
+                queue_timeout_seconds=config.get("queue_timeout_seconds", 30),
+                min_deadline_seconds=config.get("min_deadline_seconds", 2),
+            )
+        return _extractor
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1], "rb") as f:
+        text, stats = get_pdf_extractor().extract(f.read())
+    print(text[:500])
+    print(stats)
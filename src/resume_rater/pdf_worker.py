@@ -0,0 +1,63 @@
+import os
+import time
+import signal
+
+## Runs inside extraction worker processes; keep imports minimal so spawned workers start fast.
+## fitz is imported on first use, so the parent process (which only submits these functions) never loads it.
+
+
+def warm_up() -> int:
+    ## Submitted to every worker at startup so the first document does not pay for spawning
+    ## the process and importing PyMuPDF; the pid tells the caller which workers are up
+    import fitz  # noqa: F401
+    return os.getpid()
+
+
+def ignore_interrupts():
+    ## Pool initializer for CLI runs: Ctrl-C reaches the whole process group, only the parent should handle it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def page_count(data: bytes) -> int:
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def extract_page_range(data: bytes, start: int, stop: int, deadline: float, max_chars: int) -> list:
+    ## Returns [(page_num, text, elapsed_ms)] for pages [start, stop), stopping early at the deadline or char budget
+    import fitz
+    pages = []
+    total_chars = 0
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for index in range(start, stop):
+            if time.time() > deadline:
+                raise TimeoutError(f"deadline reached before page {index + 1}")
+            page_start = time.perf_counter()
+            text = doc[index].get_text()
+            pages.append((index + 1, text, (time.perf_counter() - page_start) * 1000))
+            total_chars += len(text)
+            if total_chars >= max_chars:
+                break
+    return pages
+
+
+def extract_file(path: str, max_pages: int, max_chars: int, deadline_seconds: float) -> str:
+    ## Whole document in one worker, for bulk runs where documents (not pages) are the unit of parallelism.
+    ## Same `--- Page N ---` layout as ResumeHandler.read_pdf.
+    import fitz
+    deadline = time.time() + deadline_seconds
+    chunks = []
+    total_chars = 0
+    with fitz.open(path) as doc:
+        if doc.page_count > max_pages:
+            raise ValueError(f"PDF has {doc.page_count} pages, the limit is {max_pages}")
+        for index in range(doc.page_count):
+            if time.time() > deadline:
+                raise TimeoutError(f"PDF extraction exceeded {deadline_seconds}s at page {index + 1}")
+            text = doc[index].get_text()[:max_chars - total_chars]
+            total_chars += len(text)
+            chunks.append(f"\n--- Page {index + 1} ---\n{text}")
+            if total_chars >= max_chars:
+                break
+    return "\n".join(chunks)
@@ -182,19 +182,24 @@ class ResumeScorerApp {
         this.showProgressBar();
 
         try {
-            const response = await fetch('/rater', {
-                method: 'POST',
-                body: formData
-            });
+            // Stream sections as the model writes them; fall back to the blocking endpoint on old browsers
+            if (window.ReadableStream && window.TextDecoder) {
+                await this.streamAnalysis(formData);
+            } else {
+                const response = await fetch('/rater', {
+                    method: 'POST',
+                    body: formData
+                });
 
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
 
-            const result = await response.json();
-            this.currentSessionId = result.session_id;
-            
-            await this.displayResults(result.analysis_result);
+                const result = await response.json();
+                this.currentSessionId = result.session_id;
+
+                await this.displayResults(result.analysis_result);
+            }
             this.showToast('Resume analysis completed successfully!', 'success');
             
         } catch (error) {
@@ -207,6 +212,102 @@ class ResumeScorerApp {
         }
     }
 
+    async streamAnalysis(formData) {
+        const response = await fetch('/rater/stream', {
+            method: 'POST',
+            body: formData
+        });
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const partialResult = {};
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // SSE frames are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                this.handleStreamFrame(frame, partialResult);
+            }
+        }
+
+        this.animateResults();
+    }
+
+    handleStreamFrame(frame, partialResult) {
+        let event = 'message';
+        let data = '';
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            if (line.startsWith('data:')) data += line.slice(5).trim();
+        });
+        const payload = data ? JSON.parse(data) : {};
+
+        switch (event) {
+            case 'start':
+                this.currentSessionId = payload.session_id;
+                this.revealResults();
+                break;
+            case 'section':
+                partialResult[payload.key] = payload.value;
+                this.renderSection(payload.key, partialResult);
+                break;
+            case 'result':
+                Object.assign(partialResult, payload);
+                this.updateAdditionalContent(partialResult);
+                break;
+            case 'error':
+                throw new Error(payload.detail || 'Analysis failed');
+            default:
+                console.debug('Analysis status:', payload);
+        }
+    }
+
+    revealResults() {
+        const resultsSection = document.getElementById('resultsSection');
+        if (resultsSection) {
+            resultsSection.style.display = 'block';
+            resultsSection.classList.add('fade-in');
+        }
+
+        const sessionIdElement = document.getElementById('sessionId');
+        if (sessionIdElement) {
+            sessionIdElement.textContent = this.currentSessionId;
+        }
+    }
+
+    renderSection(key, partialResult) {
+        const sectionCharts = {
+            skills_match: { id: 'skillsChart', type: 'radar', prepare: r => this.prepareSkillsData(r), title: 'Skills Analysis' },
+            experience_match: { id: 'experienceChart', type: 'doughnut', prepare: r => this.prepareExperienceData(r), title: 'Experience Match' },
+            education_match: { id: 'educationChart', type: 'bar', prepare: r => this.prepareEducationData(r), title: 'Education Fit' },
+            job_compliance: { id: 'complianceChart', type: 'polarArea', prepare: r => this.prepareComplianceData(r), title: 'Job Compliance' }
+        };
+
+        if (key === 'overall_score') {
+            const scoreElement = document.getElementById('overallScore');
+            if (scoreElement) this.animateScore(scoreElement, partialResult.overall_score);
+        } else if (key === 'score_description') {
+            const descriptionElement = document.getElementById('scoreDescription');
+            if (descriptionElement) descriptionElement.textContent = partialResult.score_description;
+        } else if (sectionCharts[key]) {
+            const chart = sectionCharts[key];
+            this.createChart({ id: chart.id, type: chart.type, data: chart.prepare(partialResult), title: chart.title });
+        } else {
+            this.updateAdditionalContent(partialResult);
+        }
+    }
+
     showLoadingState(show) {
         const submitBtn = document.getElementById('submitBtn');
         const spinner = document.getElementById('loadingSpinner');
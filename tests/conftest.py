@@ -0,0 +1,61 @@
+###
+# Shared fixtures for the test suite, all offline:
+# 1. LLM calls go to the fake provider (LLM_PROVIDER=fake) with a short fixed latency
+# 2. Every cache, store and state file of the config points at a per-test temp directory
+# 3. PDF extraction runs in-process, so no worker processes are spawned
+# 4. The console log only shows warnings: the listener thread writes after pytest has closed a test's capture
+# Run from the repo root: python -m pytest -q
+import os
+os.environ["LLM_PROVIDER"] = "fake"
+import asyncio
+import pytest
+import yaml
+import fitz
+from logger.custom_logger import CustomLogger, set_console_level
+from benchmarks.load_bench import isolate_state
+CustomLogger().get_logger(__file__)
+set_console_level("WARNING")
+
+
+def write_test_config(workdir: str, latency_ms: int=50) -> str:
+    with open("config/config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["llm"]["fake"].update({"latency_ms": latency_ms, "jitter_ms": 0, "error_rate": 0.0})
+    isolate_state(config, workdir)
+    config["extraction"]["enabled"] = False
+    config["registry"]["reload_on_change"] = False
+    path = os.path.join(workdir, "config.yaml")
+    with open(path, "w") as file:
+        yaml.safe_dump(config, file)
+    return path
+
+
+def make_pdf(text: str) -> bytes:
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), text)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+@pytest.fixture
+def config_path(tmp_path) -> str:
+    return write_test_config(str(tmp_path))
+
+
+@pytest.fixture
+def registry(config_path):
+    from utils.llm_registry import LLMRegistry
+    registry = LLMRegistry(config_path)
+    yield registry
+    asyncio.run(registry.aclose())
+
+
+@pytest.fixture
+def app(registry):
+    ## httpx.ASGITransport does not run the lifespan hook, so the registry is set up here
+    from api.main import app
+    app.state.registry = registry
+    app.state.ready = True
+    return app
@@ -0,0 +1,52 @@
+import time
+import asyncio
+import statistics
+import httpx
+from tests.conftest import make_pdf, write_test_config
+from tests.test_registry import RESUME, JOB
+
+LLM_LATENCY_MS = 500
+
+
+async def health_latencies(client: httpx.AsyncClient, count: int) -> list:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/health")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def health_under_load(app, requests: int) -> tuple:
+    pdf = make_pdf(RESUME)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=60) as client:
+        idle = await health_latencies(client, 20)
+        scoring = [asyncio.create_task(client.post(
+            "/rater", files={"resume": (f"cv{i}.pdf", pdf, "application/pdf")},
+            data={"job_description": f"{JOB} Posting {i}", "use_cache": "false"},
+        )) for i in range(requests)]
+        await asyncio.sleep(0.05)
+        busy = await health_latencies(client, 20)
+        in_flight = sum(not task.done() for task in scoring)
+        responses = await asyncio.gather(*scoring)
+    return idle, busy, in_flight, responses
+
+
+def test_health_stays_flat_while_scoring(tmp_path, monkeypatch):
+    ## every /rater call spends LLM_LATENCY_MS in the fake LLM; a blocking step would hold /health that long
+    from utils.llm_registry import LLMRegistry
+    from api.main import app
+    registry = LLMRegistry(write_test_config(str(tmp_path), latency_ms=LLM_LATENCY_MS))
+    monkeypatch.setattr(app.state, "registry", registry, raising=False)
+    monkeypatch.setattr(app.state, "ready", True, raising=False)
+    try:
+        idle, busy, in_flight, responses = asyncio.run(health_under_load(app, 32))
+    finally:
+        asyncio.run(registry.aclose())
+    assert [response.status_code for response in responses] == [200] * 32
+    assert in_flight > 0
+    ## parsing 32 uploads and their logging still share the loop, so allow some jitter but nothing near one LLM call
+    assert max(busy) < LLM_LATENCY_MS / 1000 / 2
+    assert statistics.median(busy) < statistics.median(idle) + 0.05
@@ -0,0 +1,39 @@
+import os
+from utils.blob_store import BlobStore
+from src.resume_rater.data_ingestion import ResumeHandler
+from tests.conftest import make_pdf
+
+
+class CountingExtractor:
+    ## Stands in for PdfExtractor: text cut to max_chars, and a count of real extractions
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.calls = 0
+
+    def settings_key(self) -> str:
+        return f"p30-c{self.max_chars}"
+
+    def extract(self, data: bytes, deadline_seconds: float=None):
+        self.calls += 1
+        text = "Jane Candidate, Senior Data Engineer"[:self.max_chars]
+        return text, {"pages": 1, "truncated": self.max_chars < 36}
+
+
+def test_text_cut_by_other_limits_is_not_reused(tmp_path):
+    store = BlobStore(str(tmp_path / "uploads"))
+    data = make_pdf("Jane Candidate, Senior Data Engineer")
+    digest = store.put(data)
+
+    small = CountingExtractor(max_chars=10)
+    handler = ResumeHandler(data_dir=str(tmp_path), extractor=small, blob_store=store)
+    assert handler.read_blob(digest, data) == "Jane Candi"
+    assert handler.read_blob(digest, data) == "Jane Candi" and small.calls == 1
+
+    large = CountingExtractor(max_chars=1000)
+    handler = ResumeHandler(data_dir=str(tmp_path), extractor=large, blob_store=store)
+    assert handler.read_blob(digest, data) == "Jane Candidate, Senior Data Engineer"
+    assert large.calls == 1
+
+    ## removing the blob removes every text variant
+    store._remove_files(digest)
+    assert not os.path.exists(os.path.dirname(store.path(digest)))
@@ -0,0 +1,19 @@
+import json
+from src.resume_rater.cli import Checkpoint
+
+
+def test_checkpoint_drops_a_partial_last_line(tmp_path):
+    path = str(tmp_path / "scores.checkpoint.jsonl")
+    checkpoint = Checkpoint(path, "job")
+    checkpoint.add({"key": "a.pdf", "status": "ok"})
+    checkpoint.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"key": "b.pdf", "sta')
+
+    checkpoint = Checkpoint(path, "job")
+    assert set(checkpoint.records) == {"a.pdf"}
+    checkpoint.add({"key": "b.pdf", "status": "ok"})
+    checkpoint.close()
+    with open(path, "r", encoding="utf-8") as file:
+        keys = [json.loads(line).get("key") for line in file]
+    assert keys == [None, "a.pdf", "b.pdf"]
@@ -0,0 +1,18 @@
+from src.resume_rater.compaction import dedupe_page_boilerplate
+
+
+def pages(*bodies: str) -> str:
+    return "".join(f"\n--- Page {number} ---\n{body}" for number, body in enumerate(bodies, 1))
+
+
+def test_repeated_edge_lines_survive_in_the_body():
+    ## "Python" sits in the header of both pages and in the body of both pages
+    text = pages(
+        "Jane Candidate\nPython\nExperience\nSenior Data Engineer\nPython\nKafka and Spark\nAirflow\nLeeds\nPage 1",
+        "Jane Candidate\nPython\nEducation\nBSc Computer Science\n2019\nSkills\nPython\nSQL\ndbt\nLondon\nPage 2",
+    )
+    first, second = dedupe_page_boilerplate(text).split("--- Page 2 ---")
+    assert "Jane Candidate" not in first and "Jane Candidate" not in second
+    assert first.count("Python") == 1 and second.count("Python") == 1
+    assert "\nPage 1" not in first and "\nPage 2" not in second
+    assert "2019" in second
@@ -0,0 +1,16 @@
+import os
+from benchmarks.import_budget import LAZY_MODULES, measure
+
+## same default as benchmarks/import_budget.py; raise it with IMPORT_BUDGET_MS on slower runners
+BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 2500))
+
+
+def test_api_import_within_budget():
+    runs = [measure("api.main") for _ in range(3)]
+    best = min(runs, key=lambda modules: modules["api.main"][1])
+    assert best["api.main"][1] / 1000 < BUDGET_MS
+
+
+def test_heavy_modules_load_on_first_use():
+    modules = measure("api.main")
+    assert sorted(name for name in modules if name.split(".")[0] in LAZY_MODULES) == []
@@ -0,0 +1,22 @@
+from src.resume_rater.lite_scorer import LiteScorer
+
+
+def matched(scorer: LiteScorer, text: str) -> set:
+    return {scorer.names[index] for index in scorer._skill_counts(text.lower()).nonzero()[0]}
+
+
+def test_headings_and_common_words_are_not_skills():
+    scorer = LiteScorer()
+    text = "Education\nBSc Computer Science\nTesting, security, monitoring and streaming of networking events"
+    assert matched(scorer, text) == set()
+
+
+def test_common_word_entries_match_their_synonyms():
+    scorer = LiteScorer()
+    text = "Skills: pytest, OWASP, Grafana, Kafka stream processing, edtech"
+    assert {"Testing", "Security", "Monitoring", "Streaming", "Education"} <= matched(scorer, text)
+
+
+def test_custom_skill_without_synonyms_matches_its_name():
+    scorer = LiteScorer({"Technical Skills": {"Dagster": []}})
+    assert matched(scorer, "Orchestration with Dagster") == {"Dagster"}
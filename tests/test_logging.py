@@ -0,0 +1,15 @@
+import logging
+from logger.custom_logger import CustomLogger
+from benchmarks.logging_bench import one_request, open_log_files
+
+REQUESTS = 10000
+
+
+def test_handler_count_constant_after_10k_requests():
+    CustomLogger().get_logger(__file__)
+    root = logging.getLogger()
+    handlers_before, files_before = list(root.handlers), open_log_files()
+    for request_id in range(REQUESTS):
+        one_request(request_id)
+    assert root.handlers == handlers_before
+    assert open_log_files() == files_before
@@ -0,0 +1,37 @@
+import asyncio
+from benchmarks.profile_bench import RESUMES, JOBS, run
+from src.resume_rater.data_analisis import ResumeAnalyzer
+
+
+def test_profile_path_scores_with_fewer_input_tokens(registry):
+    ## the fake model scores by prompt hash, so scores are only checked for shape here;
+    ## agreement between the paths is for profile_bench against a real provider
+    analyzer = ResumeAnalyzer(registry=registry)
+
+    async def compare():
+        ## profiles cached up front, as for a resume scored against many postings
+        for resume in RESUMES.values():
+            await analyzer.aextract_profile(resume)
+        return await run(registry, RESUMES, JOBS)
+    rows, usage = asyncio.run(compare())
+    scores = {}
+    for path, resume_name, job_name, score in rows:
+        scores.setdefault((resume_name, job_name), {})[path] = score
+    assert len(scores) == len(RESUMES) * len(JOBS)
+    for pair in scores.values():
+        assert set(pair) == {"raw", "profile"}
+        assert all(0 <= score <= 100 for score in pair.values())
+    (raw_input, _), (profile_input, _) = usage["raw"], usage["profile"]
+    assert 0 < profile_input < raw_input
+
+
+def test_profile_is_extracted_once_per_resume(registry):
+    analyzer = ResumeAnalyzer(registry=registry)
+    resume = RESUMES["data_engineer"]
+
+    async def extract_twice():
+        return await analyzer.aextract_profile(resume), await analyzer.aextract_profile(resume)
+    first, second = asyncio.run(extract_twice())
+    assert first == second
+    stats = registry.profile_cache.stats()
+    assert stats["misses"] == 1 and stats["memory_hits"] + stats["disk_hits"] == 1
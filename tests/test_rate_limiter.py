@@ -0,0 +1,39 @@
+from utils.rate_limiter import is_throttle_error
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class ResourceExhausted(Exception):
+    code = 429
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+def wrapped(error: Exception) -> Exception:
+    ## the way langchain provider wrappers re-raise SDK errors
+    try:
+        try:
+            raise error
+        except Exception as inner:
+            raise RuntimeError("Error calling model") from inner
+    except RuntimeError as outer:
+        return outer
+
+
+def test_throttles_are_found_by_status_or_type():
+    assert is_throttle_error(RateLimitError("slow down"))
+    assert is_throttle_error(wrapped(ResourceExhausted("resource exhausted")))
+    assert is_throttle_error(wrapped(ServiceUnavailable("try again later")))
+
+
+def test_messages_mentioning_codes_are_not_throttles():
+    assert not is_throttle_error(BadRequestError("quota field is invalid: expected 429 or 503"))
+    assert not is_throttle_error(ValueError("Output failed validation: 503 is not a valid overall_score"))
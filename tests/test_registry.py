@@ -0,0 +1,27 @@
+import asyncio
+import httpx
+from tests.conftest import make_pdf
+
+RESUME = "Jane Candidate - Data Engineer. Skills: Python, SQL, Kafka, Spark. BSc Computer Science 2016."
+JOB = "Data Engineer. Requirements: 3+ years Python, SQL and Kafka."
+
+
+async def post_resumes(app, count: int) -> list:
+    pdf = make_pdf(RESUME)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.post("/rater", files={"resume": (f"cv{i}.pdf", pdf, "application/pdf")},
+                        data={"job_description": JOB, "use_cache": "false"})
+            for i in range(count)
+        ))
+
+
+def test_one_client_per_provider_across_requests(app, registry):
+    responses = asyncio.run(post_resumes(app, 20))
+    assert [response.status_code for response in responses] == [200] * 20
+    assert dict(registry.clients_built) == {"fake": 1}
+
+
+def test_chains_are_reused(registry):
+    assert registry.get_chain("resume_analysis") is registry.get_chain("resume_analysis")
+    assert registry.get_format_instructions("resume_analysis") is registry.get_format_instructions("resume_analysis")
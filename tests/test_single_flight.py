@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from utils.single_flight import SingleFlight
+from utils.deadline import current_deadline, start_deadline
+from utils.metrics import start_request_timings
+from exception.custom_exception import DeadlineExceededException
+
+
+def test_each_caller_keeps_its_own_deadline():
+    flight = SingleFlight("test")
+    seen = []
+
+    async def work():
+        seen.append(current_deadline())
+        await asyncio.sleep(0.3)
+        return "done"
+
+    async def caller(seconds: float):
+        start_deadline(seconds)
+        timings = start_request_timings()
+        return await flight.do("key", work), timings
+
+    async def main():
+        ## the leader has the shortest budget; the work must outlive it for the follower
+        leader = asyncio.create_task(caller(0.1))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(caller(5))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(main())
+    assert isinstance(leader, DeadlineExceededException) and leader.stage == "test"
+    result, timings = follower
+    assert result == "done" and [stage for stage, _ in timings] == ["test"]
+    assert seen == [None]
+
+
+def test_work_is_cancelled_when_every_caller_leaves():
+    flight = SingleFlight("test")
+
+    async def main():
+        started = asyncio.Event()
+        stopped = []
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.append(True)
+                raise
+
+        start_deadline(0.1)
+        with pytest.raises(DeadlineExceededException):
+            await flight.do("key", work)
+        await asyncio.sleep(0)
+        return started.is_set(), stopped, flight.in_flight()
+
+    assert asyncio.run(main()) == (True, [True], 0)
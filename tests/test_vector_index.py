@@ -0,0 +1,35 @@
+from utils.vector_index import VectorIndex
+
+RESUMES = {
+    "k1": "Data engineer: Python, Spark, Kafka, Airflow pipelines",
+    "k2": "Data engineer: SQL, dbt, Snowflake and Airflow",
+}
+
+
+def test_workers_sharing_an_index_path_see_every_resume(tmp_path):
+    path = str(tmp_path / "resumes.faiss")
+    worker_a, worker_b = VectorIndex(path, dimensions=256), VectorIndex(path, dimensions=256)
+    (k1_id,) = worker_a.add([("k1", RESUMES["k1"], None)])
+    ids = worker_b.add([(key, text, None) for key, text in RESUMES.items()])
+    assert ids[0] == k1_id
+    found = {doc_id for doc_id, _ in worker_b.search("Python Spark data engineer", k=10, restrict_to=ids)}
+    assert found == set(ids)
+    worker_a.close()
+    worker_b.close()
+
+
+def test_rows_added_after_the_last_save_are_embedded_again(tmp_path):
+    path = str(tmp_path / "resumes.faiss")
+    index = VectorIndex(path, dimensions=256)
+    (k1_id,) = index.add([("k1", RESUMES["k1"], None)])
+    index.save()
+    ## k2 reaches the sidecar, then the process dies before the next save
+    index.add([("k2", RESUMES["k2"], None)])
+    index._conn.close()
+
+    restarted = VectorIndex(path, dimensions=256)
+    assert len(restarted) == 1
+    ids = restarted.add([(key, text, None) for key, text in RESUMES.items()])
+    assert ids[0] == k1_id and len(restarted) == 2
+    assert {doc_id for doc_id, _ in restarted.search("Snowflake dbt", k=10, restrict_to=ids)} == set(ids)
+    restarted.close()
@@ -0,0 +1,235 @@
+import os
+import glob
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from typing import List, Optional
+from utils.metrics import metrics
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+BLOB_WRITES = metrics.counter("resume_rater_upload_blobs_total", "Stored uploads; duplicate means the content was already kept", ("outcome",))
+TEXT_CACHE = metrics.counter("resume_rater_upload_text_cache_total", "Extracted text lookups next to stored uploads", ("outcome",))
+GC_DELETED = metrics.counter("resume_rater_upload_gc_deleted_total", "Blobs and legacy session directories removed by the collector", ("reason",))
+
+
+def _write_atomic(path: str, data: bytes):
+    ## unique temp name: two requests storing the same new upload must not interleave writes
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class BlobStore:
+    ###
+    # Content-addressed storage for uploaded resumes:
+    # 1. Each PDF is kept once under root/ab/cd/<sha256>.pdf, however many times it is uploaded
+    # 2. Its extracted text is kept next to it (<sha256>.<settings>.txt), so re-uploads never reach PyMuPDF;
+    #    the extraction settings are part of the name, text cut by other page / char limits is never served
+    # 3. A SQLite index records blob sizes and last use, and which blobs each session uploaded
+    # 4. A background collector removes blobs unused for max_age_seconds, then the least recently
+    #    used ones until the store is under max_total_bytes; blobs used within grace_seconds are
+    #    never removed. It also clears the old per-session upload directories.
+    # A blob is touched in the index before its file is checked or written, and the collector only
+    # deletes rows (then files) that are still stale under the same lock, so a concurrent upload
+    # never loses its file.
+
+    def __init__(self, root: str, index_path: str=None, max_age_seconds: float=30 * 24 * 3600,
+                 max_total_bytes: int=2 * 1024 ** 3, grace_seconds: float=600, gc_interval_seconds: float=600,
+                 legacy_dir: str=None):
+        self.root = root
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self.grace_seconds = grace_seconds
+        self.gc_interval_seconds = gc_interval_seconds
+        self.legacy_dir = legacy_dir
+        os.makedirs(root, exist_ok=True)
+        self._conn = sqlite3.connect(index_path or os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs(last_used_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT NOT NULL, digest TEXT NOT NULL, "
+            "filename TEXT, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_session ON sessions(session_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_digest ON sessions(digest)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._collector = None
+
+    def path(self, digest: str) -> str:
+        ## two levels of 256 shards keep directories small at millions of blobs
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.pdf")
+
+    def text_path(self, digest: str, settings: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.{settings}.txt")
+
+    def digest_of(self, path: str) -> Optional[str]:
+        ## The digest of a path returned by path(), None for files outside the store
+        if os.path.dirname(os.path.abspath(path)).startswith(os.path.abspath(self.root)) and path.endswith(".pdf"):
+            return os.path.basename(path)[:-len(".pdf")]
+        return None
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO blobs (digest, size, created_at, last_used_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET last_used_at = excluded.last_used_at",
+                (digest, len(data), now, now),
+            )
+            self._conn.commit()
+        path = self.path(digest)
+        if os.path.exists(path):
+            BLOB_WRITES.inc(outcome="duplicate")
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+        BLOB_WRITES.inc(outcome="new")
+        return digest
+
+    def link(self, session_id: str, digest: str, filename: str=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, digest, filename, created_at) VALUES (?, ?, ?, ?)",
+                (session_id, digest, filename, time.time()),
+            )
+            self._conn.commit()
+
+    def session_blobs(self, session_id: str) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT digest, filename, created_at FROM sessions WHERE session_id = ? ORDER BY created_at", (session_id,)
+            ).fetchall()
+        return [{"digest": digest, "filename": filename, "path": self.path(digest), "created_at": created_at}
+                for digest, filename, created_at in rows]
+
+    def get_text(self, digest: str, settings: str) -> Optional[str]:
+        try:
+            with open(self.text_path(digest, settings), "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            TEXT_CACHE.inc(outcome="miss")
+            return None
+        TEXT_CACHE.inc(outcome="hit")
+        return text
+
+    def put_text(self, digest: str, text: str, settings: str):
+        path = self.text_path(digest, settings)
+        if os.path.exists(path):
+            return
+        data = text.encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+        with self._lock:
+            self._conn.execute("UPDATE blobs SET size = size + ? WHERE digest = ?", (len(data), digest))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            blobs, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            (sessions,) = self._conn.execute("SELECT COUNT(DISTINCT session_id) FROM sessions").fetchone()
+        return {"blobs": blobs, "bytes": total, "max_bytes": self.max_total_bytes, "sessions": sessions}
+
+    def _remove_files(self, digest: str):
+        ## every text variant, including <sha256>.txt files from before settings were part of the name
+        texts = glob.glob(os.path.join(glob.escape(os.path.dirname(self.path(digest))), f"{digest}*.txt"))
+        for path in [self.path(digest), *texts]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        ## drop emptied shard directories, the root stays
+        shard = os.path.dirname(self.path(digest))
+        for directory in (shard, os.path.dirname(shard)):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+
+    def _delete(self, digests: List[str], cutoff: float) -> int:
+        ## Rows touched since they were picked (a concurrent upload) survive the re-check
+        deleted = 0
+        with self._lock:
+            for digest in digests:
+                cursor = self._conn.execute("DELETE FROM blobs WHERE digest = ? AND last_used_at < ?", (digest, cutoff))
+                if cursor.rowcount:
+                    self._conn.execute("DELETE FROM sessions WHERE digest = ?", (digest,))
+                    self._remove_files(digest)
+                    deleted += 1
+            self._conn.commit()
+        return deleted
+
+    def collect(self) -> dict:
+        now = time.time()
+        age_cutoff = now - self.max_age_seconds
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute("SELECT digest FROM blobs WHERE last_used_at < ?", (age_cutoff,))]
+        expired_count = self._delete(expired, age_cutoff)
+
+        grace_cutoff = now - self.grace_seconds
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            candidates = self._conn.execute(
+                "SELECT digest, size FROM blobs WHERE last_used_at < ? ORDER BY last_used_at", (grace_cutoff,)
+            ).fetchall() if total > self.max_total_bytes else []
+        evict = []
+        for digest, size in candidates:
+            if total <= self.max_total_bytes:
+                break
+            evict.append(digest)
+            total -= size
+        evicted_count = self._delete(evict, grace_cutoff)
+
+        legacy_count = self._collect_legacy(age_cutoff)
+        GC_DELETED.inc(expired_count, reason="age")
+        GC_DELETED.inc(evicted_count, reason="size")
+        GC_DELETED.inc(legacy_count, reason="legacy_session")
+        report = {"expired": expired_count, "evicted": evicted_count, "legacy_sessions": legacy_count}
+        if any(report.values()):
+            log.info("Upload store collected", **report)
+        return report
+
+    def _collect_legacy(self, cutoff: float) -> int:
+        ## session_<timestamp>_<id>/ directories written before uploads were content-addressed
+        if not self.legacy_dir or not os.path.isdir(self.legacy_dir):
+            return 0
+        removed = 0
+        for entry in os.scandir(self.legacy_dir):
+            if entry.is_dir() and entry.name.startswith("session_") and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _collect_loop(self):
+        while True:
+            try:
+                self.collect()
+            except Exception as e:
+                log.error("Upload store collection failed", error=str(e))
+            if self._stop.wait(self.gc_interval_seconds):
+                return
+
+    def start_collector(self):
+        ## Daemon thread: collection is file system and SQLite work, it never runs on the event loop
+        if self._collector is None:
+            self._stop.clear()
+            self._collector = threading.Thread(target=self._collect_loop, name="blob-gc", daemon=True)
+            self._collector.start()
+
+    def close(self):
+        self._stop.set()
+        if self._collector is not None:
+            self._collector.join(timeout=5)
+            self._collector = None
+        with self._lock:
+            self._conn.close()
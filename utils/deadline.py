@@ -0,0 +1,113 @@
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+from exception.custom_exception import DeadlineExceededException, ClientDisconnectedException
+
+
+class Deadline:
+    ###
+    # Time budget of one request (or one batch item / queued job), shared by every stage it runs:
+    # 1. Started once from the `deadlines` config block or the caller's deadline_seconds
+    # 2. Stages that wait outside the event loop (PDF workers, job page fetches) cap their own
+    #    limits with bound(), so nothing outlives the request
+    # 3. span() reports stages as they start and end: the stage that ran out of time is the first
+    #    to end after expiry, or else the innermost one still running
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.expired_stage = None
+        self.active_stages = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def bound(self, seconds: float) -> float:
+        return min(seconds, self.remaining())
+
+    def stage_started(self, stage: str):
+        self.active_stages.append(stage)
+
+    def stage_finished(self, stage: str):
+        if self.expired_stage is None and self.expired():
+            self.expired_stage = stage
+        if stage in self.active_stages:
+            self.active_stages.remove(stage)
+
+    def exceeded(self) -> DeadlineExceededException:
+        stage = self.expired_stage or (self.active_stages[-1] if self.active_stages else "request")
+        return DeadlineExceededException(f"Deadline of {self.seconds:g}s exceeded during {stage}", stage)
+
+
+## Deadline of the running request; asyncio tasks and to_thread calls inherit it, run_in_executor does not
+_current_deadline: ContextVar = ContextVar("request_deadline", default=None)
+
+
+def budget_seconds(config: dict, requested: float=None, key: str="request_seconds") -> Optional[float]:
+    ## Budget from the `deadlines` block; callers may ask for any budget up to max_seconds. None: no deadline
+    deadlines = config.get("deadlines", {})
+    if not deadlines.get("enabled", False):
+        return None
+    seconds = requested or deadlines.get(key, 60)
+    return min(seconds, deadlines.get("max_seconds", 300))
+
+
+def start_deadline(seconds: Optional[float]) -> Optional[Deadline]:
+    deadline = Deadline(seconds) if seconds else None
+    _current_deadline.set(deadline)
+    return deadline
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def remaining_seconds() -> Optional[float]:
+    ## For work handed to threads or processes, which do not see the context variable
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def bounded(seconds: float) -> float:
+    ## A stage's own limit, cut to what is left of the current deadline
+    deadline = _current_deadline.get()
+    return seconds if deadline is None else deadline.bound(seconds)
+
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def run_with_deadline(coro: Awaitable, deadline: Optional[Deadline],
+                            is_disconnected: Callable[[], Awaitable[bool]]=None, poll_seconds: float=0.5) -> Any:
+    ## Run coro as a task and cancel it once the deadline passes or is_disconnected() says the client left.
+    ## Start the deadline before creating coro's task so the task sees it. A failure after expiry
+    ## (a stage's own bounded timeout firing) is reported as the deadline, not as the stage's error.
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            timeout = poll_seconds if is_disconnected is not None else None
+            if deadline is not None:
+                timeout = deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if done:
+                if not task.cancelled() and task.exception() is not None and deadline is not None and deadline.expired():
+                    raise deadline.exceeded() from task.exception()
+                return task.result()
+            if deadline is not None and deadline.expired():
+                await _cancel(task)
+                raise deadline.exceeded()
+            if is_disconnected is not None and await is_disconnected():
+                await _cancel(task)
+                raise ClientDisconnectedException("Client disconnected before the response was ready")
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
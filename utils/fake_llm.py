@@ -0,0 +1,119 @@
+import time
+import json
+import random
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+## Characters per streamed chunk, roughly what providers send per SSE event
+STREAM_CHUNK_CHARS = 40
+
+
+class FakeJSONChatModel(BaseChatModel):
+    ###
+    # Offline stand-in for the provider clients, selected with `provider: "fake"` in config.yaml:
+    # 1. Sleeps for a configurable latency (with jitter) instead of calling an API
+    # 2. Answers with valid ResumeRater JSON for scoring prompts, ResumeProfile JSON for profile
+    #    extraction and JobDescription JSON otherwise
+    # 3. Reports token usage the way real providers do, so metrics and rate limits see traffic
+    # 4. Fails a configurable fraction of calls, to exercise routing and retries
+    # Scores are derived from a hash of the prompt, so different resumes rank differently.
+
+    model_name: str = "fake-json"
+    latency_seconds: float = 0.5
+    jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-json"
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency_seconds + random.uniform(-self.jitter_seconds, self.jitter_seconds))
+
+    def _maybe_fail(self):
+        if self.error_rate and random.random() < self.error_rate:
+            raise RuntimeError(f"Injected failure from fake model {self.model_name}")
+
+    @staticmethod
+    def _payload(prompt: str) -> dict:
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        if "overall_score" in prompt:
+            score = 40 + seed % 56
+            return {
+                "overall_score": score,
+                "score_description": "Synthetic score from the offline benchmark model",
+                "skills_match": {"Technical Skills": score, "Soft Skills": 70, "Industry Knowledge": 60},
+                "experience_match": {"Relevant Experience": score, "Leadership Experience": 55, "Project Management": 60},
+                "education_match": {"Degree Level": 80, "Field of Study": 75, "Certifications": 50},
+                "job_compliance": {"Required Skills": score, "Experience Level": 70, "Education Requirements": 80},
+                "additional_points": ["Relevant project experience"],
+                "improvements": ["Quantify achievements", "Add missing cloud certifications"],
+            }
+        if "years_experience" in prompt:
+            return {
+                "headline": "Senior Data Engineer",
+                "years_experience": 3 + seed % 10,
+                "skills": ["Python", "SQL", "Kafka", "Spark"],
+                "roles": [{"title": "Data Engineer", "company": "Example Corp", "start_date": "2019",
+                           "end_date": "present", "highlights": ["Built streaming pipelines"]}],
+                "education": [{"degree": "BSc Computer Science", "institution": "Example University", "year": "2018"}],
+                "certifications": [],
+            }
+        return {
+            "title": f"Software Engineer {seed % 100}",
+            "company": "Example Corp",
+            "location": "Remote",
+            "description": ["Build and operate backend services"],
+            "requirements": ["Python", "SQL", "3+ years of experience"],
+        }
+
+    def _message(self, messages: List[BaseMessage]) -> AIMessage:
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = json.dumps(self._payload(prompt))
+        input_tokens, output_tokens = len(prompt) // 4, len(content) // 4
+        return AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]]=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]]=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages))])
+
+    def _chunks(self, messages: List[BaseMessage]):
+        self._maybe_fail()
+        message = self._message(messages)
+        content = message.content
+        pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        for index, piece in enumerate(pieces):
+            usage = message.usage_metadata if index == len(pieces) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]]=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        chunks = list(self._chunks(messages))
+        delay = self._delay() / max(1, len(chunks))
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]]=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = list(self._chunks(messages))
+        delay = self._delay() / max(1, len(chunks))
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+
+
+if __name__ == "__main__":
+    llm = FakeJSONChatModel(latency_seconds=0.1)
+    print(llm.invoke("Return overall_score as JSON").content)
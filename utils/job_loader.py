@@ -1,15 +1,14 @@
 from model.models import *
-from langchain_core.output_parsers import JsonOutputParser
-from prompt.prompt_library import PROMPT_REGISTRY
-import requests
-from bs4 import BeautifulSoup
-from utils.model_loader import ModelLoader
+from utils.llm_registry import LLMRegistry
+from utils.job_store import canonical_url
+from utils.metrics import span
 from logger.custom_logger import CustomLogger
 from exception.custom_exception import ResumeAnalysisException
 log = CustomLogger().get_logger(__name__)
 import sys
 import re
 import json
+import asyncio
 
 class JobLoader:
     ###
@@ -18,13 +17,16 @@ class JobLoader:
     # 2. Fetching and cleaning job description text from the URL
     # 3. Using an LLM + LangChain to convert it into a structured JobDescription object
     
-    def __init__(self):
-        self.model_loader = ModelLoader()
-        self.llm = self.model_loader.load_llm()
+    def __init__(self, registry: LLMRegistry=None):
+        # Reuse the caller's registry so llm clients are not built twice
+        self.registry = registry or LLMRegistry()
+        self.llm = self.registry.get_llm()
         log.info("JobLoader initialized with LLM")
-        self.parser=JsonOutputParser(pydantic_object=JobDescription)
-        # Load prompt template for job description extraction
-        self.prompt = PROMPT_REGISTRY["job_description"]
+        self.parser=self.registry.get_parser("job_description")
+        # Compiled prompt | llm | parser chain for job description extraction
+        self.chain = self.registry.get_chain("job_description")
+        # Pooled, timeout-bounded fetcher backed by the job posting store
+        self.fetcher = self.registry.job_fetcher
 
     def url_extractor(self, text: str) -> str:
         pattern = r'(https?://\S+)'
@@ -40,31 +42,82 @@ class JobLoader:
     def load_job_url(self, url: str) -> str:
         # Exact the url and return str, else, return None, and log the error
         try:
-            html = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}).text
-            text = BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+            with span("job_fetch"):
+                html, _ = self.fetcher.fetch_sync(url)
+            text = self._html_to_text(html, url)
             log.info("Job url loaded successfully", url=url)
             return text
         except Exception as e:
             log.error("Failed to load job description", url=url, error=str(e))
             raise ResumeAnalysisException("Failed to load job description", sys) from e
 
-    def extract_job_details(self, job_text: str) -> str:
-        chain = self.prompt | self.llm | self.parser
+    async def aload_job_url(self, url: str) -> str:
+        # Same as load_job_url, on the pooled async client; html parsing runs in a thread
+        try:
+            with span("job_fetch"):
+                html, _ = await self.fetcher.fetch(url)
+            text = await asyncio.to_thread(self._html_to_text, html, url)
+            log.info("Job url loaded successfully", url=url)
+            return text
+        except Exception as e:
+            log.error("Failed to load job description", url=url, error=str(e))
+            raise ResumeAnalysisException("Failed to load job description", sys) from e
+
+    async def aresolve_url(self, url: str) -> str:
+        # Return the JobDescription JSON for a url, skipping the fetch and/or the LLM call when the store allows.
+        # Concurrent requests for the same posting share one fetch + extraction.
+        return await self.registry.coalesce("job_url", canonical_url(url), lambda: self._aresolve_url(url))
 
+    async def _aresolve_url(self, url: str) -> str:
+        store = self.fetcher.store
+        with span("job_store_lookup"):
+            parsed = await asyncio.to_thread(store.get_parsed, url)
+        if parsed is not None:
+            log.info("Job posting served from store", url=url)
+            return parsed
         try:
-            response = chain.invoke({
-                "job_text":job_text,
-                "format_instructions": self.parser.get_format_instructions(),
-            })
+            with span("job_fetch"):
+                html, changed = await self.fetcher.fetch(url)
+        except Exception as e:
+            log.error("Failed to load job description", url=url, error=str(e))
+            raise ResumeAnalysisException("Failed to load job description", sys) from e
+        if not changed:
+            parsed = await asyncio.to_thread(store.get_parsed, url, True)
+            if parsed is not None:
+                await asyncio.to_thread(store.refresh_parsed, url)
+                log.info("Job posting revalidated, reusing parsed details", url=url)
+                return parsed
+        job_text = await asyncio.to_thread(self._html_to_text, html, url)
+        parsed = await self.aextract_job_details(job_text)
+        await asyncio.to_thread(store.save_parsed, url, parsed)
+        return parsed
+
+    def _html_to_text(self, html: str, url: str=None) -> str:
+        # Main content only: scripts, nav bars, cookie banners and footers never reach the LLM
+        with span("job_html_compact"):
+            text, report = self.registry.get_compactor("job_html").compact(html)
+        log.info("Job page compacted", url=url, **report)
+        return text
+
+    @staticmethod
+    def _to_dict(response) -> dict:
+        # Convert Pydantic object to dictionary safely
+        if hasattr(response, 'dict'):
+            return response.dict()
+        elif hasattr(response, '__dict__'):
+            return response.__dict__
+        return response
+
+    def extract_job_details(self, job_text: str) -> str:
+        try:
+            with span("job_extract"):
+                response = self.chain.invoke({
+                    "job_text":job_text,
+                    "format_instructions": self.registry.get_format_instructions("job_description"),
+                })
             log.info("Job details extracted successfully")
 
-            # Convert Pydantic object to dictionary safely
-            if hasattr(response, 'dict'):
-                response_dict = response.dict()
-            elif hasattr(response, '__dict__'):
-                response_dict = response.__dict__
-            else:
-                response_dict = response
+            response_dict = self._to_dict(response)
 
             log.info("Job extraction successful", keys=list(response_dict.keys()) if isinstance(response_dict, dict) else 'Not a dict')
             
@@ -73,6 +126,20 @@ class JobLoader:
             log.error("Failed to extract job details", error=str(e))
             raise ResumeAnalysisException("Failed to extract job details", sys) from e
 
+    async def aextract_job_details(self, job_text: str) -> str:
+        try:
+            with span("job_extract"):
+                response = await self.registry.ainvoke("job_description", {
+                    "job_text":job_text,
+                    "format_instructions": self.registry.get_format_instructions("job_description"),
+                })
+            response_dict = self._to_dict(response)
+            log.info("Job extraction successful", keys=list(response_dict.keys()) if isinstance(response_dict, dict) else 'Not a dict')
+            return json.dumps(response_dict)
+        except Exception as e:
+            log.error("Failed to extract job details", error=str(e))
+            raise ResumeAnalysisException("Failed to extract job details", sys) from e
+
 
 if __name__ == "__main__":
     job_loader = JobLoader()
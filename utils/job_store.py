@@ -0,0 +1,241 @@
+import os
+import time
+import sqlite3
+import hashlib
+import asyncio
+import threading
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import httpx
+from utils.deadline import bounded
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+## Query parameters that never change the posting itself. Exact names only: prefixes would also drop
+## real identifiers such as refId, reference or srcid. utm_* is the one tracking prefix.
+TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "src", "_hsenc", "_hsmi"})
+TRACKING_PREFIX = "utm_"
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIX)
+
+
+def canonical_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(k)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class JobStore:
+    ###
+    # SQLite store of job postings keyed by canonical URL:
+    # 1. Raw HTML with its ETag / Last-Modified validators for conditional revalidation
+    # 2. The parsed JobDescription JSON, trusted for parsed_ttl_seconds before revalidating
+
+    def __init__(self, db_path: str, parsed_ttl_seconds: int=24 * 3600):
+        self.db_path = db_path
+        self.parsed_ttl_seconds = parsed_ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_postings ("
+            "url TEXT PRIMARY KEY, html TEXT, html_hash TEXT, etag TEXT, last_modified TEXT, "
+            "fetched_at REAL, parsed_json TEXT, parsed_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html, html_hash, etag, last_modified, fetched_at, parsed_json, parsed_at "
+                "FROM job_postings WHERE url = ?", (canonical_url(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("html", "html_hash", "etag", "last_modified", "fetched_at", "parsed_json", "parsed_at")
+        return dict(zip(keys, row))
+
+    def get_parsed(self, url: str, ignore_ttl: bool=False) -> Optional[str]:
+        entry = self.get(url)
+        if entry is None or entry["parsed_json"] is None:
+            return None
+        if not ignore_ttl and time.time() - entry["parsed_at"] > self.parsed_ttl_seconds:
+            return None
+        return entry["parsed_json"]
+
+    def save_html(self, url: str, html: str, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        ## Returns True when the content changed; a changed page drops its stale parsed JSON
+        html_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        now = time.time()
+        key = canonical_url(url)
+        with self._lock:
+            row = self._conn.execute("SELECT html_hash FROM job_postings WHERE url = ?", (key,)).fetchone()
+            changed = row is None or row[0] != html_hash
+            if changed:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO job_postings "
+                    "(url, html, html_hash, etag, last_modified, fetched_at, parsed_json, parsed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, NULL, NULL)",
+                    (key, html, html_hash, etag, last_modified, now),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE job_postings SET etag = ?, last_modified = ?, fetched_at = ? WHERE url = ?",
+                    (etag, last_modified, now, key),
+                )
+            self._conn.commit()
+        return changed
+
+    def touch(self, url: str):
+        ## Server answered 304: the stored HTML and parsed JSON are still current
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_postings SET fetched_at = ? WHERE url = ?",
+                (time.time(), canonical_url(url)),
+            )
+            self._conn.commit()
+
+    def save_parsed(self, url: str, parsed_json: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_postings SET parsed_json = ?, parsed_at = ? WHERE url = ?",
+                (parsed_json, time.time(), canonical_url(url)),
+            )
+            self._conn.commit()
+
+    def refresh_parsed(self, url: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_postings SET parsed_at = ? WHERE url = ? AND parsed_json IS NOT NULL",
+                (time.time(), canonical_url(url)),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobFetcher:
+    ###
+    # Fetches job posting HTML with:
+    # 1. Pooled connections (httpx for async callers, a requests.Session for sync ones)
+    # 2. Connect / read timeouts so a hung career site cannot pin a worker
+    # 3. A per-host concurrency cap
+    # 4. Conditional GETs against the JobStore validators
+    # fetch() returns (html, changed); changed is False when the stored copy is still current.
+
+    def __init__(self, store: JobStore, connect_timeout: float=5, read_timeout: float=15,
+                 max_connections: int=50, per_host_concurrency: int=4, user_agent: str="Mozilla/5.0"):
+        self.store = store
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.headers = {"User-Agent": user_agent}
+        self._client = None
+        self._session = None
+        self._host_limits = {}
+        self._sync_host_limits = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                    follow_redirects=True,
+                    headers=self.headers,
+                )
+            return self._client
+
+    def _get_session(self) -> "requests.Session":
+        ## requests is only for sync callers (CLI scripts); the API fetches with httpx
+        import requests
+        from requests.adapters import HTTPAdapter
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.max_connections)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(self.headers)
+                self._session = session
+            return self._session
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+            return self._host_limits[host]
+
+    def _sync_host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._sync_host_limits:
+                self._sync_host_limits[host] = threading.BoundedSemaphore(self.per_host_concurrency)
+            return self._sync_host_limits[host]
+
+    @staticmethod
+    def _conditional_headers(cached: Optional[dict]) -> dict:
+        headers = {}
+        if cached and cached.get("html") is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    async def fetch(self, url: str) -> Tuple[str, bool]:
+        cached = await asyncio.to_thread(self.store.get, url)
+        async with self._host_limit(url):
+            ## the client's timeouts, cut to what is left of the request's deadline
+            timeout = httpx.Timeout(bounded(self.read_timeout), connect=bounded(self.connect_timeout))
+            response = await self._get_client().get(url, headers=self._conditional_headers(cached), timeout=timeout)
+        if response.status_code == 304 and cached:
+            await asyncio.to_thread(self.store.touch, url)
+            log.info("Job posting not modified", url=url)
+            return cached["html"], False
+        response.raise_for_status()
+        changed = await asyncio.to_thread(
+            self.store.save_html, url, response.text,
+            response.headers.get("etag"), response.headers.get("last-modified"),
+        )
+        log.info("Job posting fetched", url=url, changed=changed)
+        return response.text, changed
+
+    def fetch_sync(self, url: str) -> Tuple[str, bool]:
+        cached = self.store.get(url)
+        with self._sync_host_limit(url):
+            response = self._get_session().get(
+                url, headers=self._conditional_headers(cached),
+                timeout=(bounded(self.connect_timeout), bounded(self.read_timeout)),
+            )
+        if response.status_code == 304 and cached:
+            self.store.touch(url)
+            return cached["html"], False
+        response.raise_for_status()
+        changed = self.store.save_html(
+            url, response.text, response.headers.get("etag"), response.headers.get("last-modified"),
+        )
+        return response.text, changed
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self.store.close()
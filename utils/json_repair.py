@@ -0,0 +1,113 @@
+import re
+import json
+from typing import Any, List, Optional, Tuple
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import ValidationError
+from utils.metrics import metrics
+
+JSON_PARSE_RESULTS = metrics.counter(
+    "resume_rater_json_parse_total",
+    "LLM JSON outputs by schema and outcome (valid, repaired, invalid, unparseable)",
+    ("schema", "outcome"),
+)
+
+CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+OPEN_FENCE = re.compile(r"^```(?:json)?\s*", re.IGNORECASE)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"$')
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def repair_json(text: str) -> Optional[str]:
+    ###
+    # Best-effort fix for the usual ways LLM JSON breaks, without another LLM call:
+    # 1. Markdown code fences and chatter before the first brace / after the last one
+    # 2. Curly quotes used as JSON quotes
+    # 3. Trailing commas before } or ]
+    # 4. Truncated output: open strings, dangling keys / commas, missing closing brackets
+    # Returns None when there is no JSON object or array in the text at all.
+    text = text.strip()
+    fenced = CODE_FENCE.search(text)
+    text = fenced.group(1) if fenced else OPEN_FENCE.sub("", text)
+    text = text.translate(SMART_QUOTES)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    text = text[min(starts):]
+
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = escaped = False
+    for char in text:
+        out.append(char)
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack and stack[-1] == char:
+                stack.pop()
+            if not stack:
+                ## the top-level value is complete, anything after it is chatter
+                break
+    repaired = "".join(out)
+
+    if in_string:
+        repaired += '"'
+    if stack:
+        repaired = repaired.rstrip(" \t\r\n,:")
+        if stack[-1] == "}":
+            ## an object cut off right after a key: drop the key
+            repaired = DANGLING_KEY.sub(r"\1", repaired).rstrip(" \t\r\n,")
+        repaired += "".join(reversed(stack))
+    return TRAILING_COMMA.sub(r"\1", repaired)
+
+
+def load_json(text: str) -> Tuple[Any, str]:
+    ## Returns (data, outcome) with outcome "valid" or "repaired"; (None, "unparseable") if nothing works
+    try:
+        return json.loads(text), "valid"
+    except ValueError:
+        pass
+    repaired = repair_json(text)
+    if repaired is not None:
+        try:
+            return json.loads(repaired), "repaired"
+        except ValueError:
+            pass
+    return None, "unparseable"
+
+
+class RepairingJsonOutputParser(JsonOutputParser):
+    ###
+    # JsonOutputParser that repairs common JSON breakage locally and validates the result
+    # against the pydantic schema. Failures raise OutputParserException carrying the raw
+    # output, which LLMRegistry uses for a short error-only re-ask.
+    # Streaming (partial) parsing is unchanged.
+
+    def parse_result(self, result, *, partial: bool=False) -> Any:
+        if partial:
+            return super().parse_result(result, partial=True)
+        schema_name = self.pydantic_object.__name__ if self.pydantic_object else "json"
+        text = result[0].text
+        data, outcome = load_json(text)
+        if data is None:
+            JSON_PARSE_RESULTS.inc(schema=schema_name, outcome="unparseable")
+            raise OutputParserException("Output is not valid JSON and could not be repaired", llm_output=text)
+        if self.pydantic_object is not None:
+            try:
+                data = self.pydantic_object.model_validate(data).model_dump()
+            except ValidationError as e:
+                JSON_PARSE_RESULTS.inc(schema=schema_name, outcome="invalid")
+                raise OutputParserException(f"Output does not match {schema_name}: {e}", llm_output=text) from e
+        JSON_PARSE_RESULTS.inc(schema=schema_name, outcome=outcome)
+        return data
@@ -0,0 +1,444 @@
+import os
+import sys
+import threading
+from contextlib import asynccontextmanager
+from collections import Counter
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableLambda
+from model.models import ResumeRater, JobDescription, ResumeProfile
+from prompt.prompt_library import PROMPT_REGISTRY, COMPACT_PROMPT_REGISTRY, PROMPT_VERSIONS, json_reask_prompt
+from utils.model_loader import ModelLoader
+from utils.result_cache import ResultCache
+from utils.job_store import JobStore, JobFetcher
+from utils.metrics import LLMMetricsCallback, metrics
+from utils.json_repair import RepairingJsonOutputParser
+from utils.llm_router import LLMRouter
+from utils.single_flight import SingleFlight
+from utils.rate_limiter import build_limiter
+from utils.blob_store import BlobStore
+from src.resume_rater.compaction import InputCompactor, build_compactor, estimate_tokens
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import ResumeAnalysisException
+log = CustomLogger().get_logger(__name__)
+
+## Pydantic schema each registered prompt is parsed into
+OUTPUT_SCHEMAS = {
+    "resume_analysis": ResumeRater,
+    "job_description": JobDescription,
+    "resume_profile": ResumeProfile,
+}
+
+PROMPT_TOKENS = metrics.histogram(
+    "resume_rater_prompt_tokens", "Estimated prompt tokens per LLM call (~4 chars per token)", ("prompt", "variant"),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000),
+)
+JSON_REASKS = metrics.counter("resume_rater_json_reasks_total", "Error-only re-asks after failed validation, by outcome", ("schema", "outcome"))
+
+
+class LLMRegistry:
+    ###
+    # Process-wide holder for everything that is expensive to build per request:
+    # 1. One warmed LLM client per provider, created on first use and then reused
+    # 2. One repairing JSON parser per prompt, with its format instructions cached
+    # 3. The compiled `prompt | llm | parser` chains; providers with a json_mode get the compact
+    #    prompt and native JSON output, and invalid answers get a short error-only re-ask
+    # 4. The pooled job posting fetcher and its store
+    # 5. The scoring result cache and the resume profile cache
+    # 6. Input compaction pipelines, one per kind of LLM input
+    # 7. The latency-aware provider router, when routing is enabled
+    # 8. Single-flight groups that collapse identical concurrent job extraction and scoring calls
+    # 9. Per-provider rate limiters (shared quota buckets + adaptive concurrency)
+    # 10. The faiss resume index used to shortlist batches before LLM scoring
+    # 11. The content-addressed upload store (PDFs and their extracted text)
+    # 12. The lite scorer (compiled skill matcher for LLM-free scoring), built on first use
+    # The API builds it once in the lifespan hook; CLI scripts can build their own.
+
+    def __init__(self, config_path: str="config/config.yaml"):
+        self.config_path = config_path
+        self._lock = threading.RLock()
+        ## How many clients were constructed per provider over the registry lifetime
+        self.clients_built = Counter()
+        self.job_fetcher = None
+        self.result_cache = None
+        self.profile_cache = None
+        self.resume_index = None
+        self.blob_store = None
+        self.single_flights = {}
+        ## limiters live for the whole process: their quota state is shared with other workers
+        self._limiters = {}
+        self._build()
+
+    def _build(self):
+        try:
+            loader = ModelLoader(self.config_path)
+            parsers = {name: RepairingJsonOutputParser(pydantic_object=schema) for name, schema in OUTPUT_SCHEMAS.items()}
+            format_instructions = {name: parser.get_format_instructions() for name, parser in parsers.items()}
+        except Exception as e:
+            log.error("Failed to build LLM registry", error=str(e))
+            raise ResumeAnalysisException("Failed to build LLM registry", sys) from e
+
+        with self._lock:
+            self.loader = loader
+            self.config = loader.config
+            self.default_provider = loader.default_provider()
+            self.parsers = parsers
+            self.format_instructions = format_instructions
+            self._llms = {}
+            self._chains = {}
+            self._compactors = {}
+            ## rebuilt on reload: lite_scoring.skills_path may have changed
+            self._lite_scorer = None
+            self._config_mtime = os.path.getmtime(self.config_path)
+            self.router = self._build_router()
+            ## the cache survives reloads, its keys already carry the model settings
+            if self.result_cache is None:
+                self.result_cache = self._build_result_cache()
+            if self.profile_cache is None:
+                self.profile_cache = self._build_profile_cache()
+            if self.job_fetcher is None:
+                self.job_fetcher = self._build_job_fetcher()
+            if self.resume_index is None:
+                self.resume_index = self._build_resume_index()
+            if self.blob_store is None:
+                self.blob_store = self._build_blob_store()
+        log.info("LLM registry built", default_provider=self.default_provider, prompts=list(parsers.keys()))
+
+    def _build_result_cache(self):
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        return ResultCache(
+            db_path=cache_config.get("db_path", "data/cache/results.sqlite"),
+            memory_size=cache_config.get("memory_size", 256),
+            ttl_seconds=cache_config.get("ttl_seconds", 7 * 24 * 3600),
+            max_entries=cache_config.get("max_entries", 10000),
+        )
+
+    def _build_profile_cache(self):
+        ## Same SQLite file as the result cache, own table and retention
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        profile_config = self.config.get("profiles", {})
+        return ResultCache(
+            db_path=cache_config.get("db_path", "data/cache/results.sqlite"),
+            memory_size=profile_config.get("memory_size", 256),
+            ttl_seconds=profile_config.get("ttl_seconds", 30 * 24 * 3600),
+            max_entries=profile_config.get("max_entries", 10000),
+            namespace="profiles",
+        )
+
+    def _build_resume_index(self):
+        index_config = self.config.get("vector_index", {})
+        if not index_config.get("enabled", False):
+            return None
+        ## faiss and numpy are only imported when the index is enabled
+        from utils.vector_index import VectorIndex
+        return VectorIndex(
+            index_config.get("index_path", "data/cache/resume_index.faiss"),
+            dimensions=index_config.get("dimensions", 2048),
+            save_interval_seconds=index_config.get("save_interval_seconds", 60),
+        )
+
+    def _build_blob_store(self):
+        storage_config = self.config.get("storage", {})
+        if not storage_config.get("enabled", False):
+            return None
+        root = storage_config.get("root", "data/uploads")
+        return BlobStore(
+            root,
+            index_path=storage_config.get("index_path", os.path.join(root, "index.sqlite")),
+            max_age_seconds=storage_config.get("max_age_seconds", 30 * 24 * 3600),
+            max_total_bytes=storage_config.get("max_total_mb", 2048) * 1024 * 1024,
+            grace_seconds=storage_config.get("grace_seconds", 600),
+            gc_interval_seconds=storage_config.get("gc_interval_seconds", 600),
+            legacy_dir=storage_config.get("legacy_session_dir"),
+        )
+
+    def _build_router(self):
+        routing = self.config.get("routing", {})
+        if not routing.get("enabled", False) or self.default_provider not in routing.get("providers", []):
+            return None
+        ## default provider leads until latencies are known
+        providers = [self.default_provider] + [p for p in routing["providers"] if p != self.default_provider]
+        providers = [p for p in providers if p in self.config["llm"] and self.loader.has_api_key(p)]
+        if len(providers) < 2:
+            return None
+        return LLMRouter(
+            self,
+            OUTPUT_SCHEMAS,
+            providers,
+            window=routing.get("window", 50),
+            min_samples=routing.get("min_samples", 5),
+            hedging=routing.get("hedging", True),
+            hedge_default_ms=routing.get("hedge_default_ms", 8000),
+            hedge_min_ms=routing.get("hedge_min_ms", 1000),
+            failure_threshold=routing.get("failure_threshold", 3),
+            max_error_rate=routing.get("max_error_rate", 0.5),
+            cooldown_seconds=routing.get("cooldown_seconds", 30),
+            explore_rate=routing.get("explore_rate", 0.05),
+        )
+
+    def _build_job_fetcher(self):
+        job_config = self.config.get("job_loader", {})
+        store = JobStore(
+            db_path=job_config.get("store_path", "data/cache/jobs.sqlite"),
+            parsed_ttl_seconds=job_config.get("parsed_ttl_seconds", 24 * 3600),
+        )
+        return JobFetcher(
+            store,
+            connect_timeout=job_config.get("connect_timeout", 5),
+            read_timeout=job_config.get("read_timeout", 15),
+            max_connections=job_config.get("max_connections", 50),
+            per_host_concurrency=job_config.get("per_host_concurrency", 4),
+        )
+
+    def cache_key(self, name: str, *inputs, provider_key: str=None):
+        ## None means this prompt/provider combination must not be cached
+        if self.result_cache is None:
+            return None
+        ## routed calls may be answered by any routed provider, so all of them go into the key
+        if provider_key is None and self.router is not None:
+            provider_keys = self.router.providers
+        else:
+            provider_keys = [provider_key or self.default_provider]
+        model_fingerprint = []
+        for key in provider_keys:
+            llm_config = self.config["llm"].get(key, {})
+            if self.config.get("cache", {}).get("only_deterministic", True) and llm_config.get("temperature", 0.2) != 0:
+                return None
+            prompt_key = self.prompt_key(name, key)
+            model_fingerprint.append({
+                "provider": llm_config.get("provider"),
+                "model_name": llm_config.get("model_name"),
+                "temperature": llm_config.get("temperature"),
+                "prompt": prompt_key,
+                "prompt_version": PROMPT_VERSIONS.get(prompt_key, "0"),
+            })
+        if len(model_fingerprint) == 1:
+            model_fingerprint = model_fingerprint[0]
+        return ResultCache.make_key(name, PROMPT_VERSIONS.get(name, "0"), model_fingerprint, *inputs)
+
+    def get_llm(self, provider_key: str=None):
+        provider_key = provider_key or self.default_provider
+        with self._lock:
+            llm = self._llms.get(provider_key)
+            if llm is None:
+                llm = self.loader.load_llm(provider_key)
+                ## token usage, call and retry counts for /metrics
+                llm.callbacks = [LLMMetricsCallback(provider_key)]
+                self._llms[provider_key] = llm
+                self.clients_built[provider_key] += 1
+            return llm
+
+    def get_limiter(self, provider_key: str):
+        if not self.config.get("rate_limiting", {}).get("enabled", False):
+            return None
+        with self._lock:
+            if provider_key not in self._limiters:
+                self._limiters[provider_key] = build_limiter(
+                    provider_key, self.config["llm"].get(provider_key, {}), self.config.get("rate_limiting", {})
+                )
+            return self._limiters[provider_key]
+
+    def json_mode_kwargs(self, provider_key: str, name: str):
+        ## Native JSON call kwargs for this provider and prompt, None when structured output is off
+        if not self.config.get("structured_output", {}).get("enabled", False):
+            return None
+        return self.loader.json_mode_kwargs(provider_key, OUTPUT_SCHEMAS[name].model_json_schema())
+
+    def prompt_key(self, name: str, provider_key: str=None) -> str:
+        ## "<name>_compact" when the provider runs in JSON mode, else the full prompt's name
+        if self.json_mode_kwargs(provider_key or self.default_provider, name) is not None:
+            return f"{name}_compact"
+        return name
+
+    def get_prompt(self, name: str, provider_key: str=None):
+        if self.prompt_key(name, provider_key) != name:
+            return COMPACT_PROMPT_REGISTRY[name]
+        return PROMPT_REGISTRY[name]
+
+    def count_prompt_tokens(self, name: str, provider_key: str, inputs: dict) -> int:
+        ## Tokens of the rendered prompt, so dropped format blocks are not counted
+        messages = self.get_prompt(name, provider_key).format_messages(**inputs)
+        return sum(estimate_tokens(str(message.content)) for message in messages)
+
+    def estimate_call_tokens(self, provider_key: str, inputs: dict, name: str=None) -> int:
+        ## Prompt plus the expected answer size; quotas count both
+        limits = self.config["llm"].get(provider_key, {}).get("rate_limit") or {}
+        if name is not None:
+            prompt_tokens = self.count_prompt_tokens(name, provider_key, inputs)
+        else:
+            prompt_tokens = sum(estimate_tokens(str(value)) for value in inputs.values())
+        return prompt_tokens + limits.get("output_tokens_estimate", 500)
+
+    @asynccontextmanager
+    async def llm_slot(self, provider_key: str, inputs: dict, name: str=None):
+        ## Wait for quota and a concurrency slot before calling provider_key, report 429/5xx back
+        limiter = self.get_limiter(provider_key)
+        if limiter is None:
+            yield
+            return
+        async with limiter.slot(self.estimate_call_tokens(provider_key, inputs, name)):
+            yield
+
+    async def ainvoke_chain(self, name: str, provider_key: str, inputs: dict):
+        prompt_key = self.prompt_key(name, provider_key)
+        PROMPT_TOKENS.observe(
+            self.count_prompt_tokens(name, provider_key, inputs), prompt=name,
+            variant="compact" if prompt_key != name else "full",
+        )
+        try:
+            async with self.llm_slot(provider_key, inputs, name):
+                return await self.get_chain(name, provider_key).ainvoke(inputs)
+        except OutputParserException as e:
+            if e.llm_output is None:
+                raise
+            error = e
+        return await self._areask(name, provider_key, error)
+
+    async def _areask(self, name: str, provider_key: str, error: OutputParserException):
+        ## Repair already failed: show the model its own answer and the error, never the original inputs
+        schema_name = OUTPUT_SCHEMAS[name].__name__
+        max_reasks = self.config.get("structured_output", {}).get("max_reasks", 1)
+        for attempt in range(max_reasks):
+            inputs = {"output": error.llm_output, "error": str(error)}
+            log.warning("Re-asking LLM for valid JSON", name=name, provider=provider_key, attempt=attempt + 1, error=str(error))
+            try:
+                async with self.llm_slot(provider_key, inputs):
+                    result = await self.get_reask_chain(name, provider_key).ainvoke(inputs)
+            except OutputParserException as e:
+                if e.llm_output is None:
+                    break
+                error = e
+                continue
+            JSON_REASKS.inc(schema=schema_name, outcome="fixed")
+            return result
+        JSON_REASKS.inc(schema=schema_name, outcome="failed")
+        raise error
+
+    def get_parser(self, name: str) -> JsonOutputParser:
+        return self.parsers[name]
+
+    def get_format_instructions(self, name: str) -> str:
+        return self.format_instructions[name]
+
+    def _get_json_llm(self, name: str, provider_key: str):
+        llm = self.get_llm(provider_key)
+        json_kwargs = self.json_mode_kwargs(provider_key, name)
+        return llm.bind(**json_kwargs) if json_kwargs else llm
+
+    def get_chain(self, name: str, provider_key: str=None):
+        provider_key = provider_key or self.default_provider
+        with self._lock:
+            chain = self._chains.get((name, provider_key))
+            if chain is None:
+                chain = self.get_prompt(name, provider_key) | self._get_json_llm(name, provider_key) | self.parsers[name]
+                self._chains[(name, provider_key)] = chain
+            return chain
+
+    def get_reask_chain(self, name: str, provider_key: str=None):
+        provider_key = provider_key or self.default_provider
+        with self._lock:
+            chain = self._chains.get((name, provider_key, "reask"))
+            if chain is None:
+                chain = json_reask_prompt | self._get_json_llm(name, provider_key) | self.parsers[name]
+                self._chains[(name, provider_key, "reask")] = chain
+            return chain
+
+    def pick_provider(self) -> str:
+        ## Provider for calls that cannot be hedged (streaming); the default when routing is off
+        return self.router.pick_provider() if self.router is not None else self.default_provider
+
+    async def ainvoke(self, name: str, inputs: dict):
+        ## Run a registered chain, through the router when routing is enabled
+        if self.router is not None:
+            return await self.router.ainvoke(name, inputs)
+        return await self.ainvoke_chain(name, self.default_provider, inputs)
+
+    async def abatch(self, name: str, inputs_list: list, max_concurrency: int=8) -> list:
+        ## Many calls to one registered chain through Runnable.abatch, at most max_concurrency at a time.
+        ## Each element still goes through routing, rate limiting and the JSON re-ask;
+        ## failed elements come back as exceptions in their slot instead of failing the batch.
+        async def call(inputs: dict):
+            return await self.ainvoke(name, inputs)
+        return await RunnableLambda(call).abatch(
+            inputs_list, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+
+    async def coalesce(self, kind: str, key, fn):
+        ## Await fn() once for all concurrent callers with the same (kind, key)
+        if not self.config.get("single_flight", {}).get("enabled", True):
+            return await fn()
+        flight = self.single_flights.get(kind)
+        if flight is None:
+            flight = self.single_flights.setdefault(kind, SingleFlight(kind))
+        return await flight.do(key, fn)
+
+    async def aclose(self):
+        for limiter in self._limiters.values():
+            if limiter is not None:
+                limiter.close()
+        self._limiters = {}
+        if self.result_cache is not None:
+            self.result_cache.close()
+            self.result_cache = None
+        if self.profile_cache is not None:
+            self.profile_cache.close()
+            self.profile_cache = None
+        if self.resume_index is not None:
+            self.resume_index.close()
+            self.resume_index = None
+        if self.blob_store is not None:
+            self.blob_store.close()
+            self.blob_store = None
+        if self.job_fetcher is not None:
+            await self.job_fetcher.aclose()
+            self.job_fetcher = None
+
+    def get_compactor(self, kind: str) -> InputCompactor:
+        with self._lock:
+            compactor = self._compactors.get(kind)
+            if compactor is None:
+                compactor = build_compactor(self.config, kind)
+                self._compactors[kind] = compactor
+            return compactor
+
+    def get_lite_scorer(self):
+        with self._lock:
+            if self._lite_scorer is None:
+                ## numpy and the skill matcher are only loaded once lite scoring is used
+                from src.resume_rater.lite_scorer import build_lite_scorer
+                self._lite_scorer = build_lite_scorer(self.config)
+            return self._lite_scorer
+
+    def warm_up(self):
+        ## Create the default client and compile every chain before serving traffic
+        for name in OUTPUT_SCHEMAS:
+            self.get_chain(name)
+        self.get_lite_scorer()
+        log.info("LLM registry warmed up", provider=self.default_provider)
+
+    def reload(self):
+        log.info("Reloading LLM registry", config_path=self.config_path)
+        self._build()
+
+    def reload_if_changed(self) -> bool:
+        if not self.config.get("registry", {}).get("reload_on_change", False):
+            return False
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            return False
+        with self._lock:
+            if mtime == self._config_mtime:
+                return False
+            self.reload()
+            return True
+
+
+if __name__ == "__main__":
+    registry = LLMRegistry()
+    registry.warm_up()
+    print(f"Clients built: {dict(registry.clients_built)}")
@@ -0,0 +1,205 @@
+import sys
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, List
+from utils.metrics import metrics
+from logger.custom_logger import CustomLogger
+from exception.custom_exception import ResumeAnalysisException
+log = CustomLogger().get_logger(__name__)
+
+ROUTED_CALLS = metrics.counter("resume_rater_router_calls_total", "Routed LLM calls by provider and outcome", ("provider", "outcome"))
+HEDGED_CALLS = metrics.counter("resume_rater_router_hedges_total", "Hedged requests fired, by hedge provider", ("provider",))
+FAILOVERS = metrics.counter("resume_rater_router_failovers_total", "Calls retried on another provider after a failure", ("provider",))
+CIRCUIT_OPENED = metrics.counter("resume_rater_router_circuit_opened_total", "Times a provider's circuit breaker opened", ("provider",))
+
+
+class ProviderHealth:
+    ## Rolling latency / outcome window and circuit breaker state for one provider.
+    ## Latency samples are (seconds, censored); censored samples come from calls cancelled after
+    ## losing a hedge race and are only lower bounds on what the call would have taken.
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def percentile(self, pct: float, recent: int=None, include_censored: bool=True):
+        samples = list(self.latencies)[-recent:] if recent else self.latencies
+        values = sorted(seconds for seconds, censored in samples if include_censored or not censored)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * pct))]
+
+    def error_rate(self) -> float:
+        return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+
+class LLMRouter:
+    ###
+    # Sits in front of the compiled chains when `routing.enabled` is set:
+    # 1. Keeps a rolling latency and error-rate window per provider
+    # 2. Sends each call to the fastest healthy provider (occasionally exploring the others)
+    # 3. If the primary has not answered by its p95 latency, fires a hedged call on the next
+    #    provider and returns whichever schema-valid result arrives first
+    # 4. Fails over immediately when the primary errors
+    # 5. Opens a circuit breaker after repeated failures, dropping the provider for a cool-down
+    # Only providers with an API key are routed to; with a single provider this is a pass-through.
+
+    def __init__(self, registry, schemas: dict, providers: List[str], window: int=50, min_samples: int=5,
+                 hedging: bool=True, hedge_default_ms: float=8000, hedge_min_ms: float=1000,
+                 failure_threshold: int=3, max_error_rate: float=0.5, cooldown_seconds: float=30,
+                 explore_rate: float=0.05):
+        self.registry = registry
+        self.schemas = schemas
+        self.providers = providers
+        self.min_samples = min_samples
+        self.hedging = hedging
+        self.hedge_default_seconds = hedge_default_ms / 1000
+        self.hedge_min_seconds = hedge_min_ms / 1000
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.explore_rate = explore_rate
+        self.health: Dict[str, ProviderHealth] = {provider: ProviderHealth(window) for provider in providers}
+        self._lock = threading.Lock()
+
+    def _estimate(self, provider: str):
+        ## median of the most recent calls, so a provider that turns slow is demoted within a few calls
+        health = self.health[provider]
+        if len(health.latencies) < self.min_samples:
+            return None
+        return health.percentile(0.5, recent=self.min_samples * 2)
+
+    def ranked(self) -> List[str]:
+        ## Providers to try, in order: healthy error rates first, then by median latency (unknown last, config
+        ## order breaks ties). Open circuits are left out, so hedges and failovers never reach them during
+        ## their cool-down; only when every circuit is open are they all returned, soonest to close first.
+        now = time.monotonic()
+        with self._lock:
+            def key(provider):
+                health = self.health[provider]
+                estimate = self._estimate(provider)
+                unhealthy = len(health.outcomes) >= self.min_samples and health.error_rate() > self.max_error_rate
+                return (
+                    health.open_until if health.is_open(now) else 0.0,
+                    unhealthy,
+                    estimate if estimate is not None else float("inf"),
+                    self.providers.index(provider),
+                )
+            order = sorted(self.providers, key=key)
+            closed = [provider for provider in order if not self.health[provider].is_open(now)]
+        if not closed:
+            return order
+        ## occasionally lead with another healthy provider so its latency estimate stays fresh
+        if len(closed) > 1 and random.random() < self.explore_rate:
+            explored = random.randrange(1, len(closed))
+            closed.insert(0, closed.pop(explored))
+        return closed
+
+    def pick_provider(self) -> str:
+        return self.ranked()[0]
+
+    def hedge_delay(self, provider: str) -> float:
+        ## completed calls only: censored samples would push the hedge point later and later
+        with self._lock:
+            p95 = self.health[provider].percentile(0.95, include_censored=False) if len(self.health[provider].latencies) >= self.min_samples else None
+        if p95 is None:
+            return self.hedge_default_seconds
+        return max(self.hedge_min_seconds, p95)
+
+    def _record(self, provider: str, ok: bool, latency: float=None):
+        with self._lock:
+            health = self.health[provider]
+            health.outcomes.append(ok)
+            if ok:
+                health.latencies.append((latency, False))
+                health.consecutive_failures = 0
+                health.open_until = 0.0
+                return
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.failure_threshold:
+                health.open_until = time.monotonic() + self.cooldown_seconds
+                ## half-open after the cool-down: one more failure re-opens it straight away
+                health.consecutive_failures = self.failure_threshold - 1
+                opened = True
+            else:
+                opened = False
+        if opened:
+            CIRCUIT_OPENED.inc(provider=provider)
+            log.warning("Provider circuit opened", provider=provider, cooldown_seconds=self.cooldown_seconds)
+
+    async def _call(self, name: str, provider: str, inputs: dict) -> dict:
+        start = time.perf_counter()
+        try:
+            result = await self.registry.ainvoke_chain(name, provider, inputs)
+            ## a malformed answer counts as a failure so the other provider can still win
+            result = self.schemas[name].model_validate(result).model_dump()
+        except asyncio.CancelledError:
+            ## lost a hedge race: it took at least this long, which is what the ranking needs to know
+            with self._lock:
+                self.health[provider].latencies.append((time.perf_counter() - start, True))
+            raise
+        except Exception:
+            self._record(provider, False)
+            ROUTED_CALLS.inc(provider=provider, outcome="error")
+            raise
+        self._record(provider, True, time.perf_counter() - start)
+        return result
+
+    async def ainvoke(self, name: str, inputs: dict) -> dict:
+        ranked = self.ranked()
+        primary, backups = ranked[0], ranked[1:]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending = {asyncio.ensure_future(self._call(name, primary, inputs)): primary}
+        hedge_at = self.hedge_delay(primary) if self.hedging and backups else None
+        errors = []
+        try:
+            while pending:
+                timeout = None if hedge_at is None else max(0.0, hedge_at - (loop.time() - start))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    provider = backups.pop(0)
+                    HEDGED_CALLS.inc(provider=provider)
+                    log.info("Hedging slow LLM call", name=name, primary=primary, hedge=provider, after_s=round(hedge_at, 3))
+                    pending[asyncio.ensure_future(self._call(name, provider, inputs))] = provider
+                    hedge_at = None
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        ROUTED_CALLS.inc(provider=provider, outcome="win")
+                        return task.result()
+                    errors.append((provider, task.exception()))
+                if not pending and backups:
+                    provider = backups.pop(0)
+                    FAILOVERS.inc(provider=provider)
+                    log.warning("LLM call failed, failing over", name=name, failed=errors[-1][0], provider=provider, error=str(errors[-1][1]))
+                    pending[asyncio.ensure_future(self._call(name, provider, inputs))] = provider
+                    hedge_at = None
+        finally:
+            for task in pending:
+                task.cancel()
+        failed = ", ".join(f"{provider}: {error}" for provider, error in errors)
+        raise ResumeAnalysisException(f"All LLM providers failed ({failed})", sys) from errors[-1][1]
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                provider: {
+                    "samples": len(health.outcomes),
+                    "p50_ms": round(health.percentile(0.5) * 1000, 1) if health.latencies else None,
+                    "p95_ms": round(health.percentile(0.95) * 1000, 1) if health.latencies else None,
+                    "error_rate": round(health.error_rate(), 3),
+                    "circuit_open": health.is_open(now),
+                }
+                for provider, health in self.health.items()
+            }
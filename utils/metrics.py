@@ -0,0 +1,218 @@
+import time
+import bisect
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from utils.deadline import current_deadline
+
+## Seconds; covers cache hits (ms) through slow LLM calls (tens of seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str="") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    ## Same storage as Counter, but the value is set rather than accumulated
+    def set(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        ## per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    ###
+    # In-process counters and histograms, rendered in the Prometheus text format by GET /metrics.
+    # Updates are a dict lookup and an add under a lock, cheap enough to leave on in production.
+    # Each API worker process keeps its own values; scrape every worker or run one per container.
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, tuple(labelnames), **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram("resume_rater_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+REQUEST_SECONDS = metrics.histogram("resume_rater_request_seconds", "HTTP request latency until response headers", ("method", "route", "status"))
+LLM_CALLS = metrics.counter("resume_rater_llm_calls_total", "LLM calls by provider and outcome", ("provider", "outcome"))
+LLM_TOKENS = metrics.counter("resume_rater_llm_tokens_total", "Tokens reported by the provider", ("provider", "type"))
+LLM_RETRIES = metrics.counter("resume_rater_llm_retries_total", "LLM call retries", ("provider",))
+DEADLINES_EXCEEDED = metrics.counter("resume_rater_deadline_exceeded_total", "Requests and jobs that ran out of their time budget, by stage", ("stage",))
+
+## Per-request list of (stage, seconds), filled by span() and turned into the Server-Timing header
+_request_timings: ContextVar = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> list:
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+
+def clear_request_timings():
+    ## Work that serves several requests (single-flight) records into none of them
+    _request_timings.set(None)
+
+
+@contextmanager
+def span(stage: str):
+    ## Times a block; works in sync code, coroutines and async generators alike.
+    ## Also tells the request's deadline which stage was running when it expired.
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.stage_started(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+        if deadline is not None:
+            deadline.stage_finished(stage)
+
+
+def server_timing_header(timings: list, total: float=None) -> str:
+    ## Stages hit more than once in a request (e.g. two LLM calls) are summed
+    durations = {}
+    for stage, elapsed in timings:
+        durations[stage] = durations.get(stage, 0.0) + elapsed
+    if total is not None:
+        durations["total"] = total
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in durations.items())
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    ###
+    # Attached to every chat model the registry builds. Reads token usage from the
+    # response metadata (usage_metadata on the message, or llm_output["token_usage"])
+    # and counts calls, errors and retries per provider.
+
+    def __init__(self, provider: str):
+        self.provider = provider
+
+    def on_llm_end(self, response, **kwargs):
+        LLM_CALLS.inc(provider=self.provider, outcome="success")
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens):
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+        if input_tokens:
+            LLM_TOKENS.inc(input_tokens, provider=self.provider, type="input")
+        if output_tokens:
+            LLM_TOKENS.inc(output_tokens, provider=self.provider, type="output")
+
+    def on_llm_error(self, error, **kwargs):
+        LLM_CALLS.inc(provider=self.provider, outcome="error")
+
+    def on_retry(self, retry_state, **kwargs):
+        LLM_RETRIES.inc(provider=self.provider)
@@ -2,73 +2,132 @@ import os
 import sys
 from dotenv import load_dotenv
 from utils.config_loader import load_config
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 from logger.custom_logger import CustomLogger
 from exception.custom_exception import ResumeAnalysisException
 log = CustomLogger().get_logger(__name__)
 
+## API key each provider needs; the offline "fake" provider needs none
+PROVIDER_API_KEYS = {
+    "google": "GOOGLE_API_KEY",
+    "groq": "GROQ_API_KEY",
+}
+
 
 class ModelLoader:
 
-    def __init__(self):
+    def __init__(self, config_path: str="config/config.yaml"):
         
         load_dotenv()
+        self.config_path=config_path
+        self.config=load_config(config_path)
         self._validate_env()
-        self.config=load_config()
         log.info("Configuration loaded successfully", config_keys=list(self.config.keys()))
 
     ## To check if the api key are valid, if missing, then raise error exception, to avoid crushing.  
+    ## Only the default provider's key is required up front, other providers are checked when loaded.
     def _validate_env(self):
         
-        required_vars=["GOOGLE_API_KEY","GROQ_API_KEY"]
-        self.api_keys={key:os.getenv(key) for key in required_vars}
-        missing = [k for k, v in self.api_keys.items() if not v]
-        if missing:
-            log.error("Missing environment variables", missing_vars=missing)
-            raise ResumeAnalysisException("Missing environment variables", sys)
+        self.api_keys={key:os.getenv(key) for key in PROVIDER_API_KEYS.values()}
+        self._require_api_key(self.default_provider())
         log.info("Environment variables validated", available_keys=[k for k in self.api_keys if self.api_keys[k]])
+
+    def has_api_key(self, provider_key: str) -> bool:
+        provider = self.config.get("llm", {}).get(provider_key, {}).get("provider", provider_key)
+        required_var = PROVIDER_API_KEYS.get(provider)
+        return not required_var or bool(self.api_keys.get(required_var))
+
+    def _require_api_key(self, provider_key: str):
+        if not self.has_api_key(provider_key):
+            log.error("Missing environment variables", provider_key=provider_key)
+            raise ResumeAnalysisException("Missing environment variables", sys)
         
-    ## To load llm models
-    def load_llm(self):
+    ## Set google as default llm.
+    def default_provider(self) -> str:
+        return os.getenv("LLM_PROVIDER", "google")
+
+    ## To load llm models, provider_key selects a block under `llm` in config.yaml.
+    ## Provider SDKs are imported here, only for the provider in use: the Gemini SDK alone takes
+    ## about a second to import, which every cold start would pay.
+    def load_llm(self, provider_key: str=None):
         
         llm_block = self.config["llm"]
 
         log.info("Loading LLM...")
         
-        ## Set google as default llm.
-        provider_key = os.getenv("LLM_PROVIDER", "google")
+        provider_key = provider_key or self.default_provider()
         if provider_key not in llm_block:
             log.error("LLM provider not found in config", provider_key=provider_key)
             raise ValueError(f"Provider '{provider_key}' not found in config")
 
+        self._require_api_key(provider_key)
         llm_config = llm_block[provider_key]
         provider = llm_config.get("provider")
         model_name = llm_config.get("model_name")
         temperature = llm_config.get("temperature", 0.2)
         max_tokens = llm_config.get("max_output_tokens", 2048)
+        ## Per HTTP attempt; the request deadline bounds the call as a whole, retries included
+        timeout = llm_config.get("timeout_seconds", 60)
+        max_retries = llm_config.get("max_retries", 2)
         
-        log.info("Loading LLM", provider=provider, model=model_name, temperature=temperature, max_tokens=max_tokens)
+        log.info("Loading LLM", provider=provider, model=model_name, temperature=temperature, max_tokens=max_tokens,
+                 timeout=timeout, max_retries=max_retries)
 
         if provider == "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI
             llm=ChatGoogleGenerativeAI(
                 model=model_name,
                 temperature=temperature,
-                max_output_tokens=max_tokens
+                max_output_tokens=max_tokens,
+                timeout=timeout,
+                max_retries=max_retries,
             )
             return llm
 
         elif provider == "groq":
+            from langchain_groq import ChatGroq
             llm=ChatGroq(
                 model=model_name,
                 api_key=self.api_keys["GROQ_API_KEY"],
                 temperature=temperature,
+                timeout=timeout,
+                max_retries=max_retries,
+            )
+            return llm
+
+        elif provider == "fake":
+            ## Offline benchmarks: no network, fixed latency, schema-valid JSON
+            from utils.fake_llm import FakeJSONChatModel
+            llm=FakeJSONChatModel(
+                model_name=model_name,
+                latency_seconds=llm_config.get("latency_ms", 500) / 1000,
+                jitter_seconds=llm_config.get("jitter_ms", 0) / 1000,
+                error_rate=llm_config.get("error_rate", 0.0),
             )
             return llm
             
         else:
             log.error("Invalid LLM provider", provider=provider)
             raise ValueError(f"Invalid LLM provider: {provider}")
+
+    ## Call kwargs that switch a provider into native JSON output, None when json_mode is off.
+    ## json_mode "schema" also hands the provider the JSON schema, "object" only asks for any JSON object.
+    def json_mode_kwargs(self, provider_key: str, json_schema: dict):
+        llm_config = self.config["llm"].get(provider_key, {})
+        mode = llm_config.get("json_mode", "none")
+        provider = llm_config.get("provider")
+        if mode == "none":
+            return None
+        if provider == "google":
+            kwargs = {"response_mime_type": "application/json"}
+            if mode == "schema":
+                kwargs["response_json_schema"] = json_schema
+            return kwargs
+        if provider == "groq":
+            if mode == "schema":
+                return {"response_format": {"type": "json_schema", "json_schema": {"name": json_schema.get("title", "output"), "schema": json_schema}}}
+            return {"response_format": {"type": "json_object"}}
+        ## the fake model always answers in JSON
+        return {}
         
     
     
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from utils.metrics import metrics
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+try:
+    import fcntl
+except ImportError:
+    ## no flock (Windows): buckets are still enforced, but per process only
+    fcntl = None
+
+RATE_LIMIT_WAIT_SECONDS = metrics.histogram(
+    "resume_rater_rate_limit_wait_seconds", "Time LLM calls waited for request/token quota", ("provider",),
+    buckets=(0.0, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+CONCURRENCY_LIMIT = metrics.gauge("resume_rater_llm_concurrency_limit", "Current AIMD concurrency limit", ("provider",))
+THROTTLED_CALLS = metrics.counter("resume_rater_llm_throttled_total", "LLM calls that failed with 429 / 5xx", ("provider",))
+
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+## Provider SDK errors that mean "slow down" but may carry no HTTP status: google.api_core (Gemini) and
+## the OpenAI-style SDKs (Groq). Matched by class name, so no SDK has to be imported to check them.
+THROTTLE_ERROR_TYPES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError", "BadGateway",
+    "GatewayTimeout", "RateLimitError",
+}
+
+
+def _status_code(error: BaseException):
+    ## SDK errors carry it as status_code (Groq, httpx responses) or code (google.api_core, int HTTP status)
+    for status in (getattr(error, "status_code", None), getattr(error, "code", None),
+                   getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(status, int) and not isinstance(status, bool):
+            return status
+    return None
+
+
+def is_throttle_error(error: Exception) -> bool:
+    ## langchain wrappers (e.g. ChatGoogleGenerativeAIError) re-raise the SDK error, so the whole chain is checked
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = _status_code(error)
+        if status is not None:
+            return status in THROTTLE_STATUS_CODES
+        if any(cls.__name__ in THROTTLE_ERROR_TYPES for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class SharedTokenBuckets:
+    ###
+    # Request and token buckets for one provider, stored in a small JSON file under an flock,
+    # so every uvicorn worker on the host draws from the same per-minute quota.
+    # Each bucket holds up to its per-minute allowance and refills continuously.
+
+    def __init__(self, path: str, requests_per_minute: float=None, tokens_per_minute: float=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    def _read(self, now: float) -> dict:
+        raw = os.pread(self._fd, 4096, 0)
+        try:
+            state = json.loads(raw) if raw else {}
+        except ValueError:
+            state = {}
+        for name, limit in self.limits.items():
+            if limit and name not in state:
+                state[name] = {"level": float(limit), "updated_at": now}
+        return state
+
+    def _write(self, state: dict):
+        data = json.dumps(state).encode("utf-8")
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, data, 0)
+
+    def try_acquire(self, tokens: int) -> float:
+        ## Takes one request and `tokens` tokens if both are available; else returns seconds to wait
+        now = time.time()
+        needs = {"requests": 1, "tokens": tokens}
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                state = self._read(now)
+                wait = 0.0
+                for name, limit in self.limits.items():
+                    if not limit:
+                        continue
+                    bucket = state[name]
+                    per_second = limit / 60
+                    bucket["level"] = min(float(limit), bucket["level"] + (now - bucket["updated_at"]) * per_second)
+                    bucket["updated_at"] = now
+                    ## a single call larger than the whole bucket would otherwise wait forever
+                    need = min(needs[name], limit)
+                    if bucket["level"] < need:
+                        wait = max(wait, (need - bucket["level"]) / per_second)
+                if wait == 0.0:
+                    for name, limit in self.limits.items():
+                        if limit:
+                            state[name]["level"] -= min(needs[name], limit)
+                self._write(state)
+                return wait
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class AIMDConcurrency:
+    ###
+    # Additive-increase / multiplicative-decrease cap on in-flight calls, per process:
+    # each success raises the limit by `increase / limit`, roughly +increase per round trip of calls;
+    # a 429 or 5xx multiplies it by decrease_factor. Waiters queue until a slot frees up.
+
+    def __init__(self, provider: str, initial: int=8, minimum: int=1, maximum: int=32,
+                 increase: float=1.0, decrease_factor: float=0.5):
+        self.provider = provider
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._condition = None
+        CONCURRENCY_LIMIT.set(self.limit, provider=provider)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < max(self.minimum, int(self.limit)))
+            self.in_flight += 1
+
+    async def release(self, throttled: bool=None):
+        ## throttled: True on 429/5xx, False on success, None when the outcome says nothing about load
+        if throttled is True:
+            self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+            log.warning("LLM concurrency reduced", provider=self.provider, limit=round(self.limit, 2))
+        elif throttled is False:
+            self.limit = min(float(self.maximum), self.limit + self.increase / max(self.limit, 1.0))
+        CONCURRENCY_LIMIT.set(self.limit, provider=self.provider)
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+
+class ProviderLimiter:
+    ## Quota buckets plus adaptive concurrency for one provider; callers wait instead of failing
+
+    def __init__(self, provider: str, buckets: SharedTokenBuckets, concurrency: AIMDConcurrency):
+        self.provider = provider
+        self.buckets = buckets
+        self.concurrency = concurrency
+
+    async def wait_for_quota(self, tokens: int):
+        started = time.perf_counter()
+        while True:
+            ## the bucket file is flock'ed, and another worker process may hold it: never on the event loop
+            wait = await asyncio.to_thread(self.buckets.try_acquire, tokens)
+            if wait == 0.0:
+                break
+            await asyncio.sleep(min(wait, 5.0))
+        RATE_LIMIT_WAIT_SECONDS.observe(time.perf_counter() - started, provider=self.provider)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int):
+        await self.concurrency.acquire()
+        throttled = None
+        try:
+            await self.wait_for_quota(estimated_tokens)
+            yield
+            throttled = False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            throttled = is_throttle_error(e)
+            if throttled:
+                THROTTLED_CALLS.inc(provider=self.provider)
+            raise
+        finally:
+            await self.concurrency.release(throttled)
+
+    def close(self):
+        self.buckets.close()
+
+
+def build_limiter(provider_key: str, llm_config: dict, rate_config: dict):
+    ## None when the provider block has no rate_limit section
+    limits = llm_config.get("rate_limit")
+    if not limits:
+        return None
+    buckets = SharedTokenBuckets(
+        os.path.join(rate_config.get("state_dir", "data/cache/ratelimits"), f"{provider_key}.json"),
+        requests_per_minute=limits.get("requests_per_minute"),
+        tokens_per_minute=limits.get("tokens_per_minute"),
+    )
+    concurrency = AIMDConcurrency(
+        provider_key,
+        initial=limits.get("max_concurrency", 8),
+        minimum=rate_config.get("min_concurrency", 1),
+        maximum=limits.get("max_concurrency", 8),
+        increase=rate_config.get("increase", 1.0),
+        decrease_factor=rate_config.get("decrease_factor", 0.5),
+    )
+    return ProviderLimiter(provider_key, buckets, concurrency)
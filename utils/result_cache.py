@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+
+class ResultCache:
+    ###
+    # Two-tier, content-addressed cache for LLM results:
+    # 1. An in-process LRU for the hottest entries
+    # 2. A persistent SQLite table with TTL and size-based (least recently used) eviction
+    # Keys are sha256 hashes of everything that can change the answer, see make_key.
+
+    def __init__(self, db_path: str, memory_size: int=256, ttl_seconds: int=7 * 24 * 3600,
+                 max_entries: int=10000, namespace: str="results"):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        ## namespace doubles as the table name so several caches can share one file
+        self.namespace = namespace
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {namespace} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {namespace}_accessed ON {namespace}(accessed_at)")
+        self._conn.commit()
+        log.info("Result cache opened", db_path=db_path, namespace=namespace)
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        ## Whitespace-only differences (re-exported PDFs, pasted job text) should still hit
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, *parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = cls.normalize_text(part)
+            else:
+                part = json.dumps(part, sort_keys=True, default=str)
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _remember(self, key: str, value: dict):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return self._memory[key]
+
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.namespace} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.namespace} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.counters["misses"] += 1
+                return None
+
+            self._conn.execute(f"UPDATE {self.namespace} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            result = json.loads(value)
+            self._remember(key, result)
+            self.counters["disk_hits"] += 1
+            return result
+
+    def put(self, key: str, value: dict):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.namespace} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self.counters["writes"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        cursor = self._conn.execute(f"DELETE FROM {self.namespace} WHERE created_at < ?", (now - self.ttl_seconds,))
+        evicted = cursor.rowcount
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()
+        if count > self.max_entries:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.namespace} WHERE key IN "
+                f"(SELECT key FROM {self.namespace} ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            evicted += cursor.rowcount
+        self.counters["evictions"] += max(evicted, 0)
+
+    ## SQLite calls are short but still disk IO, keep them off the event loop
+    async def aget(self, key: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: dict):
+        await asyncio.to_thread(self.put, key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()
+            lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            return {
+                **self.counters,
+                "memory_entries": len(self._memory),
+                "disk_entries": entries,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    cache = ResultCache("data/cache/demo.sqlite")
+    key = ResultCache.make_key("resume text", "job text", "1", {"model": "demo"})
+    print(cache.get(key))
+    cache.put(key, {"overall_score": 42})
+    print(cache.get(key))
+    print(cache.stats())
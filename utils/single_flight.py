@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from utils.metrics import metrics, span, clear_request_timings
+from utils.deadline import current_deadline, start_deadline
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+SINGLE_FLIGHT_CALLS = metrics.counter(
+    "resume_rater_single_flight_calls_total",
+    "Coalesced calls by kind; role=follower counts calls collapsed onto one already in flight",
+    ("kind", "role"),
+)
+
+
+def _detached_context() -> contextvars.Context:
+    ## The shared work belongs to no single caller: a copy of the leader's context without its deadline
+    ## and request timings, so followers are not cut short by the leader's budget or fill its Server-Timing
+    context = contextvars.copy_context()
+    context.run(start_deadline, None)
+    context.run(clear_request_timings)
+    return context
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    ###
+    # Collapses concurrent calls with the same key into one in-flight task:
+    # 1. The first caller (leader) starts the work as a task; later callers (followers) await it.
+    #    The task runs without any caller's deadline or request timings.
+    # 2. Everyone gets the same result, or the same exception
+    # 3. Each caller waits at most until its own deadline, recorded as a `kind` span of its request;
+    #    a caller leaving (cancelled or out of time) only stops its own wait, the work is cancelled once no one waits
+    # 4. The key is forgotten as soon as the work finishes, this is not a cache
+    # Results are shared between callers and must be treated as read-only.
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(_detached_context().run(asyncio.ensure_future, fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            SINGLE_FLIGHT_CALLS.inc(kind=self.kind, role="leader")
+        else:
+            SINGLE_FLIGHT_CALLS.inc(kind=self.kind, role="follower")
+            log.info("Joined in-flight call", kind=self.kind)
+
+        flight.waiters += 1
+        deadline = current_deadline()
+        try:
+            ## asyncio.wait: one caller giving up must not cancel the work the others are waiting on
+            with span(self.kind):
+                done, _ = await asyncio.wait({flight.task}, timeout=None if deadline is None else deadline.remaining())
+            if not done:
+                raise deadline.exceeded()
+            return flight.task.result()
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                ## last waiter left; new callers start a fresh flight rather than join a cancelled one
+                self._forget(key, flight)
+                flight.task.cancel()
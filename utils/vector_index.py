@@ -0,0 +1,164 @@
+import os
+import re
+import math
+import time
+import zlib
+import sqlite3
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+import faiss
+import numpy as np
+from logger.custom_logger import CustomLogger
+log = CustomLogger().get_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+## Words that appear in every resume and posting and only blur similarity
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we with you your will "
+    "this that their they experience work working team years year role skills".split()
+)
+
+
+class HashingVectorizer:
+    ###
+    # Offline text embedding: unigrams and bigrams hashed (crc32, stable across processes)
+    # into a fixed number of signed buckets, log-scaled counts, L2-normalized.
+    # Inner product of two vectors is then their cosine similarity.
+
+    def __init__(self, dimensions: int=2048):
+        self.dimensions = dimensions
+
+    def _terms(self, text: str) -> Counter:
+        tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype="float32")
+        for row, text in enumerate(texts):
+            for term, count in self._terms(text).items():
+                digest = zlib.crc32(term.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dimensions] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class VectorIndex:
+    ###
+    # Persistent faiss index of documents (resumes) for the pre-screen before LLM scoring:
+    # 1. Exact inner-product search (IndexFlatIP) wrapped in IndexIDMap2 for add / remove by id
+    # 2. A SQLite sidecar maps document keys (content hashes) to faiss ids and labels; it is shared by
+    #    every worker, so a key has the same id everywhere
+    # 3. The index file is rewritten atomically at most every save_interval_seconds, and on close
+    # The index lives in process memory: with several workers, each keeps its own copy and the file
+    # is a warm start, not shared state. add() embeds every id missing from this process's copy,
+    # whether or not another worker (or an unsaved run before a crash) already gave its key an id.
+
+    def __init__(self, index_path: str, dimensions: int=2048, save_interval_seconds: float=60):
+        self.index_path = index_path
+        self.save_interval_seconds = save_interval_seconds
+        self._last_save = time.monotonic()
+        self.vectorizer = HashingVectorizer(dimensions)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(f"{index_path}.sqlite", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, label TEXT, added_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._dirty = False
+        self.index = self._load(dimensions)
+        ## ids whose vectors are in this process's index
+        self._present = set(faiss.vector_to_array(self.index.id_map).tolist())
+
+    def _load(self, dimensions: int):
+        ## Sidecar rows without a vector (added after the last save, here or in another worker)
+        ## are embedded on next sight; vectors whose row was removed are dropped
+        if os.path.exists(self.index_path):
+            index = faiss.read_index(self.index_path)
+            if index.d == dimensions:
+                known = {row[0] for row in self._conn.execute("SELECT id FROM documents")}
+                stale = [i for i in faiss.vector_to_array(index.id_map).tolist() if i not in known]
+                if stale:
+                    index.remove_ids(np.array(stale, dtype="int64"))
+                    self._dirty = True
+                log.info("Vector index loaded", path=self.index_path, documents=index.ntotal, dropped=len(stale))
+                return index
+            log.warning("Vector index has another dimension, starting empty", path=self.index_path, dimensions=index.d)
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dimensions))
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def add(self, items: List[Tuple[str, str, Optional[str]]]) -> List[int]:
+        ## items: (key, text, label); known keys keep their id, and are embedded only if this
+        ## process's index does not hold their vector yet
+        ids = []
+        new_items = []
+        with self._lock:
+            for key, text, label in items:
+                ## OR IGNORE: another worker may insert the same key at the same time
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO documents (key, label, added_at) VALUES (?, ?, ?)", (key, label, time.time())
+                )
+                (doc_id,) = self._conn.execute("SELECT id FROM documents WHERE key = ?", (key,)).fetchone()
+                if doc_id not in self._present:
+                    self._present.add(doc_id)
+                    new_items.append((doc_id, text))
+                ids.append(doc_id)
+            self._conn.commit()
+            if new_items:
+                vectors = self.vectorizer.transform([text for _, text in new_items])
+                self.index.add_with_ids(vectors, np.array([doc_id for doc_id, _ in new_items], dtype="int64"))
+                self._dirty = True
+        return ids
+
+    def remove(self, keys: List[str]) -> int:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM documents WHERE key IN ({', '.join('?' * len(keys))})", keys
+            ).fetchall()
+            ids = np.array([row[0] for row in rows], dtype="int64")
+            removed = self.index.remove_ids(ids) if len(ids) else 0
+            self._present.difference_update(ids.tolist())
+            self._conn.executemany("DELETE FROM documents WHERE id = ?", [(int(i),) for i in ids])
+            self._conn.commit()
+            self._dirty = self._dirty or removed > 0
+        return removed
+
+    def search(self, text: str, k: int, restrict_to: List[int]=None) -> List[Tuple[int, float]]:
+        ## Top-k (id, cosine similarity), optionally only among restrict_to ids
+        query = self.vectorizer.transform([text])
+        params = None
+        if restrict_to is not None:
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.array(restrict_to, dtype="int64")))
+            k = min(k, len(restrict_to))
+        with self._lock:
+            k = min(k, self.index.ntotal)
+            if k <= 0:
+                return []
+            scores, ids = self.index.search(query, k, params=params)
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.index_path}.tmp"
+            faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        log.info("Vector index saved", path=self.index_path, documents=self.index.ntotal)
+
+    def maybe_save(self):
+        ## Rewriting a large index per batch would cost more than the batch itself
+        if self._dirty and time.monotonic() - self._last_save >= self.save_interval_seconds:
+            self.save()
+
+    def close(self):
+        self.save()
+        with self._lock:
+            self._conn.close()